@@ -0,0 +1,64 @@
+"""add_week_rollup_tables
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d9e0f1a2b3"
+down_revision: Union[str, None] = "b7c8d9e0f1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "week_task_rollups",
+        sa.Column("week_id", sa.String(length=30), nullable=False),
+        sa.Column("task_id", sa.String(length=30), nullable=False),
+        sa.Column("target_units", sa.Numeric(precision=9, scale=1), nullable=False),
+        sa.Column("actual_units", sa.Numeric(precision=9, scale=1), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.ForeignKeyConstraint(["week_id"], ["weeks.id"]),
+        sa.PrimaryKeyConstraint("week_id", "task_id"),
+    )
+    op.create_index(
+        op.f("ix_week_task_rollups_task_id"), "week_task_rollups", ["task_id"], unique=False
+    )
+    # 既存データのバックフィル（以降は services.rollup が書き込みと同時に更新する）
+    op.execute(
+        """
+        INSERT INTO week_task_rollups (week_id, task_id, target_units, actual_units)
+        SELECT
+            coalesce(g.week_id, r.week_id),
+            coalesce(g.task_id, r.task_id),
+            coalesce(g.target_units, 0),
+            coalesce(r.actual_units, 0)
+        FROM (
+            SELECT week_id, task_id, sum(target_units) AS target_units
+            FROM goals GROUP BY week_id, task_id
+        ) AS g
+        FULL JOIN (
+            SELECT week_id, task_id, sum(actual_units) AS actual_units
+            FROM records GROUP BY week_id, task_id
+        ) AS r ON r.week_id = g.week_id AND r.task_id = g.task_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_week_task_rollups_task_id"), table_name="week_task_rollups")
+    op.drop_table("week_task_rollups")
@@ -0,0 +1,115 @@
+"""DB_POOL_MODE ごとのコネクションプール計測スクリプト.
+
+1 リクエスト = セッションを開いて軽量クエリを 3 本実行し閉じる、を模して計測する。
+
+- container: 1 プロセス（1 エンジン）に --concurrency 本の同時リクエスト
+- lambda: --concurrency 個のコンテナ（エンジン）がそれぞれ直列にリクエストを処理
+
+実行: `uv run python scripts/bench_db_pool.py [--requests N] [--concurrency N]`
+結果は docs/adr/ADR-B-002-db-pool-mode.md に記録している。
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from tasche.core.config import DB_POOL_MODES, settings
+from tasche.core.secret_resolver import resolve_secrets
+from tasche.db.session import build_engine_options
+
+APPLICATION_NAME = "tasche-bench-db-pool"
+
+
+def _create_engine(pool_mode: str) -> AsyncEngine:
+    options = build_engine_options(pool_mode)
+    options["echo"] = False
+    options["connect_args"]["server_settings"] = {"application_name": APPLICATION_NAME}
+    return create_async_engine(settings.database_url, **options)
+
+
+async def _request(engine: AsyncEngine, latencies: list[float]) -> None:
+    started = time.perf_counter()
+    async with async_sessionmaker(engine)() as session:
+        for _ in range(3):
+            await session.execute(text("SELECT 1"))
+        await session.commit()
+    latencies.append(time.perf_counter() - started)
+
+
+async def _count_connections(monitor: AsyncEngine) -> int:
+    async with monitor.connect() as conn:
+        result = await conn.execute(
+            text("SELECT count(*) FROM pg_stat_activity WHERE application_name = :name"),
+            {"name": APPLICATION_NAME},
+        )
+        return result.scalar_one()
+
+
+async def _run(
+    scenario: str, pool_mode: str, requests: int, concurrency: int, monitor: AsyncEngine
+) -> None:
+    engines = [_create_engine(pool_mode)]
+    if scenario == "lambda":
+        engines += [_create_engine(pool_mode) for _ in range(concurrency - 1)]
+
+    latencies: list[float] = []
+    peak = 0
+    done = asyncio.Event()
+
+    async def _sample() -> None:
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, await _count_connections(monitor))
+            await asyncio.sleep(0.01)
+
+    async def _worker(engine: AsyncEngine, count: int) -> None:
+        for _ in range(count):
+            await _request(engine, latencies)
+
+    per_worker = requests // concurrency
+    sampler = asyncio.create_task(_sample())
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _worker(engines[i] if scenario == "lambda" else engines[0], per_worker)
+            for i in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    done.set()
+    await sampler
+    held = await _count_connections(monitor)
+    for engine in engines:
+        await engine.dispose()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(
+        f"| {scenario} | {pool_mode} | {len(latencies) / elapsed:,.0f} | {p50:.2f} | "
+        f"{p95:.2f} | {peak} | {held} |"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    await resolve_secrets()
+    monitor = create_async_engine(settings.database_url)
+    print(f"requests={requests} concurrency={concurrency}")
+    print("| scenario | mode | req/s | p50 (ms) | p95 (ms) | peak conns | idle conns |")
+    print("|---|---|---:|---:|---:|---:|---:|")
+    for scenario in ("container", "lambda"):
+        for pool_mode in DB_POOL_MODES:
+            await _run(scenario, pool_mode, requests, concurrency, monitor)
+    await monitor.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DB pool modes.")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests per run")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent requests")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,133 @@
+"""ミドルウェアスタック（Server-Timing・CSRF・span 属性付与）のスループット計測スクリプト.
+
+main と同じ順序でミドルウェアを積んだ最小アプリ（DB なしのエンドポイント 1 つ）に、
+ASGI を直接呼び出してリクエストを流す。before は BaseHTTPMiddleware /
+@app.middleware("http") による従来実装、after は現在の pure ASGI 実装。
+
+実行: `uv run python scripts/bench_middleware.py [--requests N] [--concurrency N]`
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from tasche.core.config import settings
+from tasche.core.csrf import CSRFMiddleware
+from tasche.core.server_timing import ServerTimingMiddleware, format_server_timing
+from tasche.db.query_stats import reset_query_stats, start_query_stats
+from tasche.main import EnrichHttpTraceAttributesMiddleware, _set_http_span_attributes
+
+ORIGIN = settings.cors_allow_origin_list[0]
+
+
+class LegacyServerTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        stats, token = start_query_stats()
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            reset_query_stats(token)
+        response.headers["Server-Timing"] = format_server_timing(
+            stats, time.perf_counter() - started
+        )
+        return response
+
+
+class LegacyCSRFMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.method in {"POST", "PUT", "PATCH", "DELETE"} and request.url.path.startswith(
+            "/api/"
+        ):
+            origin = request.headers.get("origin")
+            if origin and origin not in settings.cors_allow_origin_list:
+                raise RuntimeError("unexpected CSRF rejection")
+        return await call_next(request)
+
+
+def _build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    if legacy:
+
+        @app.middleware("http")
+        async def enrich_http_trace_attributes(request: Request, call_next):
+            response = await call_next(request)
+            _set_http_span_attributes(request)
+            return response
+
+        app.add_middleware(LegacyCSRFMiddleware)
+        app.add_middleware(LegacyServerTimingMiddleware)
+    else:
+        app.add_middleware(EnrichHttpTraceAttributesMiddleware)
+        app.add_middleware(CSRFMiddleware)
+        app.add_middleware(ServerTimingMiddleware)
+    return app
+
+
+async def _request(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/ping",
+        "raw_path": b"/api/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"origin", ORIGIN.encode())],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    assert status == 200, status
+
+
+async def _run(app: FastAPI, requests: int, concurrency: int) -> float:
+    async def _worker(count: int) -> None:
+        for _ in range(count):
+            await _request(app)
+
+    await _worker(100)  # ミドルウェアスタックの構築とウォームアップ
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker(requests // concurrency) for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    print(f"requests={requests} concurrency={concurrency}")
+    print("| middleware | req/s |")
+    print("|---|---:|")
+    for label, legacy in (("BaseHTTPMiddleware (before)", True), ("pure ASGI (after)", False)):
+        print(f"| {label} | {await _run(_build_app(legacy), requests, concurrency):,.0f} |")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP middleware stack.")
+    parser.add_argument("--requests", type=int, default=20000, help="total requests per run")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent requests")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
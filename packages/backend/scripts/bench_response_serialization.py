@@ -0,0 +1,140 @@
+"""レスポンス JSON 化の計測スクリプト（/dashboard・/tasks?per_page=N 相当のペイロード）.
+
+ハンドラが返すモデルを、FastAPI の通常経路（response_model での再検証 + dump_json）と
+ModelJSONResponse（VALIDATE_RESPONSE_MODELS=false 時の経路）でそれぞれ JSON 化し、
+タスク件数を変えて 1 レスポンスあたりの所要時間を比べる。
+
+実行: `uv run python scripts/bench_response_serialization.py [--iterations N]`
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, date, datetime
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import BaseModel
+
+from tasche.api.responses import ModelJSONResponse
+from tasche.models.enums import DayOfWeek
+from tasche.schemas.common import APIResponse
+from tasche.schemas.dashboard import (
+    DailyData,
+    DashboardResponse,
+    TodayGoal,
+    WeekInfo,
+    WeeklyMatrixItem,
+)
+from tasche.schemas.task import TaskListResponse, TaskResponse
+
+SIZES = (10, 50, 100)
+
+
+def _dashboard(tasks: int) -> APIResponse:
+    today = date(2026, 1, 5)
+    daily = {
+        day: DailyData(target_units=2, actual_units=1.5, completion_rate=75.0) for day in DayOfWeek
+    }
+    return APIResponse(
+        data=DashboardResponse(
+            current_date=today,
+            current_day_of_week=DayOfWeek.MONDAY,
+            week=WeekInfo(id="wk_1", start_date=today, end_date=today, unit_duration_minutes=30),
+            today_goals=[
+                TodayGoal(
+                    task_id=f"tsk_{i}",
+                    task_name=f"タスク {i}",
+                    target_units=2,
+                    actual_units=1.5,
+                    completion_rate=75.0,
+                )
+                for i in range(tasks)
+            ],
+            weekly_matrix=[
+                WeeklyMatrixItem(task_id=f"tsk_{i}", task_name=f"タスク {i}", daily_data=daily)
+                for i in range(tasks)
+            ],
+            has_goals_configured=True,
+        )
+    )
+
+
+def _task_list(tasks: int) -> APIResponse:
+    now = datetime(2026, 1, 5, tzinfo=UTC)
+    return APIResponse(
+        data=TaskListResponse(
+            items=[
+                TaskResponse(
+                    id=f"tsk_{i}",
+                    name=f"タスク {i}",
+                    is_archived=False,
+                    consumed_units_last_week=3.5,
+                    consumed_units_total=120.0,
+                    created_at=now,
+                    updated_at=now,
+                )
+                for i in range(tasks)
+            ],
+            total=tasks,
+            page=1,
+            per_page=tasks,
+        )
+    )
+
+
+REPEATS = 5
+
+
+async def _best_of(func, iterations: int) -> float:
+    """REPEATS 回計測した中で最速の 1 回あたり所要時間（ノイズ除去のため）."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await func()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best
+
+
+async def _run(name: str, model: type[BaseModel], content: APIResponse, iterations: int) -> None:
+    field = create_model_field(name="Response", type_=model, mode="serialization")
+
+    async def _fastapi() -> bytes:
+        return await serialize_response(field=field, response_content=content, dump_json=True)
+
+    async def _model_json() -> bytes:
+        return ModelJSONResponse(content).body
+
+    body = await _fastapi()
+    assert await _model_json() == body
+    before = await _best_of(_fastapi, iterations)
+    after = await _best_of(_model_json, iterations)
+    print(
+        f"| {name} | {len(body):,} | {before * 1e6:.0f} | {after * 1e6:.0f} | "
+        f"{(1 - after / before) * 100:.0f}% |"
+    )
+
+
+async def main(iterations: int) -> None:
+    print(f"iterations={iterations}")
+    print("| payload | bytes | response_model (µs) | ModelJSONResponse (µs) | saved |")
+    print("|---|---:|---:|---:|---:|")
+    for size in SIZES:
+        await _run(
+            f"/dashboard ({size} tasks)",
+            APIResponse[DashboardResponse],
+            _dashboard(size),
+            iterations,
+        )
+    for size in SIZES:
+        await _run(
+            f"/tasks?per_page={size}", APIResponse[TaskListResponse], _task_list(size), iterations
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths.")
+    parser.add_argument("--iterations", type=int, default=1000, help="serializations per payload")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,91 @@
+"""テレメトリ span 属性付与（ルートパス解決）の計測スクリプト.
+
+1 リクエストで呼ばれる 3 回の属性付与（server_request_hook・client_response_hook・
+enrich_http_trace_attributes ミドルウェア）を、実アプリの全ルートについて順に実行する。
+before は全ルートを線形に走査する従来の解決、after は main の route → パス辞書による解決。
+
+実行: `uv run python scripts/bench_span_enrichment.py [--requests N]`
+"""
+
+import argparse
+import time
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.routing import iter_route_contexts
+from starlette.requests import Request
+
+from tasche import main as tasche_main
+
+
+class _Span:
+    def is_recording(self) -> bool:
+        return True
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: object) -> None:
+        pass
+
+
+def _resolve_linear(app: FastAPI | None, route: object) -> str | None:
+    """辞書化前の実装（リクエストごとに全ルートを走査する）."""
+    if route is None:
+        return None
+    if app is not None:
+        for context in iter_route_contexts(app.routes):
+            if context.original_route is route:
+                return context.path
+    return getattr(route, "path", None)
+
+
+def _scopes() -> list[dict]:
+    scopes = []
+    for context in iter_route_contexts(tasche_main.app.routes):
+        methods = getattr(context.original_route, "methods", None) or {"GET"}
+        scopes.append(
+            {
+                "type": "http",
+                "method": sorted(methods)[0],
+                "scheme": "https",
+                "path": context.path,
+                "query_string": b"",
+                "headers": [(b"host", b"example.com")],
+                "server": ("example.com", 443),
+                "app": tasche_main.app,
+                "route": context.original_route,
+            }
+        )
+    return scopes
+
+
+def _run(scopes: list[dict], requests: int) -> float:
+    span = _Span()
+    message = {"type": "http.response.start"}
+    started = time.perf_counter()
+    for i in range(requests):
+        scope = scopes[i % len(scopes)]
+        tasche_main._otel_server_request_hook(span, scope)
+        tasche_main._otel_client_response_hook(span, scope, message)
+        tasche_main._set_http_span_attributes_from_request(span, Request(scope))
+    return (time.perf_counter() - started) / requests
+
+
+def main(requests: int) -> None:
+    scopes = _scopes()
+    with patch.object(tasche_main, "_resolve_full_route_path", _resolve_linear):
+        before = _run(scopes, requests)
+    after = _run(scopes, requests)
+    print(f"routes={len(scopes)} requests={requests}")
+    print("| resolver | µs / request |")
+    print("|---|---:|")
+    print(f"| linear scan (before) | {before * 1e6:.1f} |")
+    print(f"| route map (after) | {after * 1e6:.1f} |")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark span route-path resolution.")
+    parser.add_argument("--requests", type=int, default=20000, help="requests to simulate")
+    args = parser.parse_args()
+    main(args.requests)
@@ -0,0 +1,281 @@
+"""GET /api/stats の集計（services.stats.get_stats）の計測スクリプト.
+
+合成ユーザー（52 週 × 50 タスク、全タスク・全曜日に目標と実績）を作り、
+週次ロールアップを読む get_stats と、同じ集計を raw の goals / records から行った
+場合を、範囲・集計単位を変えて比べる。ロールアップの維持コスト（書き込み 1 回分の
+refresh_week_rollups と rebuild_rollups）も計測する。終了時に合成データは削除する。
+
+実行: `uv run python scripts/bench_stats.py [--weeks N] [--tasks N] [--iterations N] [--keep]`
+結果は docs/adr/ADR-B-004-week-rollups-for-stats.md に記録している。
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import Date, DateTime, cast, delete, distinct, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.core.secret_resolver import resolve_secrets
+from tasche.db.query_stats import reset_query_stats, start_query_stats
+from tasche.db.session import get_engine, get_session_maker
+from tasche.models.enums import DayOfWeek
+from tasche.models.goal import Goal
+from tasche.models.record import Record
+from tasche.models.rollup import WeekTaskRollup
+from tasche.models.task import Task
+from tasche.models.user import User
+from tasche.models.week import Week
+from tasche.schemas.stats import StatsGranularity
+from tasche.services.rollup import rebuild_rollups, refresh_week_rollups
+from tasche.services.stats import _build_stats_statement, get_stats
+
+USER_ID = "usr_BENCHSTATS0000000000000"
+FIRST_TASK_ID = f"tsk_BENCHSTATS{0:015d}"
+FIRST_WEEK = date(2025, 10, 20)
+CHUNK_ROWS = 5000
+REPEATS = 5
+
+
+def _raw_stats_statement(*, start_date: date, end_date: date, granularity: StatsGranularity):
+    """比較用: get_stats と同じ集計を goals / records から直接行う."""
+    if granularity is StatsGranularity.MONTH:
+        period_start = cast(func.date_trunc("month", cast(Week.start_date, DateTime)), Date)
+    else:
+        period_start = Week.start_date
+    in_range = (Week.user_id == USER_ID, Week.start_date.between(start_date, end_date))
+    goal_sums = (
+        select(Goal.week_id, Goal.task_id, func.sum(Goal.target_units).label("target_units"))
+        .join(Week, Week.id == Goal.week_id)
+        .where(*in_range)
+        .group_by(Goal.week_id, Goal.task_id)
+        .subquery()
+    )
+    record_sums = (
+        select(Record.week_id, Record.task_id, func.sum(Record.actual_units).label("actual_units"))
+        .join(Week, Week.id == Record.week_id)
+        .where(*in_range)
+        .group_by(Record.week_id, Record.task_id)
+        .subquery()
+    )
+    cells = (
+        select(
+            func.coalesce(goal_sums.c.week_id, record_sums.c.week_id).label("week_id"),
+            func.coalesce(goal_sums.c.task_id, record_sums.c.task_id).label("task_id"),
+            goal_sums.c.target_units,
+            record_sums.c.actual_units,
+        )
+        .select_from(
+            goal_sums.join(
+                record_sums,
+                (record_sums.c.week_id == goal_sums.c.week_id)
+                & (record_sums.c.task_id == goal_sums.c.task_id),
+                full=True,
+            )
+        )
+        .subquery()
+    )
+    weeks = (
+        select(period_start.label("period_start"), Week.id.label("week_id"), cells)
+        .outerjoin(cells, cells.c.week_id == Week.id)
+        .where(*in_range)
+        .subquery()
+    )
+    return select(
+        weeks.c.period_start,
+        weeks.c.task_id,
+        func.count(distinct(weeks.c.week_id)),
+        func.sum(weeks.c.target_units),
+        func.sum(weeks.c.actual_units),
+    ).group_by(
+        func.grouping_sets(
+            tuple_(weeks.c.period_start), tuple_(weeks.c.period_start, weeks.c.task_id)
+        )
+    )
+
+
+async def _insert_chunked(session: AsyncSession, model: type, rows: list[dict]) -> None:
+    for i in range(0, len(rows), CHUNK_ROWS):
+        await session.execute(pg_insert(model).values(rows[i : i + CHUNK_ROWS]))
+
+
+async def _seed(session: AsyncSession, weeks: int, tasks: int) -> list[str]:
+    """合成データを作り、ロールアップを構築する（週 ID を返す）."""
+    session.add(User(id=USER_ID, email="bench-stats@example.com", name="Bench Stats"))
+    await session.flush()
+    task_ids = [f"tsk_BENCHSTATS{i:015d}" for i in range(tasks)]
+    assert task_ids[0] == FIRST_TASK_ID
+    week_ids = [f"wk_BENCHSTATS{i:016d}" for i in range(weeks)]
+    await _insert_chunked(
+        session, Task, [{"id": t, "user_id": USER_ID, "name": f"タスク {t[-3:]}"} for t in task_ids]
+    )
+    await _insert_chunked(
+        session,
+        Week,
+        [
+            {
+                "id": week_id,
+                "user_id": USER_ID,
+                "start_date": FIRST_WEEK + timedelta(weeks=i),
+                "end_date": FIRST_WEEK + timedelta(weeks=i, days=6),
+                "unit_duration_minutes": 30,
+                "week_start_day": "monday",
+                "week_start_hour": 4,
+            }
+            for i, week_id in enumerate(week_ids)
+        ],
+    )
+    cells = [
+        (w, t, d, day)
+        for w in range(weeks)
+        for t in range(tasks)
+        for d, day in enumerate(DayOfWeek)
+    ]
+    await _insert_chunked(
+        session,
+        Goal,
+        [
+            {
+                "id": f"gol_B{w:04d}{t:04d}{d}",
+                "week_id": week_ids[w],
+                "task_id": task_ids[t],
+                "day_of_week": day,
+                "target_units": float(1 + (t + d) % 3),
+            }
+            for w, t, d, day in cells
+        ],
+    )
+    await _insert_chunked(
+        session,
+        Record,
+        [
+            {
+                "id": f"rec_B{w:04d}{t:04d}{d}",
+                "week_id": week_ids[w],
+                "task_id": task_ids[t],
+                "day_of_week": day,
+                "actual_units": float((w + t + d) % 4) / 2,
+            }
+            for w, t, d, day in cells
+        ],
+    )
+    await rebuild_rollups(session, user_id=USER_ID)
+    await session.commit()
+    return week_ids
+
+
+async def _cleanup(session: AsyncSession) -> None:
+    week_ids = select(Week.id).where(Week.user_id == USER_ID)
+    await session.execute(delete(WeekTaskRollup).where(WeekTaskRollup.week_id.in_(week_ids)))
+    await session.execute(delete(Record).where(Record.week_id.in_(week_ids)))
+    await session.execute(delete(Goal).where(Goal.week_id.in_(week_ids)))
+    await session.execute(delete(Week).where(Week.user_id == USER_ID))
+    await session.execute(delete(Task).where(Task.user_id == USER_ID))
+    await session.execute(delete(User).where(User.id == USER_ID))
+    await session.commit()
+
+
+async def _best_of(func, iterations: int) -> tuple[float, int]:
+    """REPEATS 回計測した中で最速の 1 回あたり所要時間と、1 回あたりのステートメント数."""
+    best = float("inf")
+    statements = 0
+    for _ in range(REPEATS):
+        stats, token = start_query_stats()
+        try:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await func()
+            best = min(best, (time.perf_counter() - started) / iterations)
+        finally:
+            reset_query_stats(token)
+        statements = stats.statements // iterations
+    return best, statements
+
+
+async def main(weeks: int, tasks: int, iterations: int, keep: bool) -> None:
+    await resolve_secrets()
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        await _cleanup(session)
+        started = time.perf_counter()
+        week_ids = await _seed(session, weeks, tasks)
+        print(f"seeded {weeks} weeks x {tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+    last = FIRST_WEEK + timedelta(weeks=weeks - 1)
+    ranges = [
+        ("4 weeks", last - timedelta(weeks=3), StatsGranularity.WEEK),
+        ("13 weeks", last - timedelta(weeks=12), StatsGranularity.WEEK),
+        ("52 weeks", FIRST_WEEK, StatsGranularity.WEEK),
+        ("52 weeks", FIRST_WEEK, StatsGranularity.MONTH),
+    ]
+    print(f"iterations={iterations}")
+    print(
+        "| range | granularity | statements | get_stats (ms) | rollups SQL only (ms) "
+        "| raw goals/records SQL (ms) |"
+    )
+    print("|---|---|---:|---:|---:|---:|")
+    async with session_maker() as session:
+        for label, start_date, granularity in ranges:
+
+            async def _rollups() -> None:
+                await get_stats(
+                    session,
+                    USER_ID,
+                    start_date=start_date,
+                    end_date=last,
+                    granularity=granularity,
+                )
+
+            async def _rollups_sql() -> None:
+                stmt = _build_stats_statement(
+                    user_id=USER_ID, start_date=start_date, end_date=last, granularity=granularity
+                )
+                (await session.execute(stmt)).all()
+
+            async def _raw() -> None:
+                stmt = _raw_stats_statement(
+                    start_date=start_date, end_date=last, granularity=granularity
+                )
+                (await session.execute(stmt)).all()
+
+            rollups, statements = await _best_of(_rollups, iterations)
+            rollups_sql, _ = await _best_of(_rollups_sql, iterations)
+            raw, _ = await _best_of(_raw, iterations)
+            print(
+                f"| {label} | {granularity.value} | {statements} | {rollups * 1000:.1f} | "
+                f"{rollups_sql * 1000:.1f} | {raw * 1000:.1f} |"
+            )
+
+        print()
+        print("| maintenance | ms |")
+        print("|---|---:|")
+        for label, task_ids in [
+            ("refresh_week_rollups (1 task = 1 record upsert)", [FIRST_TASK_ID]),
+            (f"refresh_week_rollups (whole week = goal replace, {tasks} tasks)", None),
+        ]:
+
+            async def _refresh(task_ids=task_ids) -> None:
+                await refresh_week_rollups(session, week_ids[-1], task_ids=task_ids)
+
+            elapsed, _ = await _best_of(_refresh, iterations)
+            print(f"| {label} | {elapsed * 1000:.2f} |")
+        result = await rebuild_rollups(session, user_id=USER_ID)
+        print(f"| rebuild_rollups (user, no drift) | {result.elapsed_seconds * 1000:.1f} |")
+        await session.rollback()
+
+        if not keep:
+            await _cleanup(session)
+
+    await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the long-range stats aggregation.")
+    parser.add_argument("--weeks", type=int, default=52, help="synthetic weeks")
+    parser.add_argument("--tasks", type=int, default=50, help="synthetic tasks")
+    parser.add_argument("--iterations", type=int, default=20, help="calls per measurement")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic user")
+    args = parser.parse_args()
+    asyncio.run(main(args.weeks, args.tasks, args.iterations, args.keep))
@@ -0,0 +1,38 @@
+"""期限切れ・revoke 済みセッションの purge スクリプト.
+
+本番ではメンテナンス用 Lambda の POST /events（スケジュール実行）から同じ処理を呼ぶ。
+手動実行: `uv run python scripts/purge_sessions.py [--batch-size N] [--max-batches N]`
+"""
+
+import argparse
+import asyncio
+
+from tasche.core.config import settings
+from tasche.core.secret_resolver import resolve_secrets
+from tasche.db.session import get_engine, get_session_maker
+from tasche.services.session import purge_sessions
+
+
+async def main(batch_size: int | None, max_batches: int | None) -> None:
+    """purge を実行して結果を表示する."""
+    await resolve_secrets()
+    async with get_session_maker()() as session:
+        result = await purge_sessions(session, batch_size=batch_size, max_batches=max_batches)
+
+    print(f"✓ Deleted {result.deleted} sessions in {result.batches} batches")
+    print(f"  Elapsed: {result.elapsed_seconds * 1000:.1f} ms")
+
+    await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Purge expired or revoked sessions.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"rows per batch (default: {settings.session_purge_batch_size})",
+    )
+    parser.add_argument("--max-batches", type=int, default=None, help="stop after N batches")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.max_batches))
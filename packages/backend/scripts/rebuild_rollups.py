@@ -0,0 +1,35 @@
+"""週次ロールアップ（week_task_rollups）の再構築スクリプト.
+
+goals / records から集計し直し、ずれていた行だけを書き換える（バックフィル兼用）。
+手動実行: `uv run python scripts/rebuild_rollups.py [--user-id usr_xxx]`
+"""
+
+import argparse
+import asyncio
+
+from tasche.core.secret_resolver import resolve_secrets
+from tasche.db.session import get_engine, get_session_maker
+from tasche.services.rollup import rebuild_rollups
+
+
+async def main(user_id: str | None) -> None:
+    """再構築を実行して結果を表示する."""
+    await resolve_secrets()
+    async with get_session_maker()() as session:
+        result = await rebuild_rollups(session, user_id=user_id)
+        await session.commit()
+
+    refresh = result.refresh
+    print(f"✓ Reconciled rollups: {refresh.changed} rows changed")
+    print(f"  week_task_rollups upserted: {refresh.task_rows_upserted}")
+    print(f"  week_task_rollups deleted:  {refresh.task_rows_deleted}")
+    print(f"  Elapsed: {result.elapsed_seconds * 1000:.1f} ms")
+
+    await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild week rollups from goals and records.")
+    parser.add_argument("--user-id", default=None, help="rebuild only this user's weeks")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
@@ -0,0 +1,90 @@
+"""条件付き GET（ETag / If-None-Match）.
+
+SPA はタブへのフォーカス時などに変更の無いデータを取り直すため、読み取り系の
+GET は services.data_version の版から ETag を作り、If-None-Match が一致すれば
+レスポンスモデルを組み立てずに 304 Not Modified を返す。
+
+ルートの書き方:
+
+    @router.get("", response_model=APIResponse[Foo])
+    async def get_foo(
+        request: Request, response: Response, db: ReadDbSession, current_user: CurrentUser
+    ) -> APIResponse[Foo] | Response:
+        not_modified = await check_not_modified(request, response, db, current_user, scope)
+        if not_modified is not None:
+            return not_modified
+        ...
+
+- ETag はユーザーデータの版に、パス・クエリ・ユーザーのタイムゾーンと、エンドポイントが
+  渡すスコープ（現在週の開始日・ローカル日付など、日時で変わる要素）を加えて作る
+- Cache-Control: private, no-cache を付け、ブラウザに毎回再検証させる
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.models.user import User
+from tasche.services.data_version import get_user_data_version
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def build_etag(*parts: object) -> str:
+    """parts から弱い ETag を作る（表現はバイト単位で同一とは限らないため）."""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=16
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match が etag に一致するか（RFC 9110 の弱い比較）."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == opaque for candidate in if_none_match.split(","))
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    user: User,
+    *scope: object,
+    data_version: str | None = None,
+) -> Response | None:
+    """ETag を計算し、If-None-Match が一致すれば 304 のレスポンスを返す.
+
+    一致しない場合は response（依存関係と共有するレスポンス）に ETag と
+    Cache-Control を設定して None を返す。304 にも依存関係が設定した Cookie
+    （セッション延長など）を引き継ぐ。
+
+    Args:
+        data_version: 取得済みのデータの版（本体のキャッシュキーにも使う場合）。
+            省略時はここで取得する
+    """
+    version = data_version
+    if version is None:
+        version = await get_user_data_version(db, user)
+    etag = build_etag(request.url.path, request.url.query, user.timezone, version, *scope)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        not_modified = Response(status_code=304)
+        not_modified.headers.raw.extend(
+            header for header in response.headers.raw if header[0] != b"content-length"
+        )
+        not_modified.headers["etag"] = etag
+        not_modified.headers["cache-control"] = CACHE_CONTROL
+        return not_modified
+
+    response.headers["etag"] = etag
+    response.headers["cache-control"] = CACHE_CONTROL
+    return None
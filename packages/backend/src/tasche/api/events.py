@@ -0,0 +1,33 @@
+"""メンテナンス用イベント受信エンドポイント（Lambda Web Adapter pass-through）.
+
+Lambda Web Adapter は HTTP 以外のイベント（EventBridge Scheduler 等）を
+`AWS_LWA_PASS_THROUGH_PATH`（既定 `/events`）へ POST で転送する。
+Function URL を持つ API 用 Lambda から到達できないよう、ENABLE_MAINTENANCE_EVENTS が
+true の場合のみ main.py でルーティング登録する（メンテナンス用 Lambda 専用）。
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends
+
+from tasche.api.deps import DbSession, require_secrets_resolved
+from tasche.services.session import purge_sessions
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(require_secrets_resolved)])
+
+
+@router.post("/events")
+async def handle_maintenance_event(db: DbSession) -> dict:
+    """スケジュール実行されるメンテナンスジョブ（期限切れ・revoke 済みセッションの purge）.
+
+    Returns:
+        削除件数・バッチ数・所要時間（Lambda の実行結果としてログに残る）
+    """
+    result = await purge_sessions(db)
+    return {
+        "deleted": result.deleted,
+        "batches": result.batches,
+        "elapsed_ms": round(result.elapsed_seconds * 1000, 1),
+    }
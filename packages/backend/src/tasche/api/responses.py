@@ -0,0 +1,88 @@
+"""検証済みモデルをそのまま JSON にするレスポンス経路.
+
+FastAPI は response_model を持つルートで、ハンドラの戻り値を response_model で
+検証し直してから JSON 化する。この再検証を省き、pydantic-core のシリアライザで
+1 回だけ JSON 化する経路を提供する。ハンドラがモデルを組み立てて返す現状のルートでは
+計測上の効果が無いため、どのルートにも適用していない（ADR-B-003）。再検証のコストを
+ベンチマーク（scripts/bench_response_serialization.py）で確認できたルートにのみ使う。
+
+ルートの書き方:
+
+    router = APIRouter(route_class=ModelResponseRoute)
+
+    @router.get("", response_model=APIResponse[Foo], response_class=ModelJSONResponse)
+    async def get_foo(...) -> APIResponse[Foo]:
+        return APIResponse(data=...)
+
+- VALIDATE_RESPONSE_MODELS=true（既定。本番を含む）では通常の FastAPI の経路
+  （再検証 + dump_json）で処理する
+- VALIDATE_RESPONSE_MODELS=false では response_class=ModelJSONResponse の
+  ルートのみ再検証を省略する。OpenAPI の定義は response_model のまま変わらない
+- 依存関係が Response に設定した Cookie・ヘッダ（プライマリ固定 Cookie など）と
+  ステータスコードは、FastAPI の通常経路と同様に引き継ぐ
+"""
+
+import functools
+import inspect
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Response
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from tasche.core.config import settings
+
+# 依存関係と共有される Response を受け取るため、ラップしたエンドポイントに追加する引数名
+_SUB_RESPONSE_PARAM = "model_response_sub_response"
+
+
+class ModelJSONResponse(JSONResponse):
+    """Pydantic モデルを pydantic-core で直接 JSON 化するレスポンス."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return super().render(content)
+
+
+def _skip_response_validation(
+    endpoint: Callable[..., Awaitable[Any]], status_code: int | None
+) -> Callable[..., Awaitable[Any]]:
+    """戻り値を ModelJSONResponse で包み、FastAPI の再検証・再シリアライズを経由させない."""
+    signature = inspect.signature(endpoint)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        sub_response: Response = kwargs.pop(_SUB_RESPONSE_PARAM)
+        content = await endpoint(*args, **kwargs)
+        if isinstance(content, Response):
+            return content
+        response = ModelJSONResponse(content, status_code=sub_response.status_code or status_code)
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(
+                _SUB_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+            ),
+        ]
+    )
+    return wrapper
+
+
+class ModelResponseRoute(APIRoute):
+    """response_class=ModelJSONResponse のルートで、応答モデルの再検証を切り替える."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if kwargs.get("response_class") is ModelJSONResponse:
+            if settings.validate_response_models:
+                # 通常の経路（再検証 + dump_json）に戻す
+                kwargs["response_class"] = Default(JSONResponse)
+            else:
+                endpoint = _skip_response_validation(endpoint, kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
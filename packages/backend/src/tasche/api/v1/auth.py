@@ -4,7 +4,7 @@ import logging
 
 from fastapi import APIRouter, Cookie, Response
 
-from tasche.api.deps import DbSession
+from tasche.api.deps import CurrentUserSub, DbSession
 from tasche.core.config import settings
 from tasche.core.cookies import SESSION_COOKIE, clear_session_cookie, set_session_cookie
 from tasche.core.env import is_auth_stub_enabled
@@ -12,6 +12,7 @@ from tasche.core.exceptions import ValidationError
 from tasche.schemas.auth import (
     AuthorizeResponse,
     GoogleCallbackRequest,
+    LogoutAllResponse,
     LogoutResponse,
     StubLoginRequest,
 )
@@ -22,7 +23,7 @@ from tasche.services.auth import (
     handle_google_callback,
     stub_login,
 )
-from tasche.services.session import revoke_session
+from tasche.services.session import revoke_all_sessions, revoke_session
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +137,36 @@ async def logout(
     return APIResponse(data=LogoutResponse(message="ログアウトしました"))
 
 
+@router.post("/logout-all", response_model=APIResponse[LogoutAllResponse])
+async def logout_all(
+    response: Response,
+    db: DbSession,
+    user_id: CurrentUserSub,
+):
+    """全端末からログアウト（ユーザーの全セッションを revoke し Cookie を削除する）.
+
+    アカウント侵害時の対応を想定し、1 ステートメントで全セッションを revoke する。
+    認証必須（未認証は 401）。
+
+    Args:
+        response: FastAPI Response（Cookie 削除用）
+        db: データベースセッション
+        user_id: 現在のユーザーID
+
+    Returns:
+        APIResponse[LogoutAllResponse]: 完了メッセージと revoke したセッション数
+    """
+    revoked = await revoke_all_sessions(db, user_id)
+    await db.commit()
+    clear_session_cookie(response)
+
+    return APIResponse(
+        data=LogoutAllResponse(
+            message="すべての端末からログアウトしました", revoked_sessions=revoked
+        )
+    )
+
+
 # スタブログインエンドポイントは is_auth_stub_enabled() が true の場合のみ登録
 if is_auth_stub_enabled(settings.app_env, settings.auth_stub_enabled):
 
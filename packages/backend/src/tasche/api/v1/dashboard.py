@@ -1,18 +1,22 @@
 """ダッシュボード API エンドポイント."""
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 
-from tasche.api.deps import CurrentUser, DbSession
+from tasche.api.conditional import check_not_modified
+from tasche.api.deps import CurrentUser, ReadDbSession
 from tasche.schemas.common import APIResponse
 from tasche.schemas.dashboard import DashboardResponse
 from tasche.services import dashboard as dashboard_service
+from tasche.services.data_version import get_user_data_version
 
 router = APIRouter()
 
 
 @router.get("", response_model=APIResponse[DashboardResponse])
 async def get_dashboard(
-    db: DbSession,
+    request: Request,
+    response: Response,
+    db: ReadDbSession,
     current_user: CurrentUser,
     timezone_param: str | None = Query(
         None,
@@ -20,11 +24,24 @@ async def get_dashboard(
         max_length=64,
         description="タイムゾーン（デフォルト: ユーザー設定値）",
     ),
-) -> APIResponse[DashboardResponse]:
-    """ダッシュボード表示用の集約データを取得する."""
+) -> APIResponse[DashboardResponse] | Response:
+    """ダッシュボード表示用の集約データを取得する（If-None-Match 一致時は 304）.
+
+    集計結果のキャッシュは ETag と同じデータの版をキーに含める（他コンテナでの
+    更新後に、新しい ETag で古い本体を返さないため）。版は認証で読んだ users の行から
+    取るため、キャッシュヒット時は認証以外の DB 往復が無い。
+    """
+    scope = dashboard_service.get_dashboard_scope(current_user, timezone_name=timezone_param)
+    version = await get_user_data_version(db, current_user)
+    not_modified = await check_not_modified(
+        request, response, db, current_user, scope.key(), data_version=version
+    )
+    if not_modified is not None:
+        return not_modified
     dashboard = await dashboard_service.get_dashboard(
         db,
         current_user,
         timezone_name=timezone_param,
+        data_version=version,
     )
     return APIResponse(data=dashboard)
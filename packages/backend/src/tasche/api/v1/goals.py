@@ -1,7 +1,8 @@
 """目標 API エンドポイント."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
+from tasche.api.conditional import check_not_modified
 from tasche.api.deps import CurrentUser, DbSession
 from tasche.api.transaction import transaction
 from tasche.schemas.common import APIResponse
@@ -11,16 +12,32 @@ from tasche.schemas.goal import (
     GoalsUpdateResponse,
 )
 from tasche.services import goal as goal_service
+from tasche.services import week as week_service
 
 router = APIRouter()
 
 
 @router.get("", response_model=APIResponse[GoalsResponse])
 async def get_current_goals(
+    request: Request,
+    response: Response,
     db: DbSession,
     current_user: CurrentUser,
-) -> APIResponse[GoalsResponse]:
-    """今週の目標一覧を取得する."""
+) -> APIResponse[GoalsResponse] | Response:
+    """今週の目標一覧を取得する（If-None-Match 一致時は 304）.
+
+    ETag は現在週の開始日を含むため、週が切り替わった後の初回は必ず本体を返し
+    current week を作成する。
+    """
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        current_user,
+        week_service.get_current_week_start_date(current_user),
+    )
+    if not_modified is not None:
+        return not_modified
     async with transaction(db):
         goals = await goal_service.list_current_goals(db, current_user)
     return APIResponse(data=goals)
@@ -3,19 +3,24 @@
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from tasche.api.deps import CurrentUser, DbSession
+from tasche.api.conditional import check_not_modified
+from tasche.api.deps import CurrentUser, DbSession, ReadDbSession
 from tasche.models.enums import DayOfWeek
 from tasche.schemas.common import APIResponse
 from tasche.schemas.record import (
+    RecordBatchResult,
+    RecordBatchUpsert,
+    RecordBatchUpsertResponse,
     RecordCreate,
     RecordResponse,
     RecordsResponse,
     RecordUpdate,
 )
 from tasche.services import record as record_service
+from tasche.services import week as week_service
 
 router = APIRouter()
 
@@ -56,14 +61,50 @@ def _build_record_response(record, task_name: str) -> RecordResponse:
 
 @router.get("", response_model=APIResponse[RecordsResponse])
 async def get_current_records(
-    db: DbSession,
+    request: Request,
+    response: Response,
+    db: ReadDbSession,
     current_user: CurrentUser,
-) -> APIResponse[RecordsResponse]:
-    """今週の実績一覧を取得する."""
+) -> APIResponse[RecordsResponse] | Response:
+    """今週の実績一覧を取得する（If-None-Match 一致時は 304）."""
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        current_user,
+        week_service.get_current_week_start_date(current_user),
+    )
+    if not_modified is not None:
+        return not_modified
     records = await record_service.list_current_records(db, current_user)
     return APIResponse(data=records)
 
 
+@router.put("", response_model=APIResponse[RecordBatchUpsertResponse])
+async def upsert_records(
+    batch: RecordBatchUpsert,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> APIResponse[RecordBatchUpsertResponse]:
+    """今週の実績を複数セルまとめて作成または更新する.
+
+    1 つでも対象外のタスクがあれば 404 で、どのセルも更新しない。
+    """
+    async with _transaction(db):
+        upserted = await record_service.upsert_current_records(db, current_user, batch.records)
+        response = APIResponse(
+            data=RecordBatchUpsertResponse(
+                results=[
+                    RecordBatchResult(
+                        created=created, record=_build_record_response(record, task_name)
+                    )
+                    for record, task_name, created in upserted
+                ]
+            )
+        )
+    return response
+
+
 @router.put("/{day_of_week}/{task_id}", response_model=APIResponse[RecordResponse])
 async def upsert_record(
     day_of_week: DayOfWeek,
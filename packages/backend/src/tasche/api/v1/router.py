@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 
 from tasche.api.deps import require_secrets_resolved
-from tasche.api.v1 import auth, dashboard, goals, records, settings, tasks, users, weeks
+from tasche.api.v1 import auth, dashboard, goals, records, settings, stats, tasks, users, weeks
 
 api_router = APIRouter(dependencies=[Depends(require_secrets_resolved)])
 
@@ -15,3 +15,4 @@ api_router.include_router(weeks.router, prefix="/weeks", tags=["週"])
 api_router.include_router(goals.router, prefix="/weeks/current/goals", tags=["目標"])
 api_router.include_router(records.router, prefix="/weeks/current/records", tags=["実績"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["ダッシュボード"])
+api_router.include_router(stats.router, prefix="/stats", tags=["統計"])
@@ -0,0 +1,37 @@
+"""統計 API エンドポイント."""
+
+from datetime import date
+
+from fastapi import APIRouter, Query, Request, Response
+
+from tasche.api.conditional import check_not_modified
+from tasche.api.deps import CurrentUser, ReadDbSession
+from tasche.schemas.common import APIResponse
+from tasche.schemas.stats import StatsGranularity, StatsResponse
+from tasche.services import stats as stats_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=APIResponse[StatsResponse])
+async def get_stats(
+    request: Request,
+    response: Response,
+    db: ReadDbSession,
+    current_user: CurrentUser,
+    start_date: date = Query(..., alias="from", description="集計範囲の開始日（週開始日で判定）"),
+    end_date: date = Query(..., alias="to", description="集計範囲の終了日（週開始日で判定）"),
+    granularity: StatsGranularity = Query(StatsGranularity.WEEK, description="集計単位"),
+) -> APIResponse[StatsResponse] | Response:
+    """週・月単位の目標・実績の推移を取得する（If-None-Match 一致時は 304）."""
+    not_modified = await check_not_modified(request, response, db, current_user)
+    if not_modified is not None:
+        return not_modified
+    stats = await stats_service.get_stats(
+        db,
+        current_user.id,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+    )
+    return APIResponse(data=stats)
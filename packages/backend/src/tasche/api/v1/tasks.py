@@ -1,8 +1,9 @@
 """タスク API エンドポイント."""
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 
-from tasche.api.deps import CurrentUser, DbSession
+from tasche.api.conditional import check_not_modified
+from tasche.api.deps import CurrentUser, DbSession, ReadDbSession
 from tasche.api.transaction import transaction
 from tasche.models.task import Task
 from tasche.schemas.common import APIResponse
@@ -15,19 +16,32 @@ from tasche.schemas.task import (
     TaskUpdate,
 )
 from tasche.services import task as task_service
+from tasche.services import week as week_service
 
 router = APIRouter()
 
 
 @router.get("", response_model=APIResponse[TaskListResponse])
 async def get_tasks(
-    db: DbSession,
+    request: Request,
+    response: Response,
+    db: ReadDbSession,
     current_user: CurrentUser,
     include_archived: bool = Query(False, description="アーカイブ済みタスクを含める"),
     page: int = Query(1, ge=1, le=10000, description="ページ番号（1-indexed）"),
     per_page: int = Query(20, ge=1, le=100, description="1ページあたり件数（最大100）"),
-) -> APIResponse[TaskListResponse]:
-    """タスク一覧を取得する."""
+) -> APIResponse[TaskListResponse] | Response:
+    """タスク一覧を取得する（If-None-Match 一致時は 304）."""
+    # 先週の消化量は週の切り替わりで変わるため、現在週の開始日を ETag に含める
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        current_user,
+        week_service.get_current_week_start_date(current_user),
+    )
+    if not_modified is not None:
+        return not_modified
     rows, total = await task_service.get_tasks_with_stats(
         db,
         current_user,
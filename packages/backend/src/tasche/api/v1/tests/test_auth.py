@@ -1,5 +1,7 @@
 """認証 API の統合テスト（Google OAuth 2.0）."""
 
+import asyncio
+import time
 from unittest.mock import patch
 
 import respx
@@ -486,6 +488,106 @@ class TestGoogleCallback:
         assert week is not None
         assert week.unit_duration_minutes == 30
 
+    async def test_callback_fetches_jwks_concurrently_with_token_exchange(
+        self,
+        client: AsyncClient,
+        rsa_private_key_pem: str,
+        test_jwks: dict,
+    ):
+        """JWKS 未取得時、公開鍵の取得がトークン交換の完了を待たずに始まることを確認.
+
+        /token のモックは JWKS 取得が始まるまで応答を返さないため、直列に実行していれば
+        タイムアウトする。待ち時間は 2 往復の合計ではなく長い方の 1 往復分になる。
+        """
+        id_token = make_google_id_token(
+            rsa_private_key_pem,
+            sub="google_sub_concurrent",
+            email="concurrent@example.com",
+            aud="test_client_id",
+        )
+        delay = 0.2
+        jwks_requested = asyncio.Event()
+
+        async def _slow_token(request):
+            await asyncio.wait_for(jwks_requested.wait(), timeout=1)
+            await asyncio.sleep(delay)
+            return Response(200, json=_mock_google_token_success(id_token))
+
+        async def _slow_jwks(request):
+            jwks_requested.set()
+            await asyncio.sleep(delay)
+            return Response(200, json=test_jwks)
+
+        with (
+            patch.object(
+                settings, "google_oauth_redirect_uris", "http://localhost:5173/auth/callback"
+            ),
+            patch.object(settings, "google_oauth_client_id", "test_client_id"),
+            respx.mock as mock,
+        ):
+            mock.post("https://oauth2.googleapis.com/token").mock(side_effect=_slow_token)
+            jwks_route = mock.get("https://www.googleapis.com/oauth2/v3/certs").mock(
+                side_effect=_slow_jwks
+            )
+
+            started = time.monotonic()
+            response = await client.post(
+                "/api/auth/google/callback",
+                json={
+                    "code": "auth_code_dummy",
+                    "code_verifier": "code_verifier_dummy",
+                    "redirect_uri": "http://localhost:5173/auth/callback",
+                    "state": "state_dummy",
+                },
+            )
+            elapsed = time.monotonic() - started
+
+        assert response.status_code == 200
+        assert jwks_route.call_count == 1
+        assert elapsed < delay * 2
+
+    async def test_callback_failure_does_not_wait_for_jwks_prefetch(
+        self,
+        client: AsyncClient,
+        test_jwks: dict,
+    ):
+        """異常系: トークン交換の失敗は JWKS 取得の完了を待たずに 400 を返すことを確認."""
+        delay = 0.5
+        jwks_done = asyncio.Event()
+
+        async def _slow_jwks(request):
+            await asyncio.sleep(delay)
+            jwks_done.set()
+            return Response(200, json=test_jwks)
+
+        with (
+            patch.object(
+                settings, "google_oauth_redirect_uris", "http://localhost:5173/auth/callback"
+            ),
+            respx.mock as mock,
+        ):
+            mock.post("https://oauth2.googleapis.com/token").mock(
+                return_value=Response(400, json={"error": "invalid_grant"})
+            )
+            mock.get("https://www.googleapis.com/oauth2/v3/certs").mock(side_effect=_slow_jwks)
+
+            started = time.monotonic()
+            response = await client.post(
+                "/api/auth/google/callback",
+                json={
+                    "code": "invalid_code",
+                    "code_verifier": "code_verifier_dummy",
+                    "redirect_uri": "http://localhost:5173/auth/callback",
+                    "state": "state_dummy",
+                },
+            )
+            elapsed = time.monotonic() - started
+
+            assert response.status_code == 400
+            assert elapsed < delay
+            # 取得はバックグラウンドで完了する
+            await asyncio.wait_for(jwks_done.wait(), timeout=delay * 2)
+
 
 # ============================================================
 # POST /api/auth/logout テスト
@@ -558,6 +660,39 @@ class TestLogout:
         assert response.status_code == 200
 
 
+# ============================================================
+# POST /api/auth/logout-all テスト
+# ============================================================
+
+
+class TestLogoutAll:
+    """POST /api/auth/logout-all のテスト."""
+
+    async def test_logout_all_revokes_every_session(
+        self,
+        client: AsyncClient,
+        test_user,
+        auth_cookies,
+    ):
+        """正常系: 全セッションが revoke され、Cookie が削除されることを確認."""
+        current = await auth_cookies(test_user)
+        other_device = await auth_cookies(test_user)
+
+        response = await client.post("/api/auth/logout-all", cookies=current)
+
+        assert response.status_code == 200
+        assert response.json()["data"]["revoked_sessions"] == 2
+        assert 'session=""' in response.headers["set-cookie"]
+        for cookies in (current, other_device):
+            me_response = await client.get("/api/users/me", cookies=cookies)
+            assert me_response.status_code == 401
+
+    async def test_logout_all_requires_authentication(self, client: AsyncClient):
+        """未認証の場合は 401 を返すことを確認."""
+        response = await client.post("/api/auth/logout-all")
+        assert response.status_code == 401
+
+
 # ============================================================
 # POST /api/auth/stub-login テスト
 # ============================================================
@@ -0,0 +1,155 @@
+"""条件付き GET（ETag / If-None-Match）の統合テスト."""
+
+from datetime import UTC, date, datetime
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.api.conditional import build_etag, etag_matches
+from tasche.models.task import Task
+from tasche.models.user import User
+from tasche.models.week import Week
+from tasche.services import dashboard as dashboard_service
+from tasche.services import week as week_service
+
+CONDITIONAL_PATHS = [
+    "/api/tasks",
+    "/api/weeks/current/goals",
+    "/api/weeks/current/records",
+    "/api/dashboard",
+]
+
+
+@pytest_asyncio.fixture
+async def current_week(db_session: AsyncSession, test_user: User) -> Week:
+    """テスト用 current week."""
+    week = Week(
+        id="wk_01TEST1234567890ABCDEF",
+        user_id=test_user.id,
+        start_date=date(2026, 4, 20),
+        end_date=date(2026, 4, 26),
+        unit_duration_minutes=30,
+        week_start_day="monday",
+        week_start_hour=4,
+    )
+    db_session.add(week)
+    await db_session.commit()
+    return week
+
+
+@pytest_asyncio.fixture
+async def task(db_session: AsyncSession, test_user: User) -> Task:
+    """テスト用タスク."""
+    task = Task(id="tsk_01TEST1234567890ABCDEF", user_id=test_user.id, name="英語学習")
+    db_session.add(task)
+    await db_session.commit()
+    return task
+
+
+@pytest.fixture
+def fixed_now(monkeypatch: pytest.MonkeyPatch) -> datetime:
+    """current week 判定を固定する."""
+    now = datetime(2026, 4, 22, 3, 0, tzinfo=UTC)
+    monkeypatch.setattr(week_service, "get_current_time_utc", lambda: now)
+    return now
+
+
+class TestEtagMatches:
+    """etag_matches のテスト."""
+
+    def test_weak_comparison(self):
+        """W/ の有無に関わらず opaque-tag が一致すれば一致とみなすことを確認."""
+        etag = build_etag("a")
+        assert etag_matches(etag.removeprefix("W/"), etag)
+        assert etag_matches(f'W/"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(build_etag("b"), etag)
+        assert not etag_matches(None, etag)
+
+
+class TestConditionalGet:
+    """読み取り系 GET の ETag / 304 のテスト."""
+
+    @pytest.mark.parametrize("path", CONDITIONAL_PATHS)
+    async def test_returns_304_when_unchanged(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        task: Task,
+        fixed_now: datetime,
+        path: str,
+    ):
+        """変更が無ければ If-None-Match に 304（本文なし）を返すことを確認."""
+        first = await authenticated_client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        second = await authenticated_client.get(path, headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    async def test_skips_building_response_when_not_modified(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        fixed_now: datetime,
+    ):
+        """304 の場合は集計（レスポンスモデルの組み立て）を行わないことを確認."""
+        etag = (await authenticated_client.get("/api/dashboard")).headers["etag"]
+
+        with patch.object(dashboard_service, "get_dashboard") as get_dashboard:
+            response = await authenticated_client.get(
+                "/api/dashboard", headers={"If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        get_dashboard.assert_not_called()
+
+    async def test_etag_changes_after_write(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        task: Task,
+        fixed_now: datetime,
+    ):
+        """実績・タスク名の更新後は ETag が変わり本体を返すことを確認."""
+        etag = (await authenticated_client.get("/api/weeks/current/records")).headers["etag"]
+
+        await authenticated_client.put(
+            f"/api/weeks/current/records/wednesday/{task.id}", json={"actual_units": 1.0}
+        )
+        after_record = await authenticated_client.get(
+            "/api/weeks/current/records", headers={"If-None-Match": etag}
+        )
+        assert after_record.status_code == 200
+        assert after_record.headers["etag"] != etag
+
+        await authenticated_client.put(f"/api/tasks/{task.id}", json={"name": "英会話"})
+        after_rename = await authenticated_client.get(
+            "/api/weeks/current/records",
+            headers={"If-None-Match": after_record.headers["etag"]},
+        )
+        assert after_rename.status_code == 200
+        assert after_rename.json()["data"]["records"][0]["task_name"] == "英会話"
+
+    async def test_etag_depends_on_query(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        fixed_now: datetime,
+    ):
+        """クエリ（タイムゾーン・ページ）が異なれば別の ETag になることを確認."""
+        tokyo = await authenticated_client.get("/api/dashboard")
+        new_york = await authenticated_client.get(
+            "/api/dashboard?timezone=America/New_York",
+            headers={"If-None-Match": tokyo.headers["etag"]},
+        )
+
+        assert new_york.status_code != 304
+        assert new_york.headers.get("etag") != tokyo.headers["etag"]
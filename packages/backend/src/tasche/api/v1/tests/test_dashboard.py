@@ -7,12 +7,17 @@ import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from tasche.db.query_stats import reset_query_stats, start_query_stats
+from tasche.models.enums import DayOfWeek
 from tasche.models.goal import Goal
 from tasche.models.record import Record
 from tasche.models.task import Task
 from tasche.models.user import User
 from tasche.models.week import Week
+from tasche.services import dashboard as dashboard_service
 from tasche.services import week as week_service
+from tasche.services.dashboard_cache import get_dashboard_cache_stats
+from tasche.services.data_version import bump_user_data_version
 
 
 @pytest_asyncio.fixture
@@ -307,6 +312,64 @@ class TestGetDashboard:
         data = response.json()["data"]
         assert [item["task_id"] for item in data["weekly_matrix"]] == [english.id]
 
+    async def test_aggregates_in_one_statement(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """週・目標・実績を 1 ステートメントで取得し、目標のみ／実績のみの日も集計する."""
+        english, dev = test_tasks
+        await _add_goal(
+            db_session,
+            goal_id="gol_english_wed",
+            week_id=current_week.id,
+            task_id=english.id,
+            day_of_week="wednesday",
+            target_units=2.0,
+        )
+        await _add_record(
+            db_session,
+            record_id="rec_english_thu",
+            week_id=current_week.id,
+            task_id=english.id,
+            day_of_week="thursday",
+            actual_units=1.0,
+        )
+        await _add_record(
+            db_session,
+            record_id="rec_dev_wed",
+            week_id=current_week.id,
+            task_id=dev.id,
+            day_of_week="wednesday",
+            actual_units=0.5,
+        )
+
+        stats, token = start_query_stats()
+        try:
+            dashboard = await dashboard_service.get_dashboard(db_session, test_user)
+        finally:
+            reset_query_stats(token)
+
+        assert stats.statements == 1
+        english_item, dev_item = dashboard.weekly_matrix
+        assert english_item.task_id == english.id
+        assert english_item.daily_data[DayOfWeek.WEDNESDAY].model_dump() == {
+            "target_units": 2.0,
+            "actual_units": 0.0,
+            "completion_rate": 0.0,
+        }
+        assert english_item.daily_data[DayOfWeek.THURSDAY].model_dump() == {
+            "target_units": 0.0,
+            "actual_units": 1.0,
+            "completion_rate": None,
+        }
+        assert dev_item.daily_data[DayOfWeek.WEDNESDAY].actual_units == 0.5
+        assert [goal.task_id for goal in dashboard.today_goals] == [english.id]
+        assert dashboard.has_goals_configured is True
+
     async def test_returns_empty_when_goals_not_configured(
         self,
         authenticated_client: AsyncClient,
@@ -414,3 +477,152 @@ class TestGetDashboard:
         assert data["current_date"] == "2026-04-26"
         assert data["current_day_of_week"] == "sunday"
         assert data["week"]["id"] == new_york_week.id
+
+
+class TestDashboardCache:
+    """ダッシュボードキャッシュと更新系 API による無効化のテスト."""
+
+    async def test_second_request_is_served_from_cache(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """同じ (ユーザー, 週, ローカル日付) の 2 回目は DB を参照しないことを確認."""
+        first = await dashboard_service.get_dashboard(db_session, test_user)
+
+        stats, token = start_query_stats()
+        try:
+            second = await dashboard_service.get_dashboard(db_session, test_user)
+        finally:
+            reset_query_stats(token)
+
+        assert stats.statements == 0
+        assert second == first
+        assert get_dashboard_cache_stats().hits == 1
+
+    async def test_cache_hit_over_api_skips_db_beyond_auth(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """API 経由のキャッシュヒットでは、認証以外に DB を参照しないことを確認.
+
+        キャッシュキーの版は認証で読んだ users の行から取るため、版の取得でも往復しない
+        （テストではセッションと User もキャッシュ・同一セッションから解決されるため 0 回）。
+        """
+        first = await authenticated_client.get("/api/dashboard")
+        second = await authenticated_client.get("/api/dashboard")
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert get_dashboard_cache_stats().hits == 1
+        assert 'desc="0 statements"' in second.headers["server-timing"]
+
+    async def test_timezone_is_part_of_cache_key(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        fixed_now: datetime,
+    ):
+        """タイムゾーンが異なれば（ローカル日付が変わるため）キャッシュを使わないことを確認."""
+        tokyo = await dashboard_service.get_dashboard(db_session, test_user)
+        new_york = await dashboard_service.get_dashboard(
+            db_session, test_user, timezone_name="America/New_York"
+        )
+
+        assert tokyo.current_date == date(2026, 4, 22)
+        assert new_york.current_date == date(2026, 4, 21)
+
+    async def test_record_upsert_invalidates_cache(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """実績の登録後はキャッシュではなく最新の集計を返すことを確認."""
+        english, _ = test_tasks
+        await authenticated_client.get("/api/dashboard")
+
+        response = await authenticated_client.put(
+            f"/api/weeks/current/records/wednesday/{english.id}",
+            json={"actual_units": 1.5},
+        )
+        assert response.status_code == 200
+
+        data = (await authenticated_client.get("/api/dashboard")).json()["data"]
+        assert data["weekly_matrix"][0]["daily_data"]["wednesday"]["actual_units"] == 1.5
+
+    async def test_task_rename_invalidates_cache(
+        self,
+        authenticated_client: AsyncClient,
+        db_session: AsyncSession,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """タスク名の変更後はマトリックスのタスク名が更新されることを確認."""
+        english, _ = test_tasks
+        await _add_goal(
+            db_session,
+            goal_id="gol_english_wed",
+            week_id=current_week.id,
+            task_id=english.id,
+            day_of_week="wednesday",
+            target_units=2.0,
+        )
+        await authenticated_client.get("/api/dashboard")
+
+        response = await authenticated_client.put(
+            f"/api/tasks/{english.id}", json={"name": "英会話"}
+        )
+        assert response.status_code == 200
+
+        data = (await authenticated_client.get("/api/dashboard")).json()["data"]
+        assert data["weekly_matrix"][0]["task_name"] == "英会話"
+
+    async def test_write_from_other_container_is_not_served_under_new_etag(
+        self,
+        authenticated_client: AsyncClient,
+        db_session: AsyncSession,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """他コンテナでの更新後は、新しい ETag で古いキャッシュの本体を返さないことを確認.
+
+        他コンテナの書き込みはデータの版を上げるが、このコンテナのキャッシュは無効化しない。
+        実績の書き込みと版の更新だけを行って再現する。
+        """
+        english, _ = test_tasks
+        first = await authenticated_client.get("/api/dashboard")
+        assert first.status_code == 200
+
+        await bump_user_data_version(db_session, current_week.user_id)
+        await _add_record(
+            db_session,
+            record_id="rec_english_wed",
+            week_id=current_week.id,
+            task_id=english.id,
+            day_of_week="wednesday",
+            actual_units=1.5,
+        )
+
+        second = await authenticated_client.get(
+            "/api/dashboard", headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        data = second.json()["data"]
+        assert data["weekly_matrix"][0]["daily_data"]["wednesday"]["actual_units"] == 1.5
+
+        third = await authenticated_client.get(
+            "/api/dashboard", headers={"If-None-Match": second.headers["etag"]}
+        )
+        assert third.status_code == 304
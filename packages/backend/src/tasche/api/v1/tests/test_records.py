@@ -8,6 +8,8 @@ from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from tasche.core.exceptions import WeekNotFoundException
+from tasche.db.query_stats import reset_query_stats, start_query_stats
 from tasche.models.enums import DayOfWeek
 from tasche.models.record import Record
 from tasche.models.task import Task
@@ -255,13 +257,14 @@ class TestUpsertRecord:
 
         assert created is True
         assert record.week_id == current_week.id
+        record_id = record.id
 
         await db_session.rollback()
 
-        result = await db_session.execute(select(Record).where(Record.id == record.id))
+        result = await db_session.execute(select(Record).where(Record.id == record_id))
         assert result.scalar_one_or_none() is None
 
-    async def test_service_can_skip_flush_and_refresh(
+    async def test_service_upserts_in_one_statement(
         self,
         db_session: AsyncSession,
         test_user: User,
@@ -269,25 +272,54 @@ class TestUpsertRecord:
         test_tasks: tuple[Task, Task],
         fixed_now: datetime,
     ):
-        """呼び出し元が flush / refresh のタイミングを制御できる."""
+        """タスク・週の確認と書き込みを 1 ステートメント（+ 週のロック・ロールアップ更新・版の更新）で行う."""
         english, _ = test_tasks
 
-        record, _, created = await record_service.upsert_current_record(
-            db_session,
-            test_user,
-            task_id=english.id,
-            day_of_week=DayOfWeek.TUESDAY,
-            actual_units=1.0,
-            flush_record=False,
-            refresh_record=False,
-        )
-
-        assert created is True
-        assert record.created_at is None
-        assert record.updated_at is None
+        results = []
+        for actual_units in (1.0, 2.5):
+            stats, token = start_query_stats()
+            try:
+                results.append(
+                    await record_service.upsert_current_record(
+                        db_session,
+                        test_user,
+                        task_id=english.id,
+                        day_of_week=DayOfWeek.TUESDAY,
+                        actual_units=actual_units,
+                    )
+                )
+            finally:
+                reset_query_stats(token)
+            assert stats.statements == 4
+
+        (first, task_name, first_created), (second, _, second_created) = results
+        assert task_name == english.name
+        assert (first_created, second_created) == (True, False)
+        assert second.id == first.id
+        assert second.actual_units == 2.5
+        assert second.created_at is not None
 
         await db_session.rollback()
 
+    async def test_service_raises_week_not_found_for_active_task(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """タスクはあるが current week が無い場合は WeekNotFoundException."""
+        english, _ = test_tasks
+
+        with pytest.raises(WeekNotFoundException):
+            await record_service.upsert_current_record(
+                db_session,
+                test_user,
+                task_id=english.id,
+                day_of_week=DayOfWeek.TUESDAY,
+                actual_units=1.0,
+            )
+
     async def test_rejects_other_users_task(
         self,
         authenticated_client: AsyncClient,
@@ -340,6 +372,121 @@ class TestUpsertRecord:
         assert response.status_code == 422
 
 
+class TestBatchUpsertRecords:
+    """PUT /api/weeks/current/records（一括更新）のテスト."""
+
+    async def test_creates_and_updates_cells_in_request_order(
+        self,
+        authenticated_client: AsyncClient,
+        db_session: AsyncSession,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """新規・既存のセルをまとめて書き込み、セルごとに created を返すことを確認."""
+        english, dev = test_tasks
+        db_session.add(
+            Record(
+                id="rec_existing",
+                week_id=current_week.id,
+                task_id=english.id,
+                day_of_week="wednesday",
+                actual_units=1.5,
+            )
+        )
+        await db_session.commit()
+
+        response = await authenticated_client.put(
+            "/api/weeks/current/records",
+            json={
+                "records": [
+                    {"task_id": dev.id, "day_of_week": "monday", "actual_units": 0.5},
+                    {"task_id": english.id, "day_of_week": "wednesday", "actual_units": 2.0},
+                    {"task_id": english.id, "day_of_week": "thursday", "actual_units": 1.0},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["data"]["results"]
+        assert [
+            (r["created"], r["record"]["task_id"], r["record"]["day_of_week"]) for r in results
+        ] == [
+            (True, dev.id, "monday"),
+            (False, english.id, "wednesday"),
+            (True, english.id, "thursday"),
+        ]
+        assert results[1]["record"]["id"] == "rec_existing"
+        assert results[1]["record"]["actual_units"] == 2.0
+        assert results[0]["record"]["task_name"] == dev.name
+        # セッション照合 + 週 + タスクの IN + upsert + 週のロック + ロールアップ更新
+        # + データの版の更新（セル数に依存しない）
+        assert 'desc="7 statements"' in response.headers["server-timing"]
+
+        result = await db_session.execute(select(Record).where(Record.week_id == current_week.id))
+        assert len(list(result.scalars())) == 3
+
+    async def test_unknown_task_rejects_whole_batch(
+        self,
+        authenticated_client: AsyncClient,
+        db_session: AsyncSession,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """対象外のタスクが含まれる場合は 404 で、どのセルも書き込まないことを確認."""
+        english, _ = test_tasks
+
+        response = await authenticated_client.put(
+            "/api/weeks/current/records",
+            json={
+                "records": [
+                    {"task_id": english.id, "day_of_week": "monday", "actual_units": 1.0},
+                    {"task_id": "tsk_unknown", "day_of_week": "monday", "actual_units": 1.0},
+                ]
+            },
+        )
+
+        assert response.status_code == 404
+        result = await db_session.execute(select(Record))
+        assert list(result.scalars()) == []
+
+    async def test_duplicate_cells_are_rejected(
+        self,
+        authenticated_client: AsyncClient,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """同じタスク × 曜日の重複は 400 になることを確認."""
+        english, _ = test_tasks
+        cell = {"task_id": english.id, "day_of_week": "monday", "actual_units": 1.0}
+
+        response = await authenticated_client.put(
+            "/api/weeks/current/records", json={"records": [cell, cell]}
+        )
+
+        assert response.status_code == 400
+
+    async def test_returns_404_when_current_week_does_not_exist(
+        self,
+        authenticated_client: AsyncClient,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """current week 未作成時は単一セルの PUT と同じく 404 を返すことを確認."""
+        english, _ = test_tasks
+
+        response = await authenticated_client.put(
+            "/api/weeks/current/records",
+            json={
+                "records": [{"task_id": english.id, "day_of_week": "monday", "actual_units": 1.0}]
+            },
+        )
+
+        assert response.status_code == 404
+
+
 class TestWeekBoundary:
     """週境界の判定テスト."""
 
@@ -0,0 +1,220 @@
+"""統計 API の統合テスト."""
+
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.models.enums import DayOfWeek
+from tasche.models.goal import Goal
+from tasche.models.record import Record
+from tasche.models.task import Task
+from tasche.models.user import User
+from tasche.models.week import Week
+from tasche.services.rollup import rebuild_rollups
+
+ENGLISH_ID = "tsk_01STATS1234567890ABCDE"
+DEV_ID = "tsk_02STATS1234567890ABCDE"
+
+
+def _week(week_id: str, user_id: str, start_date: date) -> Week:
+    return Week(
+        id=week_id,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=date.fromordinal(start_date.toordinal() + 6),
+        unit_duration_minutes=30,
+        week_start_day="monday",
+        week_start_hour=4,
+    )
+
+
+def _goal(goal_id: str, week_id: str, task_id: str, day: DayOfWeek, units: float) -> Goal:
+    return Goal(id=goal_id, week_id=week_id, task_id=task_id, day_of_week=day, target_units=units)
+
+
+def _record(record_id: str, week_id: str, task_id: str, day: DayOfWeek, units: float) -> Record:
+    return Record(
+        id=record_id, week_id=week_id, task_id=task_id, day_of_week=day, actual_units=units
+    )
+
+
+@pytest_asyncio.fixture
+async def stats_data(db_session: AsyncSession, test_user: User) -> None:
+    """3/30・4/6・4/13（目標・実績なし）・5/4 の 4 週と、他ユーザーの 4/6 週."""
+    other = User(id="usr_OTHERSTATS1234567890AB", email="other-stats@example.com", name="Other")
+    db_session.add(other)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            Task(id=ENGLISH_ID, user_id=test_user.id, name="英語学習"),
+            Task(id=DEV_ID, user_id=test_user.id, name="個人開発", is_archived=True),
+            Task(id="tsk_03STATS1234567890ABCDE", user_id=other.id, name="他人のタスク"),
+        ]
+    )
+    await db_session.flush()
+    db_session.add_all(
+        [
+            _week("wk_01STATS1234567890ABCDEF", test_user.id, date(2026, 3, 30)),
+            _week("wk_02STATS1234567890ABCDEF", test_user.id, date(2026, 4, 6)),
+            _week("wk_03STATS1234567890ABCDEF", test_user.id, date(2026, 4, 13)),
+            _week("wk_04STATS1234567890ABCDEF", test_user.id, date(2026, 5, 4)),
+            _week("wk_05STATS1234567890ABCDEF", other.id, date(2026, 4, 6)),
+        ]
+    )
+    await db_session.flush()
+    db_session.add_all(
+        [
+            _goal("gol_01STATS", "wk_01STATS1234567890ABCDEF", ENGLISH_ID, DayOfWeek.MONDAY, 2.0),
+            _goal("gol_02STATS", "wk_01STATS1234567890ABCDEF", ENGLISH_ID, DayOfWeek.TUESDAY, 1.0),
+            _goal("gol_03STATS", "wk_02STATS1234567890ABCDEF", ENGLISH_ID, DayOfWeek.MONDAY, 2.0),
+            _goal("gol_04STATS", "wk_02STATS1234567890ABCDEF", DEV_ID, DayOfWeek.MONDAY, 4.0),
+            _record("rec_01STATS", "wk_01STATS1234567890ABCDEF", ENGLISH_ID, DayOfWeek.MONDAY, 1.5),
+            _record(
+                "rec_02STATS", "wk_02STATS1234567890ABCDEF", ENGLISH_ID, DayOfWeek.TUESDAY, 3.0
+            ),
+            _record("rec_03STATS", "wk_02STATS1234567890ABCDEF", DEV_ID, DayOfWeek.MONDAY, 1.0),
+            _record("rec_04STATS", "wk_04STATS1234567890ABCDEF", ENGLISH_ID, DayOfWeek.MONDAY, 5.0),
+            _record(
+                "rec_05STATS",
+                "wk_05STATS1234567890ABCDEF",
+                "tsk_03STATS1234567890ABCDE",
+                DayOfWeek.MONDAY,
+                9.0,
+            ),
+        ]
+    )
+    await db_session.flush()
+    await rebuild_rollups(db_session)
+    await db_session.commit()
+
+
+def _points(series: list[dict]) -> list[tuple[str, float, float, float | None]]:
+    return [
+        (
+            point["period_start"],
+            point["target_units"],
+            point["actual_units"],
+            None if point["completion_rate"] is None else round(point["completion_rate"], 1),
+        )
+        for point in series
+    ]
+
+
+class TestGetStats:
+    """GET /api/stats のテスト."""
+
+    async def test_returns_weekly_series(self, authenticated_client: AsyncClient, stats_data: None):
+        """範囲内の週ごとに全体・タスク別の系列を返し、値の無い期間は 0 で埋める."""
+        response = await authenticated_client.get(
+            "/api/stats", params={"from": "2026-03-30", "to": "2026-04-30"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["granularity"] == "week"
+        assert (data["start_date"], data["end_date"]) == ("2026-03-30", "2026-04-30")
+        assert _points(data["periods"]) == [
+            ("2026-03-30", 3.0, 1.5, 50.0),
+            ("2026-04-06", 6.0, 4.0, 66.7),
+            ("2026-04-13", 0.0, 0.0, None),
+        ]
+        assert [period["week_count"] for period in data["periods"]] == [1, 1, 1]
+        assert data["summary"]["target_units"] == 9.0
+        assert data["summary"]["actual_units"] == 5.5
+
+        english, dev = data["tasks"]
+        assert (english["task_id"], english["is_archived"]) == (ENGLISH_ID, False)
+        assert _points(english["series"]) == [
+            ("2026-03-30", 3.0, 1.5, 50.0),
+            ("2026-04-06", 2.0, 3.0, 150.0),
+            ("2026-04-13", 0.0, 0.0, None),
+        ]
+        assert english["summary"] == {
+            "target_units": 5.0,
+            "actual_units": 4.5,
+            "completion_rate": 90.0,
+        }
+        assert (dev["task_id"], dev["task_name"], dev["is_archived"]) == (DEV_ID, "個人開発", True)
+        assert _points(dev["series"]) == [
+            ("2026-03-30", 0.0, 0.0, None),
+            ("2026-04-06", 4.0, 1.0, 25.0),
+            ("2026-04-13", 0.0, 0.0, None),
+        ]
+
+    async def test_groups_weeks_by_month(self, authenticated_client: AsyncClient, stats_data: None):
+        """granularity=month では週開始日の月ごとにまとめる."""
+        response = await authenticated_client.get(
+            "/api/stats",
+            params={"from": "2026-03-01", "to": "2026-05-31", "granularity": "month"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert _points(data["periods"]) == [
+            ("2026-03-01", 3.0, 1.5, 50.0),
+            ("2026-04-01", 6.0, 4.0, 66.7),
+            ("2026-05-01", 0.0, 5.0, None),
+        ]
+        assert [period["week_count"] for period in data["periods"]] == [1, 2, 1]
+        english, _ = data["tasks"]
+        assert _points(english["series"]) == [
+            ("2026-03-01", 3.0, 1.5, 50.0),
+            ("2026-04-01", 2.0, 3.0, 150.0),
+            ("2026-05-01", 0.0, 5.0, None),
+        ]
+
+    async def test_answers_with_single_statement(
+        self, authenticated_client: AsyncClient, stats_data: None
+    ):
+        """範囲の広さによらず、集計は 1 ステートメントで行う."""
+        response = await authenticated_client.get(
+            "/api/stats", params={"from": "2025-05-04", "to": "2026-05-04"}
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["data"]["periods"]) == 4
+        # セッション照合 + 統計（ETag の版は認証で読んだ users の行から取る）
+        assert 'desc="2 statements"' in response.headers["server-timing"]
+
+    async def test_returns_empty_series_without_weeks(
+        self, authenticated_client: AsyncClient, test_user: User
+    ):
+        """範囲内に週が無ければ空の系列を返す."""
+        response = await authenticated_client.get(
+            "/api/stats", params={"from": "2026-01-01", "to": "2026-01-31"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["periods"] == []
+        assert data["tasks"] == []
+        assert data["summary"] == {
+            "target_units": 0.0,
+            "actual_units": 0.0,
+            "completion_rate": None,
+        }
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"from": "2026-04-30", "to": "2026-03-30"},
+            {"from": "2025-01-01", "to": "2026-01-31"},
+        ],
+    )
+    async def test_rejects_invalid_range(
+        self, authenticated_client: AsyncClient, test_user: User, params: dict[str, str]
+    ):
+        """終了日が開始日より前、または 1 年（53 週）を超える範囲は 400."""
+        response = await authenticated_client.get("/api/stats", params=params)
+
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    async def test_requires_authentication(self, client: AsyncClient):
+        """未認証は 401."""
+        response = await client.get("/api/stats", params={"from": "2026-01-01", "to": "2026-01-31"})
+
+        assert response.status_code == 401
@@ -18,11 +18,17 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 import tasche.models  # noqa: F401  モデルをすべてインポートして autogenerate に含める
-from tasche.api.deps import get_db
+from tasche.api.deps import get_db, get_read_db
 from tasche.core.config import settings
+from tasche.core.http import aclose_http_client
+from tasche.core.oauth import clear_google_jwks_cache
+from tasche.core.secret_resolver import clear_secret_resolver_state
 from tasche.core.test_auth import create_test_session
+from tasche.db.query_stats import install_query_stats
 from tasche.main import app
 from tasche.models.user import User
+from tasche.services.dashboard_cache import clear_dashboard_cache
+from tasche.services.session import clear_session_cache
 
 # ============================================================
 # TEST_DATABASE_URL の取得と DB 名ガード
@@ -72,6 +78,7 @@ def _apply_migrations():
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """テスト用 DB セッション（各テスト前に全テーブルを TRUNCATE）."""
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    install_query_stats(engine)
     async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
     async with async_session() as session:
@@ -99,6 +106,32 @@ async def _truncate_all_tables(session: AsyncSession) -> None:
     await session.commit()
 
 
+# ============================================================
+# プロセス内キャッシュ（テスト間で持ち越さない）
+# ============================================================
+
+
+@pytest.fixture(autouse=True)
+def _reset_in_process_caches():
+    """テストごとにプロセス内キャッシュを空にする."""
+    clear_session_cache()
+    clear_google_jwks_cache()
+    clear_secret_resolver_state()
+    clear_dashboard_cache()
+    yield
+    clear_session_cache()
+    clear_google_jwks_cache()
+    clear_secret_resolver_state()
+    clear_dashboard_cache()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _close_shared_http_client():
+    """共有 HTTP クライアントはテストごとのイベントループで作り直す."""
+    yield
+    await aclose_http_client()
+
+
 # ============================================================
 # HTTP クライアント
 # ============================================================
@@ -112,6 +145,7 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
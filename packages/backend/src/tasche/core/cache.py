@@ -0,0 +1,103 @@
+"""プロセス内 TTL 付き LRU キャッシュ.
+
+Lambda コンテナ / uvicorn ワーカー単位のインメモリキャッシュ。asyncio の単一スレッド上で
+同期的に操作する前提のためロックは持たない。複数コンテナ間では共有されないので、
+値の鮮度は TTL（許容する staleness の上限）で担保する。
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """キャッシュのヒット/ミス統計."""
+
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        if total == 0:
+            return None
+        return self.hits / total
+
+
+class TTLCache(Generic[K, V]):
+    """最大件数と TTL で上限を持つ LRU キャッシュ.
+
+    max_entries / ttl_seconds は呼び出しごとに評価する callable で受け取り、
+    settings の値を実行時に差し替え（テストの patch.object 等）できるようにする。
+    ttl_seconds が 0 以下の場合はキャッシュを無効として扱う。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: Callable[[], int],
+        ttl_seconds: Callable[[], float],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds() > 0 and self._max_entries() > 0
+
+    def get(self, key: K) -> V | None:
+        """値を返す。未登録・期限切れの場合は None（ミスとして計上）."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        deadline, value = entry
+        if deadline <= self._clock():
+            del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """値を登録する。上限超過時は最も古く参照されたエントリから追い出す."""
+        if not self.enabled:
+            return
+
+        self._entries[key] = (self._clock() + self._ttl_seconds(), value)
+        self._entries.move_to_end(key)
+
+        max_entries = self._max_entries()
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_many(self, keys: Iterable[K]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """全エントリと統計をリセットする."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self._hits, misses=self._misses, size=len(self._entries))
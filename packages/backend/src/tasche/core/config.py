@@ -9,31 +9,39 @@ Lambda 上では AWS Parameters and Secrets Lambda Extension 経由で SecretsMa
 
     {
       "db_url": "postgresql+asyncpg://...",
+      "db_read_url": "postgresql+asyncpg://...",
       "google_oauth_client_id": "...",
-      "google_oauth_client_secret": "..."
+      "google_oauth_client_secret": "...",
+      "session_token_secret": "...",
+      "session_token_previous_secrets": ["..."]
     }
 
+`db_read_url`（リードレプリカ）は任意。無ければ読み取りもプライマリで行う。
+`session_token_secret` は local / テスト以外の APP_ENV では必須（無ければ起動・Secret 解決で
+失敗する）。`session_token_previous_secrets` は鍵ローテーション中の旧鍵で、検証にのみ使う。
+
 Extension は Lambda コンテナイメージにビルド時に焼き込む (`packages/backend/Dockerfile`
 参照). アプリケーションは `http://localhost:2773/secretsmanager/get?secretId=<ARN>` を
 叩くだけで、Extension 内部のキャッシュ (既定 5 分 TTL) によりウォーム呼び出し時の
-API コールは抑制される。
+API コールは抑制される。取得と上書きは `core.secret_resolver` が非同期に行う。
 """
 
 from __future__ import annotations
 
-import json
 import logging
-import os
-import time
-import urllib.request
 
-from pydantic import PrivateAttr, field_validator, model_validator
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from tasche.core.env import is_local
+
 logger = logging.getLogger(__name__)
 
 
-SECRETS_EXTENSION_ENDPOINT = "http://localhost:2773/secretsmanager/get"
+DB_POOL_MODES = ("queue", "single", "null")
+DASHBOARD_CACHE_BACKENDS = ("memory", "redis")
+# 開発用のセッション署名鍵。local / テスト以外の APP_ENV では使用を拒否する
+DEFAULT_SESSION_TOKEN_SECRET = "local-session-token-secret"
 
 
 def _normalize_database_url(v: str) -> str:
@@ -68,13 +76,38 @@ class Settings(BaseSettings):
 
     # Database
     # SECRETS_BACKEND=extension の場合は SecretsManager 経由で後から注入されるため
-    # 空のデフォルトを許容し、resolve_secrets_from_extension 後に必須チェックする
+    # 空のデフォルトを許容し、core.secret_resolver での解決後に必須チェックする
     database_url: str = ""
+    # 読み取り専用エンドポイント（ReadDbSession）用のリードレプリカ。空ならプライマリを使う
+    database_read_url: str = ""
+    # 書き込み後にレプリカ遅延で自分の変更が見えなくなるのを防ぐため、
+    # 更新系リクエストの後この秒数は読み取りもプライマリへ固定する（0 で無効）
+    db_primary_pin_seconds: int = 5
+
+    # DB コネクションプール（db.session.build_engine_options 参照）
+    # queue: 常駐プロセス（uvicorn / コンテナ）向けに接続を保持する
+    # single: 外部プーラなしの Lambda 向けに 1 接続を使い回す（pre_ping 必須）
+    # null: RDS Proxy / pgbouncer 経由の Lambda 向けにプールせず都度接続する
+    db_pool_mode: str = "queue"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800  # -1 で無効
+    db_pool_pre_ping: bool = False  # single モードでは常に有効
+    # asyncpg の prepared statement キャッシュ件数（接続ごと）。0 で無効
+    db_prepared_statement_cache_size: int = 100
 
     # 実行環境
     app_env: str = "local"  # local / development / staging / production
     log_level: str = "info"
     enable_telemetry: bool = False
+    # リクエストごとの DB ステートメント数・所要時間を Server-Timing ヘッダで返す
+    enable_server_timing: bool = True
+    # response_model による戻り値の再検証。false にすると response_class=ModelJSONResponse の
+    # ルートは検証を省いて 1 回で JSON 化する（api.responses 参照。現状は適用ルートが無い）
+    validate_response_models: bool = True
+    # 起動直後に Secret 解決・DB 接続・主要クエリ・JWKS 取得をバックグラウンドで済ませる
+    enable_warmup: bool = False
 
     # Secrets バックエンド
     # env: 環境変数から直接読み込む (ローカル/CI)
@@ -83,14 +116,49 @@ class Settings(BaseSettings):
 
     # 単一の Secret に複数キーをまとめる (費用削減)
     app_secret_arn: str = ""
+    # 解決後この秒数が経過したら、応答は止めずにバックグラウンドで Secret を再取得する
+    # （ローテーションをコールドスタートなしで反映する）。0 で再取得しない
+    secrets_refresh_seconds: int = 300
+    # Extension の準備完了（Runtime API 登録）を待つ最大秒数
+    secrets_extension_ready_timeout_seconds: float = 30.0
 
     # Google OAuth 2.0
     google_oauth_client_id: str = "dummy_client_id"
     google_oauth_client_secret: str = "dummy_client_secret"
     google_oauth_redirect_uris: str = "http://localhost:5173/auth/callback"
 
+    # 外部 HTTP 呼び出し（Google OAuth）の共有クライアント
+    http_client_timeout_seconds: float = 10.0
+    http_client_connect_timeout_seconds: float = 5.0
+    http_client_max_connections: int = 10
+    http_client_max_keepalive_connections: int = 5
+    http_client_keepalive_expiry_seconds: float = 60.0
+
     # セッション設定
     session_expires_seconds: int = 604800  # 7日
+    # セッショントークン署名用の HMAC 鍵。DB 照合前の事前検証にのみ使うため、
+    # 漏洩しても token_hash に一致する secret が無ければ認証は通らない
+    session_token_secret: str = DEFAULT_SESSION_TOKEN_SECRET
+    # 鍵ローテーション中の旧鍵（カンマ区切り）。検証にのみ使い、署名は常に
+    # session_token_secret で行う（スライディング延長の再署名で新しい鍵へ移行する）
+    session_token_previous_secrets: str = ""
+    # セッション検証キャッシュ（プロセス内）。TTL は revoke の反映が他コンテナで
+    # 遅れうる最大秒数（staleness の上限）を兼ねる。0 でキャッシュ無効
+    session_cache_ttl_seconds: int = 30
+    session_cache_max_entries: int = 1024
+    # ダッシュボード集計結果のキャッシュ（services.dashboard_cache 参照）。0 でキャッシュ無効
+    # memory: プロセス内 LRU。TTL は他コンテナで更新が反映されるまでの最大秒数を兼ねる
+    # redis: 複数コンテナで共有する（redis パッケージと DASHBOARD_CACHE_REDIS_URL が必要）
+    dashboard_cache_backend: str = "memory"
+    dashboard_cache_ttl_seconds: int = 30
+    dashboard_cache_max_entries: int = 1024
+    dashboard_cache_redis_url: str = ""
+    # 期限切れ・revoke 済みセッション purge の 1 バッチあたり削除件数
+    session_purge_batch_size: int = 1000
+
+    # メンテナンス用イベント受信（LWA pass-through の POST /events）。
+    # Function URL を持たないメンテナンス用 Lambda でのみ有効にする
+    enable_maintenance_events: bool = False
 
     # Cookie設定
     cookie_secure: bool = False
@@ -112,13 +180,34 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
-    @field_validator("database_url", mode="before")
+    @field_validator("database_url", "database_read_url", mode="before")
     @classmethod
     def ensure_asyncpg_scheme(cls, v: str) -> str:
         return _normalize_database_url(v)
 
-    # Secret 解決済みフラグ (idempotent な ensure_secrets_resolved のため)
-    _secrets_resolved: bool = PrivateAttr(default=False)
+    @field_validator("db_pool_mode")
+    @classmethod
+    def validate_db_pool_mode(cls, v: str) -> str:
+        if v not in DB_POOL_MODES:
+            raise ValueError(f"db_pool_mode must be one of {', '.join(DB_POOL_MODES)}")
+        return v
+
+    @field_validator("dashboard_cache_backend")
+    @classmethod
+    def validate_dashboard_cache_backend(cls, v: str) -> str:
+        if v not in DASHBOARD_CACHE_BACKENDS:
+            raise ValueError(
+                f"dashboard_cache_backend must be one of {', '.join(DASHBOARD_CACHE_BACKENDS)}"
+            )
+        return v
+
+    @model_validator(mode="after")
+    def validate_dashboard_cache_redis_url(self) -> Settings:
+        if self.dashboard_cache_backend == "redis" and not self.dashboard_cache_redis_url:
+            raise ValueError(
+                "DASHBOARD_CACHE_REDIS_URL must be set when DASHBOARD_CACHE_BACKEND=redis"
+            )
+        return self
 
     @model_validator(mode="after")
     def validate_secrets_backend(self) -> Settings:
@@ -126,7 +215,7 @@ class Settings(BaseSettings):
         if self.secrets_backend == "extension":
             if not self.app_secret_arn:
                 raise ValueError("APP_SECRET_ARN must be set when SECRETS_BACKEND=extension")
-            # extension モードでは database_url は ensure_secrets_resolved() で注入されるため
+            # extension モードでは database_url は core.secret_resolver で注入されるため
             # ここでは必須チェックを行わない
             return self
 
@@ -138,131 +227,75 @@ class Settings(BaseSettings):
             )
         return self
 
-    def ensure_secrets_resolved(self) -> None:
-        """secrets_backend=extension の場合に Secret を取得して値を上書きする.
+    @model_validator(mode="after")
+    def validate_session_token_secret(self) -> Settings:
+        """local / テスト以外では開発用のセッション署名鍵での起動を拒否する.
 
-        idempotent。FastAPI lifespan から起動時に呼び出すことで、
-        Lambda + Parameters and Secrets Lambda Extension 構成における
-        Extension 登録完了待ちのタイミング競合を回避する。
+        extension モードでは鍵は Secret から注入されるため apply_secret_payload で検証する。
         """
-        if self._secrets_resolved:
-            return
+        if self.secrets_backend == "extension" or is_local(self.app_env):
+            return self
+        if self.session_token_secret in ("", DEFAULT_SESSION_TOKEN_SECRET):
+            raise ValueError(f"SESSION_TOKEN_SECRET must be set when APP_ENV={self.app_env}")
+        return self
 
-        if self.secrets_backend == "extension":
-            payload = _fetch_secret_json(self.app_secret_arn)
-            # Secret に値がある項目のみ上書き (環境変数で渡されたデフォルトより優先)
-            if "db_url" in payload:
-                # field_validator は env からの初期化時しか走らないので、ここで再正規化
-                self.database_url = _normalize_database_url(payload["db_url"])
-            if "google_oauth_client_id" in payload:
-                self.google_oauth_client_id = payload["google_oauth_client_id"]
-            if "google_oauth_client_secret" in payload:
-                self.google_oauth_client_secret = payload["google_oauth_client_secret"]
-
-            if not self.database_url:
+    def apply_secret_payload(self, payload: dict) -> None:
+        """Extension から取得した Secret の値で設定を上書きする（core.secret_resolver から呼ぶ）.
+
+        Secret に値がある項目のみ上書きする (環境変数で渡されたデフォルトより優先)。
+
+        Raises:
+            RuntimeError: local / テスト以外で session_token_secret が無い、または db_url が空
+        """
+        if not payload.get("session_token_secret"):
+            if not is_local(self.app_env):
+                # 値を書き換える前に失敗させ、再取得時も現在の設定のまま応答を続ける
                 raise RuntimeError(
-                    "database_url is empty after resolving secrets from Extension. "
-                    "Verify the app secret JSON contains a 'db_url' key."
+                    "session_token_secret is not set in the app secret. "
+                    f"It is required when APP_ENV={self.app_env}."
                 )
+            logger.warning(
+                "session_token_secret is not set in the app secret; "
+                "falling back to the default signing key"
+            )
+        if "db_url" in payload:
+            # field_validator は env からの初期化時しか走らないので、ここで再正規化
+            self.database_url = _normalize_database_url(payload["db_url"])
+        if "db_read_url" in payload:
+            self.database_read_url = _normalize_database_url(payload["db_read_url"])
+        if "google_oauth_client_id" in payload:
+            self.google_oauth_client_id = payload["google_oauth_client_id"]
+        if "google_oauth_client_secret" in payload:
+            self.google_oauth_client_secret = payload["google_oauth_client_secret"]
+        if payload.get("session_token_secret"):
+            self.session_token_secret = payload["session_token_secret"]
+        if "session_token_previous_secrets" in payload:
+            previous = payload["session_token_previous_secrets"]
+            if isinstance(previous, list):
+                previous = ",".join(previous)
+            self.session_token_previous_secrets = previous
 
-        self._secrets_resolved = True
+        if not self.database_url:
+            raise RuntimeError(
+                "database_url is empty after resolving secrets from Extension. "
+                "Verify the app secret JSON contains a 'db_url' key."
+            )
 
     @property
     def google_oauth_redirect_uri_list(self) -> list[str]:
         """許可されたリダイレクトURIのリストを返す."""
         return [u.strip() for u in self.google_oauth_redirect_uris.split(",") if u.strip()]
 
+    @property
+    def session_token_verification_secrets(self) -> list[str]:
+        """セッショントークンの検証に使う鍵（現在の鍵、旧鍵の順）を返す."""
+        previous = [s.strip() for s in self.session_token_previous_secrets.split(",") if s.strip()]
+        return [self.session_token_secret, *previous]
+
     @property
     def cors_allow_origin_list(self) -> list[str]:
         """CORS 許可オリジンのリストを返す."""
         return [o.strip() for o in self.cors_allow_origins.split(",") if o.strip()]
 
 
-def _fetch_secret_json(secret_arn: str) -> dict:
-    """Lambda Extension 経由で JSON Secret を取得し dict として返す."""
-    response = _call_extension(secret_arn)
-    return json.loads(response["SecretString"])
-
-
-def _call_extension(secret_arn: str) -> dict:
-    """Parameters and Secrets Lambda Extension に HTTP リクエストする.
-
-    Extension は AWS_SESSION_TOKEN を `X-Aws-Parameters-Secrets-Token` ヘッダで
-    受け取って認証する仕組みになっている (Lambda 実行時に自動設定される).
-    """
-    from urllib.parse import quote
-
-    session_token = os.environ.get("AWS_SESSION_TOKEN")
-    if not session_token:
-        raise RuntimeError(
-            "AWS_SESSION_TOKEN is not set. Cannot call Parameters and Secrets Lambda Extension. "
-            "Confirm the extension is baked into the container image."
-        )
-
-    # ARN に含まれる "/" を "%2F" にエンコードする。":" はエンコードしない。
-    # Extension の HTTP パーサーが "/" をパス区切りと誤解釈して 400 を返すケースへの対処。
-    # (httpx の params= で全文字エンコードしても、f-string で無変換でも 400 になったため)
-    encoded_arn = quote(secret_arn, safe=":")
-    url = f"{SECRETS_EXTENSION_ENDPOINT}?secretId={encoded_arn}"
-    req = urllib.request.Request(
-        url,
-        headers={"X-Aws-Parameters-Secrets-Token": session_token},
-    )
-    # Extension が Lambda Runtime API への登録を完了するまで HTTP 400
-    # "not ready to serve traffic" を返し続けるため、その間はリトライする。
-    # 1 回あたりのコストを下げるため urlopen の timeout は短めにし、
-    # 試行回数ベースで最大待機時間を制御する。
-    _EXTENSION_MAX_ATTEMPTS = 60
-    _EXTENSION_RETRY_INTERVAL_SECONDS = 0.5
-    _EXTENSION_REQUEST_TIMEOUT_SECONDS = 2
-
-    last_error_body = ""
-    last_exception: Exception | None = None
-    for attempt in range(_EXTENSION_MAX_ATTEMPTS):
-        try:
-            with urllib.request.urlopen(req, timeout=_EXTENSION_REQUEST_TIMEOUT_SECONDS) as resp:  # noqa: S310
-                body = resp.read().decode()
-            if attempt > 0:
-                print(f"[config] Extension ready after {attempt + 1} attempts", flush=True)  # noqa: T201
-            return json.loads(body)
-        except urllib.error.HTTPError as exc:
-            error_body = exc.read().decode() if exc.fp else ""
-            last_error_body = error_body
-            last_exception = exc
-            # Extension 初期化中の一時的な 400 はリトライする
-            if exc.code == 400 and "not ready" in error_body:
-                if attempt < _EXTENSION_MAX_ATTEMPTS - 1:
-                    time.sleep(_EXTENSION_RETRY_INTERVAL_SECONDS)
-                    continue
-            # ロギング未設定時も CloudWatch に出るよう print を併用する
-            print(  # noqa: T201
-                f"[config] Extension HTTP {exc.code} for {secret_arn!r}: {error_body!r}",
-                flush=True,
-            )
-            raise RuntimeError(
-                f"Failed to fetch secret from Extension: HTTP {exc.code} - {error_body}"
-            ) from exc
-        except urllib.error.URLError as exc:
-            # Extension がまだ port 2773 で LISTEN を開始していない場合の
-            # Connection refused / timeout もリトライ対象とする
-            last_exception = exc
-            if attempt < _EXTENSION_MAX_ATTEMPTS - 1:
-                if attempt == 0 or attempt % 10 == 0:
-                    print(  # noqa: T201
-                        f"[config] Extension URL error (attempt {attempt + 1}): {exc.reason}",
-                        flush=True,
-                    )
-                time.sleep(_EXTENSION_RETRY_INTERVAL_SECONDS)
-                continue
-            print(f"[config] Extension URL error (final): {exc.reason}", flush=True)  # noqa: T201
-            raise RuntimeError(f"Failed to fetch secret from Extension: {exc.reason}") from exc
-
-    # ループを抜けた = リトライ上限到達
-    raise RuntimeError(
-        f"Extension did not become ready within "
-        f"{_EXTENSION_MAX_ATTEMPTS * _EXTENSION_RETRY_INTERVAL_SECONDS:.0f}s. "
-        f"Last error: {last_error_body or last_exception}"
-    )
-
-
 settings = Settings()
@@ -6,6 +6,7 @@ from tasche.core.config import settings
 
 SESSION_COOKIE = "session"
 SESSION_COOKIE_PATH = "/api"
+PRIMARY_PIN_COOKIE = "db_primary"
 
 
 def set_session_cookie(response: Response, raw_token: str) -> None:
@@ -35,3 +36,20 @@ def clear_session_cookie(response: Response) -> None:
         path=SESSION_COOKIE_PATH,
         domain=settings.cookie_domain or None,
     )
+
+
+def set_primary_pin_cookie(response: Response) -> None:
+    """書き込み後の読み取りをプライマリへ固定する短命 Cookie を設定する.
+
+    値に意味はなく、存在する間（DB_PRIMARY_PIN_SECONDS）だけ ReadDbSession がプライマリを使う。
+    """
+    response.set_cookie(
+        key=PRIMARY_PIN_COOKIE,
+        value="1",
+        max_age=settings.db_primary_pin_seconds,
+        httponly=True,
+        secure=settings.cookie_secure,
+        samesite=settings.cookie_samesite,
+        path=SESSION_COOKIE_PATH,
+        domain=settings.cookie_domain or None,
+    )
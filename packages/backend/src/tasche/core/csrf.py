@@ -1,44 +1,58 @@
 """CSRF 対策ミドルウェア（Origin/Referer 検証）."""
 
 import logging
+from collections.abc import Iterable
 from urllib.parse import urlparse
 
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from tasche.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 # 状態変更系メソッドのみ対象（GET/HEAD/OPTIONS は除外）
-_CSRF_CHECK_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+_CSRF_CHECK_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
-    """Origin/Referer を検証する CSRF 対策ミドルウェア.
+class CSRFMiddleware:
+    """Origin/Referer を検証する CSRF 対策ミドルウェア（pure ASGI）.
 
     - 対象メソッド: POST / PUT / PATCH / DELETE
     - `/api/*` パスのみ対象（/health, / は除外）
     - Origin ヘッダ（無ければ Referer のオリジン部）を CORS_ALLOW_ORIGINS と照合
     - どちらも無い場合は許可（pass-through）
     - 不一致は 403 + {"error": {"code": "CSRF_VALIDATION_FAILED"}}
+
+    許可オリジンはミドルウェア生成時（アプリの初回リクエスト時）に frozenset にしておく。
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        if request.method in _CSRF_CHECK_METHODS and request.url.path.startswith("/api/"):
-            result = _check_csrf(request)
+    def __init__(self, app: ASGIApp, allowed_origins: Iterable[str] | None = None) -> None:
+        self.app = app
+        if allowed_origins is None:
+            allowed_origins = settings.cors_allow_origin_list
+        self.allowed_origins = frozenset(allowed_origins)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] in _CSRF_CHECK_METHODS
+            and scope["path"].startswith("/api/")
+        ):
+            result = _check_csrf(scope, self.allowed_origins)
             if result is not None:
-                return result
+                await result(scope, receive, send)
+                return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
-def _check_csrf(request: Request) -> JSONResponse | None:
+def _check_csrf(scope: Scope, allowed_origins: frozenset[str]) -> JSONResponse | None:
     """CSRF 検証を行い、拒否する場合は JSONResponse を返す。通過する場合は None を返す."""
-    origin = request.headers.get("origin")
-    referer = request.headers.get("referer")
+    headers = Headers(scope=scope)
+    origin = headers.get("origin")
+    referer = headers.get("referer")
 
     # Origin/Referer がどちらも無い場合は許可（pass-through）
     # （SameSite=Lax が一次防御。非ブラウザの内部呼び出し・テストクライアントを誤って 403 にしない）
@@ -56,12 +70,11 @@ def _check_csrf(request: Request) -> JSONResponse | None:
         # Referer があるが origin 部が解析できなかった場合は許可
         return None
 
-    allowed_origins = settings.cors_allow_origin_list
     if check_origin not in allowed_origins:
         logger.warning(
             "CSRF validation failed: method=%s path=%s origin=%r",
-            request.method,
-            request.url.path,
+            scope["method"],
+            scope["path"],
             check_origin,
         )
         return JSONResponse(
@@ -1,6 +1,8 @@
 """APP_ENV 判定と機能フラグヘルパ."""
 
 PRODUCTION = "production"
+# 開発用の既定値（セッション署名鍵など）での起動を許可する環境
+LOCAL_ENVS = ("local", "test", "testing")
 
 
 def is_production(app_env: str) -> bool:
@@ -8,6 +10,11 @@ def is_production(app_env: str) -> bool:
     return app_env == PRODUCTION
 
 
+def is_local(app_env: str) -> bool:
+    """ローカル開発・テスト環境かどうかを判定する."""
+    return app_env in LOCAL_ENVS
+
+
 def is_auth_stub_enabled(app_env: str, auth_stub_enabled: bool) -> bool:
     """スタブ認証の実効可否を判定する.
 
@@ -0,0 +1,39 @@
+"""外部 HTTP 呼び出し用の共有クライアント.
+
+Google OAuth（/token, JWKS）への呼び出しで毎回 DNS / TCP / TLS を確立しないよう、
+プロセス（Lambda コンテナ / uvicorn ワーカー）単位で 1 つの httpx.AsyncClient を
+lazy 生成して使い回す。コネクションプールと keep-alive の上限・タイムアウトは
+settings で調整する。アプリ終了時（lifespan の shutdown）に aclose_http_client で閉じる。
+"""
+
+import httpx
+
+from tasche.core.config import settings
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """共有の httpx.AsyncClient を lazy 生成して返す."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.http_client_timeout_seconds,
+                connect=settings.http_client_connect_timeout_seconds,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive_connections,
+                keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+            ),
+        )
+    return _http_client
+
+
+async def aclose_http_client() -> None:
+    """共有クライアントを閉じる（次回の get_http_client で作り直される）."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
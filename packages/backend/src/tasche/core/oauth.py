@@ -1,4 +1,7 @@
-"""Google OAuth 2.0 クライアント（Authlib + httpx）."""
+"""Google OAuth 2.0 クライアント（httpx + joserfc）.
+
+Google への呼び出しはすべて core.http の共有クライアントを使い、接続を使い回す。
+"""
 
 import asyncio
 import logging
@@ -7,15 +10,15 @@ import time
 from typing import Any
 from urllib.parse import urlencode
 
-import httpx
-from authlib.integrations.httpx_client import AsyncOAuth2Client
 from joserfc import jwt
 from joserfc.errors import JoseError
-from joserfc.jwk import KeySet
+from joserfc.jwk import KeySet, RSAKey
+from joserfc.jws import extract_compact
 from joserfc.jwt import JWTClaimsRegistry
 
 from tasche.core.config import settings
 from tasche.core.exceptions import InvalidAuthorizationCodeError
+from tasche.core.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -23,29 +26,108 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
 GOOGLE_ISSUERS = {"https://accounts.google.com", "accounts.google.com"}
-JWKS_CACHE_TTL = 3600  # 1時間
-
-_jwks_cache: dict[str, Any] | None = None
-_jwks_cache_at: float | None = None
+JWKS_CACHE_TTL = 3600  # 1時間（経過後は古い鍵で応答しつつバックグラウンドで再取得）
+JWKS_FORCED_REFRESH_INTERVAL = 60  # 未知の kid による強制再取得の最小間隔（秒）
+
+# kid → インポート済みの公開鍵。ログインのたびに JWKS 全体を再パースしないよう保持する
+_jwks_keys: dict[str, RSAKey] = {}
+_jwks_fetched_at: float | None = None
+_jwks_forced_refresh_at: float | None = None
+_jwks_refresh_task: asyncio.Task | None = None
 _jwks_lock = asyncio.Lock()
 
 
 async def get_google_jwks() -> dict[str, Any]:
-    """TTL キャッシュ付きで Google の JWKS を取得（asyncio.Lock で競合防止）."""
-    global _jwks_cache, _jwks_cache_at
-    now = time.time()
-    if _jwks_cache and _jwks_cache_at and now - _jwks_cache_at < JWKS_CACHE_TTL:
-        return _jwks_cache
+    """Google の JWKS（JSON）を取得する."""
+    r = await get_http_client().get(GOOGLE_JWKS_URL)
+    r.raise_for_status()
+    return r.json()
+
+
+async def _refresh_google_keys() -> None:
+    """JWKS を取得して kid ごとの公開鍵キャッシュを差し替える（asyncio.Lock で多重取得を防止）."""
+    global _jwks_keys, _jwks_fetched_at
+    started = time.monotonic()
     async with _jwks_lock:
-        # ロック取得後に再チェック（double-checked locking）
-        if _jwks_cache and _jwks_cache_at and now - _jwks_cache_at < JWKS_CACHE_TTL:
-            return _jwks_cache
-        async with httpx.AsyncClient() as client:
-            r = await client.get(GOOGLE_JWKS_URL)
-            r.raise_for_status()
-            _jwks_cache = r.json()
-            _jwks_cache_at = time.time()
-        return _jwks_cache
+        # 待機中に他のコルーチンが取得を終えていれば再取得しない
+        if _jwks_fetched_at is not None and _jwks_fetched_at >= started:
+            return
+        key_set = KeySet.import_key_set(await get_google_jwks())
+        _jwks_keys = {key.kid: key for key in key_set.keys if key.kid}
+        _jwks_fetched_at = time.monotonic()
+
+
+async def _refresh_google_keys_in_background() -> None:
+    try:
+        await _refresh_google_keys()
+    except Exception:
+        # 古い鍵での応答を継続し、次回の期限切れ判定で再試行する
+        logger.warning("Background JWKS refresh failed", exc_info=True)
+
+
+def _schedule_google_keys_refresh() -> None:
+    """stale-while-revalidate: 実行中でなければバックグラウンド再取得を開始する."""
+    global _jwks_refresh_task
+    if _jwks_refresh_task is None or _jwks_refresh_task.done():
+        _jwks_refresh_task = asyncio.create_task(_refresh_google_keys_in_background())
+
+
+async def get_google_signing_key(kid: str) -> RSAKey | None:
+    """kid に対応する Google の署名検証鍵を返す.
+
+    - 初回（キャッシュなし）のみ JWKS 取得を待つ
+    - TTL 経過後は古い鍵をそのまま返し、再取得はバックグラウンドで行う
+    - 未知の kid（鍵ローテーション直後）のみ同期的に強制再取得する
+      （不正な kid による連打で Google へのリクエストが増えないよう最小間隔を設ける）
+
+    Returns:
+        公開鍵。強制再取得後も見つからない場合は None
+    """
+    global _jwks_forced_refresh_at
+    if _jwks_fetched_at is None:
+        await _refresh_google_keys()
+    elif time.monotonic() - _jwks_fetched_at >= JWKS_CACHE_TTL:
+        _schedule_google_keys_refresh()
+
+    key = _jwks_keys.get(kid)
+    if key is not None:
+        return key
+
+    now = time.monotonic()
+    if _jwks_forced_refresh_at is None or now - _jwks_forced_refresh_at >= (
+        JWKS_FORCED_REFRESH_INTERVAL
+    ):
+        _jwks_forced_refresh_at = now
+        logger.info("Unknown JWKS kid %r, refreshing Google keys", kid)
+        await _refresh_google_keys()
+    return _jwks_keys.get(kid)
+
+
+async def prefetch_google_signing_keys() -> None:
+    """公開鍵キャッシュが未取得なら JWKS を取得しておく.
+
+    コールドスタート時にトークン交換と並行して呼び、ID Token 検証時の JWKS 取得待ちを
+    なくすためのもの。失敗しても例外は送出しない（検証時に改めて取得を試みる）。
+    """
+    if _jwks_fetched_at is not None:
+        return
+    try:
+        await _refresh_google_keys()
+    except Exception:
+        logger.warning("JWKS prefetch failed", exc_info=True)
+
+
+def clear_google_jwks_cache() -> None:
+    """公開鍵キャッシュを空にする（テスト用）."""
+    global _jwks_keys, _jwks_fetched_at, _jwks_forced_refresh_at, _jwks_refresh_task, _jwks_lock
+    if _jwks_refresh_task is not None and not _jwks_refresh_task.done():
+        _jwks_refresh_task.cancel()
+    _jwks_keys = {}
+    _jwks_fetched_at = None
+    _jwks_forced_refresh_at = None
+    _jwks_refresh_task = None
+    # テストごとにイベントループが変わるため Lock も作り直す
+    _jwks_lock = asyncio.Lock()
 
 
 def build_google_authorize_url(*, redirect_uri: str, state: str, code_challenge: str) -> str:
@@ -65,29 +147,41 @@ def build_google_authorize_url(*, redirect_uri: str, state: str, code_challenge:
 
 
 async def exchange_code_for_token(*, code: str, code_verifier: str, redirect_uri: str) -> dict:
-    """Google /token にトークン交換リクエスト。失敗時は httpx/authlib 例外を raise。"""
-    async with AsyncOAuth2Client(
-        client_id=settings.google_oauth_client_id,
-        client_secret=settings.google_oauth_client_secret,
-        code_challenge_method="S256",
-    ) as client:
-        token = await client.fetch_token(
-            url=GOOGLE_TOKEN_URL,
-            code=code,
-            code_verifier=code_verifier,
-            redirect_uri=redirect_uri,
-            grant_type="authorization_code",
-        )
-    return dict(token)
+    """Google /token にトークン交換リクエスト。失敗時は httpx 例外を raise。
+
+    クライアント認証は client_secret_post（Google はボディでの送信に対応）。
+    """
+    r = await get_http_client().post(
+        GOOGLE_TOKEN_URL,
+        data={
+            "grant_type": "authorization_code",
+            "code": code,
+            "code_verifier": code_verifier,
+            "redirect_uri": redirect_uri,
+            "client_id": settings.google_oauth_client_id,
+            "client_secret": settings.google_oauth_client_secret,
+        },
+        headers={"Accept": "application/json"},
+    )
+    r.raise_for_status()
+    return r.json()
 
 
 async def verify_google_id_token(id_token: str) -> dict:
     """Google ID Token を検証し claims を返す."""
-    jwks = await get_google_jwks()
-    key_set = KeySet.import_key_set(jwks)
+    try:
+        kid = extract_compact(id_token.encode()).headers().get("kid")
+    except (JoseError, ValueError) as e:
+        logger.warning("Google ID token is malformed: %s", e)
+        raise InvalidAuthorizationCodeError("Invalid Google ID token") from e
+
+    key = await get_google_signing_key(kid) if isinstance(kid, str) else None
+    if key is None:
+        logger.warning("Google ID token signed with unknown kid: %r", kid)
+        raise InvalidAuthorizationCodeError("Invalid Google ID token")
 
     try:
-        token = jwt.decode(id_token, key_set, algorithms=["RS256"])
+        token = jwt.decode(id_token, key, algorithms=["RS256"])
         claims_registry = JWTClaimsRegistry(
             leeway=120,
             iss={"essential": True, "values": list(GOOGLE_ISSUERS)},
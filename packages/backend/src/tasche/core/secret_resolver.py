@@ -0,0 +1,167 @@
+"""Secret の非同期解決（Parameters and Secrets Lambda Extension）.
+
+SECRETS_BACKEND=extension の場合に、Extension から app secret を取得して settings を
+上書きする。取得は core.http の共有クライアントで行い、イベントループもスレッドプールも
+塞がない。
+
+- 同時に到着した初回リクエストは実行中の 1 つの取得タスクを共有する（多重取得しない）
+- Extension が Runtime API への登録を終えるまでの "not ready" / 接続拒否は
+  指数バックオフでリトライする（上限は SECRETS_EXTENSION_READY_TIMEOUT_SECONDS）
+- 解決から SECRETS_REFRESH_SECONDS が経過した後は、現在の値で応答を続けながら
+  バックグラウンドで再取得する（stale-while-revalidate）。DB の接続先が変わった場合は
+  エンジンを作り直し、ローテーションをコールドスタートなしで反映する
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from urllib.parse import quote
+
+import httpx
+
+from tasche.core.config import settings
+from tasche.core.http import get_http_client
+from tasche.db.session import dispose_engines
+
+logger = logging.getLogger(__name__)
+
+SECRETS_EXTENSION_ENDPOINT = "http://localhost:2773/secretsmanager/get"
+EXTENSION_REQUEST_TIMEOUT_SECONDS = 2.0
+EXTENSION_RETRY_INITIAL_SECONDS = 0.05
+EXTENSION_RETRY_MAX_SECONDS = 1.0
+
+_resolved_at: float | None = None
+_fetch_task: asyncio.Task | None = None
+_refresh_task: asyncio.Task | None = None
+
+
+def _extension_url(secret_arn: str) -> str:
+    # ARN に含まれる "/" を "%2F" にエンコードする。":" はエンコードしない。
+    # Extension の HTTP パーサーが "/" をパス区切りと誤解釈して 400 を返すケースへの対処。
+    # (params= で全文字エンコードしても、無変換でも 400 になったため URL を自前で組み立てる)
+    return f"{SECRETS_EXTENSION_ENDPOINT}?secretId={quote(secret_arn, safe=':')}"
+
+
+async def fetch_secret_payload(secret_arn: str) -> dict:
+    """Extension から JSON Secret を取得し dict として返す.
+
+    Extension は AWS_SESSION_TOKEN を `X-Aws-Parameters-Secrets-Token` ヘッダで
+    受け取って認証する (Lambda 実行時に自動設定される).
+
+    Raises:
+        RuntimeError: 取得に失敗した、または準備完了を待ちきれなかった場合
+    """
+    session_token = os.environ.get("AWS_SESSION_TOKEN")
+    if not session_token:
+        raise RuntimeError(
+            "AWS_SESSION_TOKEN is not set. Cannot call Parameters and Secrets Lambda Extension. "
+            "Confirm the extension is baked into the container image."
+        )
+
+    url = _extension_url(secret_arn)
+    headers = {"X-Aws-Parameters-Secrets-Token": session_token}
+    deadline = time.monotonic() + settings.secrets_extension_ready_timeout_seconds
+    delay = EXTENSION_RETRY_INITIAL_SECONDS
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = await get_http_client().get(
+                url, headers=headers, timeout=EXTENSION_REQUEST_TIMEOUT_SECONDS
+            )
+        except httpx.TransportError as exc:
+            # Extension がまだ port 2773 で LISTEN していない場合の接続拒否・タイムアウト
+            last_error = repr(exc)
+        else:
+            if response.status_code == 200:
+                if attempt > 1:
+                    logger.info("Secrets extension ready after %d attempts", attempt)
+                return json.loads(response.json()["SecretString"])
+            # Extension 初期化中の一時的な 400 のみリトライする
+            if not (response.status_code == 400 and "not ready" in response.text):
+                logger.error(
+                    "Secrets extension HTTP %d for %r: %r",
+                    response.status_code,
+                    secret_arn,
+                    response.text,
+                )
+                raise RuntimeError(
+                    "Failed to fetch secret from Extension: "
+                    f"HTTP {response.status_code} - {response.text}"
+                )
+            last_error = response.text
+
+        if time.monotonic() + delay > deadline:
+            raise RuntimeError(
+                "Extension did not become ready within "
+                f"{settings.secrets_extension_ready_timeout_seconds:.0f}s. "
+                f"Last error: {last_error}"
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, EXTENSION_RETRY_MAX_SECONDS)
+
+
+async def _fetch_and_apply() -> None:
+    global _resolved_at
+    db_urls = (settings.database_url, settings.database_read_url)
+    payload = await fetch_secret_payload(settings.app_secret_arn)
+    settings.apply_secret_payload(payload)
+    first_resolution = _resolved_at is None
+    _resolved_at = time.monotonic()
+    if not first_resolution and (settings.database_url, settings.database_read_url) != db_urls:
+        # 接続先（パスワード）がローテーションされた。次回利用時に新しい URL で作り直す
+        logger.info("Database URL rotated; recreating engines")
+        await dispose_engines()
+
+
+async def _fetch_shared() -> None:
+    """実行中の取得があればそれを待ち、なければ開始する."""
+    global _fetch_task
+    if _fetch_task is None or _fetch_task.done():
+        _fetch_task = asyncio.create_task(_fetch_and_apply())
+    # 待機側のキャンセル（クライアント切断など）で共有タスクを止めない
+    await asyncio.shield(_fetch_task)
+
+
+async def _refresh_in_background() -> None:
+    try:
+        await _fetch_shared()
+    except Exception:
+        # 現在の値での応答を継続し、次回の期限切れ判定で再試行する
+        logger.warning("Background secret refresh failed", exc_info=True)
+
+
+async def resolve_secrets() -> None:
+    """Secret が解決済みであることを保証する（SECRETS_BACKEND=env では何もしない）.
+
+    - 未解決なら取得を待つ（同時呼び出しは 1 つの取得を共有する）
+    - 解決済みで SECRETS_REFRESH_SECONDS を過ぎていれば、待たずに再取得を開始する
+
+    Raises:
+        RuntimeError: 初回の取得に失敗した場合（次回呼び出し時に再試行する）
+    """
+    global _refresh_task
+    if settings.secrets_backend != "extension":
+        return
+    if _resolved_at is None:
+        await _fetch_shared()
+        return
+    if settings.secrets_refresh_seconds <= 0:
+        return
+    if time.monotonic() - _resolved_at >= settings.secrets_refresh_seconds and (
+        _refresh_task is None or _refresh_task.done()
+    ):
+        _refresh_task = asyncio.create_task(_refresh_in_background())
+
+
+def clear_secret_resolver_state() -> None:
+    """解決状態を破棄する（テスト用）."""
+    global _resolved_at, _fetch_task, _refresh_task
+    for task in (_fetch_task, _refresh_task):
+        if task is not None and not task.done():
+            task.cancel()
+    _resolved_at = None
+    _fetch_task = None
+    _refresh_task = None
@@ -1,12 +1,46 @@
 """セッション認証（Cookie session → DB 照合）."""
 
+import logging
+
 from fastapi import Cookie, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tasche.core.cookies import SESSION_COOKIE, set_session_cookie
 from tasche.core.exceptions import InvalidTokenError
 from tasche.db.session import get_db
-from tasche.services.session import validate_session
+from tasche.models.user import User
+from tasche.services.session import (
+    SessionSnapshot,
+    reissue_session_token,
+    validate_session,
+    validate_session_with_user,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _refresh_extended_session(
+    response: Response,
+    db: AsyncSession,
+    session: SessionSnapshot,
+    session_token: str,
+) -> None:
+    """スライディング延長を commit し、延長後の期限で再署名した Cookie を再送する.
+
+    validate_session が発行した延長の UPDATE をここで commit する（ハンドラの前）。
+    レスポンス送信後への先送り（BackgroundTasks）は採らない。Lambda ではレスポンス
+    返却後に実行環境が凍結されうるため、延長が反映されないまま残ることがある。
+    延長は 1 セッションあたり有効期限の半分に 1 回しか発生しない。
+    commit に失敗した場合は Cookie を再送しない。延長後の値はキャッシュに載せていないため、
+    次回リクエストで DB の期限を読み、再度延長する。
+    """
+    try:
+        await db.commit()
+    except Exception:
+        logger.exception("Failed to commit session extension: session_id=%s", session.id)
+        await db.rollback()
+        return
+    set_session_cookie(response, reissue_session_token(session_token, session.expires_at))
 
 
 async def get_current_user_sub(
@@ -28,8 +62,30 @@ async def get_current_user_sub(
         raise InvalidTokenError("Invalid or expired session")
 
     if extended:
-        # スライディング延長発生時は commit してから Max-Age を更新して Cookie を再送
-        await db.commit()
-        set_session_cookie(response, session_token)
+        await _refresh_extended_session(response, db, session, session_token)
 
     return session.user_id
+
+
+async def get_current_session_user(
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    session_token: str | None = Cookie(None, alias=SESSION_COOKIE),
+) -> User | None:
+    """Cookie `session` を照合し、セッションの所有ユーザーを返す.
+
+    sessions と users を 1 ステートメントで JOIN して解決する（get_current_user_sub +
+    ユーザー取得の 2 往復を 1 往復にする）。Cookie 不在・不一致・失効の扱いは
+    get_current_user_sub と同じ。ユーザーが存在しない場合は None を返す。
+    """
+    if not session_token:
+        raise InvalidTokenError("No session cookie")
+
+    session, user, extended = await validate_session_with_user(db, session_token)
+    if session is None:
+        raise InvalidTokenError("Invalid or expired session")
+
+    if extended:
+        await _refresh_extended_session(response, db, session, session_token)
+
+    return user
@@ -0,0 +1,50 @@
+"""リクエスト単位の DB 集計と Server-Timing ヘッダ付与ミドルウェア."""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tasche.core.config import settings
+from tasche.db.query_stats import QueryStats, reset_query_stats, start_query_stats
+
+
+def format_server_timing(stats: QueryStats, total_seconds: float) -> str:
+    """Server-Timing ヘッダ値を組み立てる（app: 処理全体 / db: DB 待ち時間とステートメント数）."""
+    return (
+        f"app;dur={total_seconds * 1000:.1f}, "
+        f'db;dur={stats.duration_ms:.1f};desc="{stats.statements} statements"'
+    )
+
+
+class ServerTimingMiddleware:
+    """リクエストごとに DB ステートメント数・所要時間を集計する（pure ASGI）.
+
+    - 集計は db.query_stats の ContextVar に積まれ、内側の処理（OTel span 属性の付与など）から参照できる
+    - ENABLE_SERVER_TIMING=true の場合は http.response.start 時点の合計を Server-Timing ヘッダで返す
+    - レスポンス開始後（BackgroundTasks など）に発行したステートメントはヘッダに含まれない
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_query_stats()
+        started = time.perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.enable_server_timing:
+                headers = MutableHeaders(scope=message)
+                headers["Server-Timing"] = format_server_timing(
+                    stats, time.perf_counter() - started
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            reset_query_stats(token)
@@ -0,0 +1,80 @@
+"""core/cache.py のユニットテスト."""
+
+from tasche.core.cache import TTLCache
+
+
+class FakeClock:
+    """単調増加時計のテストダブル."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_cache(clock: FakeClock, *, max_entries: int = 3, ttl: float = 10) -> TTLCache[str, int]:
+    return TTLCache(max_entries=lambda: max_entries, ttl_seconds=lambda: ttl, clock=clock)
+
+
+class TestTTLCache:
+    """TTLCache のテスト."""
+
+    def test_get_counts_hits_and_misses(self):
+        """ヒット/ミスが統計に計上されることを確認."""
+        cache = _make_cache(FakeClock())
+
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.size == 1
+        assert stats.hit_rate == 0.5
+
+    def test_entry_expires_after_ttl(self):
+        """TTL 経過後のエントリはミスになることを確認."""
+        clock = FakeClock()
+        cache = _make_cache(clock, ttl=10)
+        cache.set("a", 1)
+
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert cache.stats().size == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """上限超過時に最も古く参照されたエントリが追い出されることを確認."""
+        cache = _make_cache(FakeClock(), max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        """TTL 0 の場合は登録されないことを確認."""
+        cache = _make_cache(FakeClock(), ttl=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats().size == 0
+
+    def test_invalidate_many_removes_entries(self):
+        """まとめて無効化できることを確認."""
+        cache = _make_cache(FakeClock())
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        cache.invalidate_many(["a", "c", "missing"])
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") is None
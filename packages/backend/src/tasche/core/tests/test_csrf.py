@@ -0,0 +1,51 @@
+"""core/csrf.py のテスト."""
+
+import pytest
+from httpx import AsyncClient
+
+from tasche.core.config import settings
+from tasche.core.csrf import CSRFMiddleware
+
+ALLOWED_ORIGIN = settings.cors_allow_origin_list[0]
+
+
+class TestCSRFMiddleware:
+    """CSRFMiddleware のテスト."""
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"Origin": "https://evil.example.com"},
+            {"Referer": "https://evil.example.com/page"},
+        ],
+    )
+    async def test_rejects_foreign_origin(self, client: AsyncClient, headers):
+        """許可外のオリジン（Origin 無しなら Referer）からの更新系リクエストを 403 にすることを確認."""
+        response = await client.post("/api/tasks", json={"name": "タスク"}, headers=headers)
+
+        assert response.status_code == 403
+        assert response.json()["error"]["code"] == "CSRF_VALIDATION_FAILED"
+
+    @pytest.mark.parametrize(
+        "headers",
+        [{"Origin": ALLOWED_ORIGIN}, {"Referer": f"{ALLOWED_ORIGIN}/tasks"}, {}],
+    )
+    async def test_passes_allowed_or_missing_origin(self, client: AsyncClient, headers):
+        """許可オリジン、または Origin/Referer が無い場合は後続（認証）まで到達することを確認."""
+        response = await client.post("/api/tasks", json={"name": "タスク"}, headers=headers)
+
+        assert response.status_code == 401
+
+    async def test_safe_methods_are_not_checked(self, client: AsyncClient):
+        """GET は検証対象外であることを確認."""
+        response = await client.get("/api/tasks", headers={"Origin": "https://evil.example.com"})
+
+        assert response.status_code == 401
+
+    def test_allowed_origins_are_precomputed(self):
+        """許可オリジンは生成時に frozenset として保持されることを確認."""
+        middleware = CSRFMiddleware(
+            app=None, allowed_origins=["https://a.example", "https://b.example"]
+        )
+
+        assert middleware.allowed_origins == frozenset({"https://a.example", "https://b.example"})
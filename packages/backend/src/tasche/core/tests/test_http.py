@@ -0,0 +1,67 @@
+"""core/http.py のユニットテスト."""
+
+from unittest.mock import patch
+
+import respx
+from httpx import Response
+
+from tasche.core.config import settings
+from tasche.core.http import aclose_http_client, get_http_client
+from tasche.core.oauth import GOOGLE_TOKEN_URL, exchange_code_for_token
+
+
+class TestSharedHttpClient:
+    """共有 httpx.AsyncClient のテスト."""
+
+    async def test_client_is_reused(self):
+        """同一プロセス内では同じクライアント（コネクションプール）を使い回すことを確認."""
+        assert get_http_client() is get_http_client()
+
+    async def test_timeouts_come_from_settings(self):
+        """タイムアウトが settings から設定されることを確認."""
+        with (
+            patch.object(settings, "http_client_timeout_seconds", 3.0),
+            patch.object(settings, "http_client_connect_timeout_seconds", 1.0),
+        ):
+            client = get_http_client()
+
+        assert client.timeout.read == 3.0
+        assert client.timeout.connect == 1.0
+
+    async def test_closed_client_is_recreated(self):
+        """aclose 後は新しいクライアントが生成されることを確認."""
+        first = get_http_client()
+        await aclose_http_client()
+
+        second = get_http_client()
+
+        assert first.is_closed
+        assert second is not first
+        assert not second.is_closed
+
+
+class TestExchangeCodeForToken:
+    """exchange_code_for_token のテスト."""
+
+    async def test_posts_form_with_client_credentials(self):
+        """共有クライアントで /token にフォーム POST することを確認."""
+        with (
+            patch.object(settings, "google_oauth_client_id", "test_client_id"),
+            patch.object(settings, "google_oauth_client_secret", "test_client_secret"),
+            respx.mock as mock,
+        ):
+            route = mock.post(GOOGLE_TOKEN_URL).mock(
+                return_value=Response(200, json={"id_token": "dummy"})
+            )
+            token = await exchange_code_for_token(
+                code="auth_code",
+                code_verifier="verifier",
+                redirect_uri="http://localhost:5173/auth/callback",
+            )
+
+        assert token == {"id_token": "dummy"}
+        body = route.calls.last.request.content.decode()
+        assert "grant_type=authorization_code" in body
+        assert "code_verifier=verifier" in body
+        assert "client_id=test_client_id" in body
+        assert "client_secret=test_client_secret" in body
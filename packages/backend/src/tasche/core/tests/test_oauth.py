@@ -0,0 +1,138 @@
+"""core/oauth.py のユニットテスト（JWKS 公開鍵キャッシュ）."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+import respx
+from httpx import Response
+
+from tasche.core import oauth
+from tasche.core.config import settings
+from tasche.core.exceptions import InvalidAuthorizationCodeError
+from tasche.core.oauth import (
+    GOOGLE_JWKS_URL,
+    JWKS_CACHE_TTL,
+    prefetch_google_signing_keys,
+    verify_google_id_token,
+)
+from tasche.tests.helpers.google_oauth import make_google_id_token
+
+
+def _with_kid(jwks: dict, kid: str) -> dict:
+    return {"keys": [{**key, "kid": kid} for key in jwks["keys"]]}
+
+
+@pytest.fixture(autouse=True)
+def _client_id():
+    with patch.object(settings, "google_oauth_client_id", "test_client_id"):
+        yield
+
+
+class TestGoogleSigningKeyCache:
+    """verify_google_id_token の公開鍵キャッシュのテスト."""
+
+    async def test_keys_are_fetched_and_imported_once(self, rsa_private_key_pem, test_jwks):
+        """2 回目以降の検証では JWKS の取得・パースを行わないことを確認."""
+        id_token = make_google_id_token(rsa_private_key_pem, aud="test_client_id")
+
+        with (
+            respx.mock as mock,
+            patch.object(
+                oauth.KeySet, "import_key_set", wraps=oauth.KeySet.import_key_set
+            ) as import_key_set,
+        ):
+            route = mock.get(GOOGLE_JWKS_URL).mock(return_value=Response(200, json=test_jwks))
+            await verify_google_id_token(id_token)
+            await verify_google_id_token(id_token)
+
+        assert route.call_count == 1
+        assert import_key_set.call_count == 1
+
+    async def test_stale_keys_are_served_while_revalidating(self, rsa_private_key_pem, test_jwks):
+        """TTL 経過後は古い鍵で即時に検証し、再取得はバックグラウンドで行うことを確認."""
+        id_token = make_google_id_token(rsa_private_key_pem, aud="test_client_id")
+        refetched = asyncio.Event()
+
+        async def _slow_jwks(request):
+            await refetched.wait()
+            return Response(200, json=test_jwks)
+
+        with respx.mock as mock:
+            route = mock.get(GOOGLE_JWKS_URL).mock(return_value=Response(200, json=test_jwks))
+            await verify_google_id_token(id_token)
+            oauth._jwks_fetched_at = time.monotonic() - JWKS_CACHE_TTL - 1
+            route.mock(side_effect=_slow_jwks)
+
+            # 再取得が終わっていなくても検証は完了する
+            claims = await asyncio.wait_for(verify_google_id_token(id_token), timeout=1)
+            assert claims["aud"] == "test_client_id"
+            assert not oauth._jwks_refresh_task.done()
+
+            refetched.set()
+            await oauth._jwks_refresh_task
+
+        assert route.call_count == 2
+        assert time.monotonic() - oauth._jwks_fetched_at < JWKS_CACHE_TTL
+
+    async def test_unknown_kid_forces_refresh(self, rsa_private_key_pem, test_jwks):
+        """鍵ローテーションで未知の kid が来た場合のみ同期的に再取得することを確認."""
+        with respx.mock as mock:
+            route = mock.get(GOOGLE_JWKS_URL).mock(return_value=Response(200, json=test_jwks))
+            await verify_google_id_token(
+                make_google_id_token(rsa_private_key_pem, aud="test_client_id")
+            )
+            route.mock(return_value=Response(200, json=_with_kid(test_jwks, "rotated-key-id")))
+
+            claims = await verify_google_id_token(
+                make_google_id_token(
+                    rsa_private_key_pem, aud="test_client_id", kid="rotated-key-id"
+                )
+            )
+
+        assert claims["sub"] == "google_sub_12345"
+        assert route.call_count == 2
+
+    async def test_forced_refresh_is_rate_limited(self, rsa_private_key_pem, test_jwks):
+        """未知の kid が続いても強制再取得は最小間隔内で 1 回に抑えられることを確認."""
+        with respx.mock as mock:
+            route = mock.get(GOOGLE_JWKS_URL).mock(return_value=Response(200, json=test_jwks))
+            for _ in range(3):
+                with pytest.raises(InvalidAuthorizationCodeError):
+                    await verify_google_id_token(
+                        make_google_id_token(
+                            rsa_private_key_pem, aud="test_client_id", kid="forged-key-id"
+                        )
+                    )
+
+        # 初回取得 + 強制再取得 1 回
+        assert route.call_count == 2
+
+    async def test_malformed_token_rejected_without_fetch(self):
+        """形式不正のトークンは JWKS を取得せずに拒否されることを確認."""
+        with respx.mock as mock:
+            route = mock.get(GOOGLE_JWKS_URL).mock(return_value=Response(200, json={}))
+            with pytest.raises(InvalidAuthorizationCodeError):
+                await verify_google_id_token("not-a-jwt")
+
+        assert route.call_count == 0
+
+    async def test_prefetch_warms_cache_once_and_swallows_errors(
+        self, rsa_private_key_pem, test_jwks
+    ):
+        """prefetch は失敗を送出せず、取得済みなら再取得しないことを確認."""
+        id_token = make_google_id_token(rsa_private_key_pem, aud="test_client_id")
+
+        with respx.mock as mock:
+            route = mock.get(GOOGLE_JWKS_URL).mock(return_value=Response(503))
+            await prefetch_google_signing_keys()
+            assert oauth._jwks_fetched_at is None
+
+            route.mock(return_value=Response(200, json=test_jwks))
+            await prefetch_google_signing_keys()
+            await prefetch_google_signing_keys()
+            await verify_google_id_token(id_token)
+
+        # 失敗 1 回 + 成功 1 回（2 回目の prefetch と検証はキャッシュを使う）
+        assert route.call_count == 2
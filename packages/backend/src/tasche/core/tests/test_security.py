@@ -6,10 +6,14 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tasche.core.exceptions import InvalidTokenError
-from tasche.core.security import get_current_user_sub
+from tasche.core.security import get_current_session_user, get_current_user_sub
 from tasche.models.session import Session
 from tasche.models.user import User
-from tasche.services.session import _generate_raw_token, _generate_session_id, _hash_token
+from tasche.services.session import (
+    _generate_session_id,
+    _hash_token,
+    _issue_raw_token,
+)
 
 
 class TestGetCurrentUserSub:
@@ -33,13 +37,14 @@ class TestGetCurrentUserSub:
         await db_session.commit()
 
         # 有効なセッションを直接作成
-        raw_token = _generate_raw_token()
-        token_hash = _hash_token(raw_token)
         expires_at = datetime.now(tz=timezone.utc) + timedelta(
             seconds=settings.session_expires_seconds
         )
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -98,11 +103,12 @@ class TestGetCurrentUserSub:
         await db_session.commit()
 
         # 期限切れセッションを作成
-        raw_token = _generate_raw_token()
-        token_hash = _hash_token(raw_token)
         expired_at = datetime.now(tz=timezone.utc) - timedelta(hours=1)
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expired_at)
+        token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expired_at,
@@ -136,13 +142,14 @@ class TestGetCurrentUserSub:
         await db_session.commit()
 
         # revoke 済みセッションを作成
-        raw_token = _generate_raw_token()
-        token_hash = _hash_token(raw_token)
         expires_at = datetime.now(tz=timezone.utc) + timedelta(
             seconds=settings.session_expires_seconds
         )
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -160,6 +167,93 @@ class TestGetCurrentUserSub:
             )
 
 
+class TestSlidingExtensionRefresh:
+    """スライディング延長発生時の Cookie 再送と DB 反映のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_cookie_is_reissued_and_db_updated_before_response(
+        self, db_session: AsyncSession
+    ):
+        """延長は依存の中（ハンドラの前）で commit し、Cookie を再送することを確認."""
+        from fastapi import Response
+        from ulid import ULID
+
+        user = User(
+            id=f"usr_{ULID()}",
+            email="refresh_test@example.com",
+            name="Refresh Test",
+        )
+        db_session.add(user)
+        await db_session.commit()
+
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        session = Session(
+            id=session_id,
+            user_id=user.id,
+            token_hash=_hash_token(raw_token),
+            expires_at=expires_at,
+        )
+        db_session.add(session)
+        await db_session.commit()
+        original_expires_at = session.expires_at
+
+        response = Response()
+        await get_current_user_sub(
+            response=response,
+            db=db_session,
+            session_token=raw_token,
+        )
+
+        # 延長後の期限で再署名したトークンを再送する（token_hash は不変）
+        reissued = response.headers["set-cookie"].split(";")[0].removeprefix("session=")
+        assert reissued != raw_token
+        assert _hash_token(reissued) == session.token_hash
+
+        db_session.expunge_all()
+        refreshed = await db_session.get(Session, session.id)
+        assert refreshed.expires_at > original_expires_at
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_skips_cookie_and_retries_next_time(self, db_session: AsyncSession):
+        """延長の commit に失敗した場合は Cookie を再送せず、次回リクエストで再度延長することを確認."""
+        from unittest.mock import patch
+
+        from fastapi import Response
+        from ulid import ULID
+
+        user_id = f"usr_{ULID()}"
+        db_session.add(User(id=user_id, email="refresh_fail@example.com", name="Refresh Fail"))
+        await db_session.commit()
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        db_session.add(
+            Session(
+                id=session_id,
+                user_id=user_id,
+                token_hash=_hash_token(raw_token),
+                expires_at=expires_at,
+            )
+        )
+        await db_session.commit()
+
+        failed = Response()
+        with patch.object(db_session, "commit", side_effect=RuntimeError("connection lost")):
+            assert (
+                await get_current_user_sub(response=failed, db=db_session, session_token=raw_token)
+                == user_id
+            )
+        assert "set-cookie" not in failed.headers
+
+        retried = Response()
+        await get_current_user_sub(response=retried, db=db_session, session_token=raw_token)
+        assert "set-cookie" in retried.headers
+        db_session.expunge_all()
+        assert (await db_session.get(Session, session_id)).expires_at > expires_at
+
+
 class TestSlidingExtension:
     """スライディング延長のテスト（services/session.py の validate_session）."""
 
@@ -184,10 +278,11 @@ class TestSlidingExtension:
         # 有効期限 7 日（604800 秒）の半分 = 3.5 日 = 302400 秒
         # 残存 1 日（86400 秒）< 半分 → 延長される
         expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
-        raw_token = _generate_raw_token()
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
         token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -232,10 +327,11 @@ class TestSlidingExtension:
         # 有効期限 7 日（604800 秒）の半分 = 3.5 日
         # 残存 5 日（432000 秒）> 半分 → 延長されない
         expires_at = datetime.now(tz=timezone.utc) + timedelta(days=5)
-        raw_token = _generate_raw_token()
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
         token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -252,3 +348,61 @@ class TestSlidingExtension:
         assert extended is False
         # expires_at が変わっていないことを確認（秒単位で同じ）
         assert result_session.expires_at == original_expires_at
+
+
+class TestGetCurrentSessionUser:
+    """get_current_session_user 依存関数のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_user_with_single_statement(self, db_session: AsyncSession):
+        """セッション照合と User 取得が 1 ステートメントで行われることを確認."""
+        from fastapi import Response
+        from sqlalchemy import event
+        from ulid import ULID
+
+        from tasche.services.session import create_session
+
+        user = User(
+            id=f"usr_{ULID()}",
+            email="joined_test@example.com",
+            name="Joined Test",
+        )
+        db_session.add(user)
+        await db_session.commit()
+        _, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+        db_session.expunge_all()
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            result = await get_current_session_user(
+                response=Response(),
+                db=db_session,
+                session_token=raw_token,
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert result is not None
+        assert result.id == user.id
+        assert result.email == "joined_test@example.com"
+        assert len(statements) == 1
+        assert "JOIN users" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_raises_invalid_token(self, db_session: AsyncSession):
+        """不正な session トークンで InvalidTokenError が raise されることを確認."""
+        from fastapi import Response
+
+        with pytest.raises(InvalidTokenError):
+            await get_current_session_user(
+                response=Response(),
+                db=db_session,
+                session_token="invalid_token_value",
+            )
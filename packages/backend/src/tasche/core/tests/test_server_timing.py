@@ -0,0 +1,68 @@
+"""core/server_timing.py と db/query_stats.py のテスト."""
+
+import re
+from unittest.mock import patch
+
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from tasche.core.config import settings
+from tasche.db.query_stats import get_query_stats, reset_query_stats, start_query_stats
+from tasche.services.session import clear_session_cache
+
+_SERVER_TIMING = re.compile(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) statements"')
+
+
+def _statement_count(header: str) -> int:
+    match = _SERVER_TIMING.fullmatch(header)
+    assert match is not None, header
+    return int(match.group(1))
+
+
+class TestQueryStats:
+    """ContextVar によるステートメント集計のテスト."""
+
+    async def test_statements_are_counted_only_while_active(self, db_session):
+        """集計開始後のステートメントのみ加算され、終了後は None に戻ることを確認."""
+        await db_session.execute(text("SELECT 1"))
+
+        stats, token = start_query_stats()
+        try:
+            await db_session.execute(text("SELECT 1"))
+            await db_session.execute(text("SELECT 2"))
+        finally:
+            reset_query_stats(token)
+
+        assert stats.statements == 2
+        assert stats.duration_seconds > 0
+        assert get_query_stats() is None
+
+
+class TestServerTimingMiddleware:
+    """ServerTimingMiddleware のテスト."""
+
+    async def test_header_reports_per_request_statements(self, authenticated_client: AsyncClient):
+        """リクエストごとの DB ステートメント数が Server-Timing に出ることを確認."""
+        clear_session_cache()
+        cold = await authenticated_client.get("/api/users/me")
+        warm = await authenticated_client.get("/api/users/me")
+
+        assert cold.status_code == 200
+        # セッション照合（users を JOIN した 1 ステートメント）
+        assert _statement_count(cold.headers["server-timing"]) == 1
+        # 2 回目は検証キャッシュにヒットし、ユーザーもテスト用に共有した DB セッションの
+        # identity map から返るため 0（前リクエスト分が加算されていないこと）
+        assert _statement_count(warm.headers["server-timing"]) == 0
+
+    async def test_header_without_db_access(self, client: AsyncClient):
+        """DB を使わないエンドポイントでは 0 statements となることを確認."""
+        response = await client.get("/health")
+
+        assert _statement_count(response.headers["server-timing"]) == 0
+
+    async def test_header_can_be_disabled(self, client: AsyncClient):
+        """ENABLE_SERVER_TIMING=false ではヘッダを付与しないことを確認."""
+        with patch.object(settings, "enable_server_timing", False):
+            response = await client.get("/health")
+
+        assert "server-timing" not in response.headers
@@ -0,0 +1,90 @@
+"""core/warmup.py のテスト."""
+
+import asyncio
+from unittest.mock import patch
+
+import respx
+from httpx import Response
+
+from tasche import main
+from tasche.core import oauth, warmup
+from tasche.core.config import settings
+from tasche.core.oauth import GOOGLE_JWKS_URL
+from tasche.core.warmup import warm_up
+from tasche.db.query_stats import reset_query_stats, start_query_stats
+from tasche.db.session import dispose_engines, get_engine
+
+
+class TestWarmUp:
+    """warm_up のテスト."""
+
+    async def test_warm_up_primes_db_and_jwks(self, db_session, test_jwks):
+        """DB 接続がプールに残り、主要クエリの発行と JWKS 取得が済むことを確認."""
+        stats, token = start_query_stats()
+        try:
+            with respx.mock:
+                jwks_route = respx.get(GOOGLE_JWKS_URL).mock(
+                    return_value=Response(200, json=test_jwks)
+                )
+                await warm_up()
+
+            assert jwks_route.call_count == 1
+            assert oauth._jwks_keys
+            # セッション照合 x2・タスク一覧（件数 + 本体）・current week の参照
+            assert stats.statements >= 4
+            assert get_engine().pool.checkedin() >= 1
+        finally:
+            reset_query_stats(token)
+            await dispose_engines()
+
+    async def test_failure_is_logged_and_swallowed(self):
+        """失敗しても例外を送出せず、警告ログのみ残すことを確認."""
+        with (
+            patch.object(
+                warmup, "resolve_secrets", side_effect=RuntimeError("extension not ready")
+            ),
+            patch.object(warmup, "logger") as logger,
+        ):
+            await warm_up()
+
+        logger.warning.assert_called_once()
+        logger.info.assert_not_called()
+
+
+class TestLifespanWarmUp:
+    """lifespan からの warm-up 起動のテスト."""
+
+    async def test_startup_does_not_wait_for_warm_up(self):
+        """warm-up の完了を待たずに startup が終わり、shutdown 時に中断されることを確認."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def _slow_warm_up():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with (
+            patch.object(settings, "enable_warmup", True),
+            patch.object(main, "warm_up", _slow_warm_up),
+        ):
+            async with main.lifespan(main.app):
+                await asyncio.wait_for(started.wait(), timeout=1)
+
+        assert cancelled.is_set()
+
+    async def test_warm_up_is_disabled_by_default(self):
+        """ENABLE_WARMUP 未設定時は warm-up を開始しないことを確認."""
+        calls = []
+
+        async def _warm_up():
+            calls.append(True)
+
+        with patch.object(main, "warm_up", _warm_up):
+            async with main.lifespan(main.app):
+                await asyncio.sleep(0)
+
+        assert calls == []
@@ -0,0 +1,82 @@
+"""コンテナ起動直後のウォームアップ.
+
+Secret・DB エンジン・共有 HTTP クライアントはいずれも初回 /api/* リクエストで lazy に
+初期化されるため、何もしないとコンテナ最初のユーザーリクエストが Secret 取得・
+asyncpg 接続・SQLAlchemy のステートメントコンパイル・JWKS 取得をすべて負担する。
+
+ENABLE_WARMUP=true の場合、lifespan の起動時に warm_up をバックグラウンドタスクとして
+開始する（await しないため /health の readiness は遅らせない）。失敗してもログのみで、
+各処理は従来通り初回リクエスト時に改めて行われる。
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.core.exceptions import WeekNotFoundException
+from tasche.core.oauth import prefetch_google_signing_keys
+from tasche.core.secret_resolver import resolve_secrets
+from tasche.db.session import get_read_session_maker, get_session_maker
+from tasche.models.user import User
+from tasche.services import dashboard as dashboard_service
+from tasche.services import data_version as data_version_service
+from tasche.services import task as task_service
+from tasche.services.session import new_session, validate_session, validate_session_with_user
+from tasche.services.week import DEFAULT_TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+# 実在しないユーザー。読み取りクエリを空振りさせてコンパイル済みキャッシュだけを温める
+_WARMUP_USER_ID = "usr_00000000000000000000WARMUP"
+
+
+async def _prime_session_queries(db: AsyncSession) -> None:
+    """認証（全 API 共通）のセッション照合クエリ."""
+    # 署名は正しいが DB に存在しないトークン。不一致の結果はキャッシュされない
+    raw_token = new_session().raw_token
+    await validate_session(db, raw_token)
+    await validate_session_with_user(db, raw_token)
+
+
+async def _prime_read_queries(db: AsyncSession) -> None:
+    """ReadDbSession を使う読み取り専用エンドポイントのクエリ."""
+    user = User(id=_WARMUP_USER_ID, email="warmup@invalid", timezone=DEFAULT_TIMEZONE)
+    await data_version_service.get_user_data_version(db, user)
+    await task_service.get_tasks_with_stats(db, user)
+    try:
+        await dashboard_service.get_dashboard(db, user)
+    except WeekNotFoundException:
+        pass
+
+
+_PRIMARY_QUERIES: list[Callable[[AsyncSession], Awaitable[None]]] = [_prime_session_queries]
+_READ_QUERIES: list[Callable[[AsyncSession], Awaitable[None]]] = [_prime_read_queries]
+
+
+async def _prime_queries(
+    session_maker: Callable[[], AsyncSession],
+    queries: list[Callable[[AsyncSession], Awaitable[None]]],
+) -> None:
+    async with session_maker() as db:
+        for query in queries:
+            await query(db)
+        await db.rollback()
+
+
+async def warm_up() -> None:
+    """Secret 解決・DB 接続とクエリの事前実行・JWKS 取得を行う（例外は送出しない）."""
+    started = time.perf_counter()
+    try:
+        await resolve_secrets()
+        await asyncio.gather(
+            _prime_queries(get_session_maker(), _PRIMARY_QUERIES),
+            _prime_queries(get_read_session_maker(), _READ_QUERIES),
+            prefetch_google_signing_keys(),
+        )
+    except Exception:
+        logger.warning("Warm-up failed", exc_info=True)
+        return
+    logger.info("Warm-up completed in %.1f ms", (time.perf_counter() - started) * 1000)
@@ -0,0 +1,73 @@
+"""リクエスト単位の DB ステートメント数・所要時間の集計.
+
+エンジンの before/after_cursor_execute イベントで計測し、ContextVar に保持した
+QueryStats に加算する。ServerTimingMiddleware がリクエストごとに QueryStats を用意し、
+合計を Server-Timing ヘッダと OTel span 属性（main._set_http_span_attributes）に出す。
+
+SQLAlchemy の async 実行は呼び出し元の contextvars を引き継いだ greenlet 上で
+イベントを発火するため、同期イベントから ContextVar を参照できる。内側で別タスクが
+作られる（コンテキストはコピーされる）場合でも集計できるよう、ContextVar には
+置き換えではなく可変オブジェクトを入れて加算する。
+"""
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_QUERY_STARTED_KEY = "tasche_query_started"
+
+
+@dataclass
+class QueryStats:
+    """1 リクエストで発行したステートメント数と DB 所要時間."""
+
+    statements: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_seconds * 1000
+
+
+_current_query_stats: ContextVar[QueryStats | None] = ContextVar("tasche_query_stats", default=None)
+
+
+def start_query_stats() -> tuple[QueryStats, Token[QueryStats | None]]:
+    """現在のコンテキストで集計を開始する（終了時は reset_query_stats に token を渡す）."""
+    stats = QueryStats()
+    return stats, _current_query_stats.set(stats)
+
+
+def reset_query_stats(token: Token[QueryStats | None]) -> None:
+    _current_query_stats.reset(token)
+
+
+def get_query_stats() -> QueryStats | None:
+    """集計中の QueryStats を返す（リクエスト外では None）."""
+    return _current_query_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info[_QUERY_STARTED_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.pop(_QUERY_STARTED_KEY, None)
+    stats = _current_query_stats.get()
+    if stats is None or started is None:
+        return
+    stats.statements += 1
+    stats.duration_seconds += time.perf_counter() - started
+
+
+def install_query_stats(engine: AsyncEngine | Engine) -> None:
+    """エンジンに集計用のイベントリスナーを登録する（冪等）."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
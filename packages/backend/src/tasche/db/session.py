@@ -3,32 +3,88 @@
 Lambda + Parameters and Secrets Lambda Extension 構成では、Settings() の
 SecretsManager 呼び出しを起動時遅延化しているため、engine / session_maker も
 モジュール import 時には生成せず、初回利用時に lazy 生成する。
+
+コネクションプールは DB_POOL_MODE で切り替える（各モードの計測結果は
+docs/adr/ADR-B-002-db-pool-mode.md）。
 """
 
 from collections.abc import AsyncGenerator
+from typing import Any
+from uuid import uuid4
 
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 from tasche.core.config import settings
+from tasche.core.cookies import PRIMARY_PIN_COOKIE, set_primary_pin_cookie
+from tasche.db.query_stats import install_query_stats
 
 _engine: AsyncEngine | None = None
 _async_session_maker: async_sessionmaker[AsyncSession] | None = None
+_read_engine: AsyncEngine | None = None
+_read_session_maker: async_sessionmaker[AsyncSession] | None = None
+
+# 更新系メソッド。成功時に読み取りをプライマリへ固定する
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def build_engine_options(pool_mode: str | None = None) -> dict[str, Any]:
+    """プールモードに応じた create_async_engine の引数を組み立てる.
+
+    - queue: 常駐プロセス向け。db_pool_size + db_max_overflow 本まで接続を保持する
+    - single: 外部プーラなしの Lambda 向け。同時実行 1 のコンテナで 1 接続を使い回す。
+      凍結中に切断された接続を掴まないよう pre_ping は常に有効にする
+    - null: RDS Proxy / pgbouncer 経由の Lambda 向け。チェックアウトごとに接続し、
+      プールは外部プーラに任せる。transaction モードの pgbouncer で prepared statement 名が
+      衝突しないよう名前を一意にする
+
+    Args:
+        pool_mode: 省略時は settings.db_pool_mode
+
+    Returns:
+        create_async_engine に渡すキーワード引数（URL 以外）
+    """
+    mode = pool_mode or settings.db_pool_mode
+    connect_args: dict[str, Any] = {
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    }
+    options: dict[str, Any] = {
+        "echo": settings.log_level == "debug",
+        "connect_args": connect_args,
+    }
+
+    if mode == "null":
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    if mode == "single":
+        options.update(pool_size=1, max_overflow=0, pool_pre_ping=True)
+    else:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    return options
 
 
 def get_engine() -> AsyncEngine:
     """エンジンを lazy 生成する (Secret 解決後に database_url が確定するため)."""
     global _engine
     if _engine is None:
-        _engine = create_async_engine(
-            settings.database_url,
-            echo=settings.log_level == "debug",
-            future=True,
-        )
+        _engine = create_async_engine(settings.database_url, **build_engine_options())
+        install_query_stats(_engine)
     return _engine
 
 
@@ -44,7 +100,74 @@ def get_session_maker() -> async_sessionmaker[AsyncSession]:
     return _async_session_maker
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """DB セッション依存関係."""
+def _read_replica_enabled() -> bool:
+    return bool(settings.database_read_url)
+
+
+def get_read_engine() -> AsyncEngine:
+    """リードレプリカ用エンジンを lazy 生成する（DATABASE_READ_URL 未設定ならプライマリ）."""
+    global _read_engine
+    if not _read_replica_enabled():
+        return get_engine()
+    if _read_engine is None:
+        _read_engine = create_async_engine(settings.database_read_url, **build_engine_options())
+        install_query_stats(_read_engine)
+    return _read_engine
+
+
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    """リードレプリカ用セッションファクトリを lazy 生成する."""
+    global _read_session_maker
+    if not _read_replica_enabled():
+        return get_session_maker()
+    if _read_session_maker is None:
+        _read_session_maker = async_sessionmaker(
+            get_read_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _read_session_maker
+
+
+async def dispose_engines() -> None:
+    """生成済みのエンジンの接続を閉じ、次回利用時に作り直させる."""
+    global _engine, _async_session_maker, _read_engine, _read_session_maker
+    for engine in (_read_engine, _engine):
+        if engine is not None:
+            await engine.dispose()
+    _engine = _async_session_maker = _read_engine = _read_session_maker = None
+
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """DB セッション依存関係（プライマリ）.
+
+    リードレプリカ利用時は、更新系リクエストのレスポンスに短命の Cookie を付け、
+    直後の読み取り（get_read_db）をプライマリへ固定する（read-your-writes）。
+    エラー時は例外ハンドラが別のレスポンスを返すため Cookie は付かない。
+    """
+    if (
+        _read_replica_enabled()
+        and settings.db_primary_pin_seconds > 0
+        and request.method in _WRITE_METHODS
+    ):
+        set_primary_pin_cookie(response)
     async with get_session_maker()() as session:
         yield session
+
+
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """読み取り専用エンドポイント用の DB セッション依存関係.
+
+    リードレプリカを使う。DATABASE_READ_URL 未設定、または直前に書き込みをした
+    クライアント（プライマリ固定 Cookie あり）の場合は、認証などで同じリクエストが
+    既に使っている get_db のセッションをそのまま返す。プライマリの接続を 2 本
+    チェックアウトしないため、DB_POOL_MODE=single（pool_size=1）でも詰まらない。
+    get_db のセッションは実行時まで接続を取らないため、レプリカを使う場合の負担はない。
+    """
+    if PRIMARY_PIN_COOKIE in request.cookies or not _read_replica_enabled():
+        yield db
+        return
+    async with get_read_session_maker()() as session:
+        yield session
@@ -1,11 +1,17 @@
 """FastAPI アプリケーション初期化."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from weakref import WeakKeyDictionary
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from tasche.api import events
 from tasche.api.v1.router import api_router
 from tasche.core.config import settings
 from tasche.core.csrf import CSRFMiddleware
@@ -18,6 +24,12 @@ from tasche.core.exceptions import (
     ValidationError,
     WeekNotFoundException,
 )
+from tasche.core.http import aclose_http_client
+from tasche.core.server_timing import ServerTimingMiddleware
+from tasche.core.warmup import warm_up
+from tasche.db.query_stats import get_query_stats
+from tasche.db.session import dispose_engines
+from tasche.services.dashboard_cache import aclose_dashboard_cache
 
 
 def _install_otel_log_record_defaults() -> None:
@@ -55,15 +67,37 @@ logging.basicConfig(
 #   2. /health が応答可能になり、Lambda Web Adapter の readiness check が通過
 #   3. Lambda が invoke を開始
 #   4. 最初の /api/* リクエストで require_secrets_resolved dependency が
-#      Secret を取得 (この時点では Extension の登録が完了している)
+#      Secret を非同期に取得 (Extension の登録完了まではバックオフでリトライ)
 # lifespan で Secret 取得をすると ASGI startup が完了せず /health が
 # 応答できないため、dependency 方式に分離している。
+# ENABLE_WARMUP=true の場合の warm-up も startup を待たせないバックグラウンドタスクで、
+# 初回リクエストと並行した Secret 取得は core.secret_resolver が 1 回にまとめる。
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """起動時は待たない（上記の理由）。終了時に共有 HTTP クライアント・キャッシュと DB 接続を閉じる.
+
+    ENABLE_WARMUP=true の場合は core.warmup をバックグラウンドで開始し、
+    startup の完了（/health の応答）は待たせない。
+    """
+    warmup_task = asyncio.create_task(warm_up()) if settings.enable_warmup else None
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    await aclose_http_client()
+    await aclose_dashboard_cache()
+    await dispose_engines()
+
 
 app = FastAPI(
     title="Tasche API",
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 
@@ -72,6 +106,29 @@ def _safe_request_url(request: Request) -> str:
     return str(request.url.replace(query=None))
 
 
+# app → (構築時の app.routes の件数, id(route) → prefix 結合済みパス)
+_route_path_maps: WeakKeyDictionary[FastAPI, tuple[int, dict[int, str]]] = WeakKeyDictionary()
+
+
+def _build_route_path_map(app: FastAPI) -> dict[int, str]:
+    """全ルートの実効パス (prefix 結合済み) を route オブジェクトの id で引ける辞書にする."""
+    from fastapi.routing import iter_route_contexts
+
+    paths: dict[int, str] = {}
+    for context in iter_route_contexts(app.routes):
+        paths.setdefault(id(context.original_route), context.path)
+    _route_path_maps[app] = (len(app.routes), paths)
+    return paths
+
+
+def _get_route_path_map(app: FastAPI) -> dict[int, str]:
+    """ルート→実効パスの辞書を返す（app.routes の件数が変わった場合のみ作り直す）."""
+    cached = _route_path_maps.get(app)
+    if cached is None or cached[0] != len(app.routes):
+        return _build_route_path_map(app)
+    return cached[1]
+
+
 def _resolve_full_route_path(app: FastAPI | None, route: object) -> str | None:
     """マッチした route から prefix を含む完全なパスパターンを解決する.
 
@@ -80,18 +137,17 @@ def _resolve_full_route_path(app: FastAPI | None, route: object) -> str | None:
     (`scope["route"]` は各ルーターの生の APIRoute を指すため、
     `/{item_id}` のように末端の断片しか得られない)。
     そのため `iter_route_contexts()` で全ルートの実効パス
-    (prefix 結合済み) を辿り、一致する route を探して補完する。
+    (prefix 結合済み) を求めて補完する。span 属性付与は 1 リクエストで
+    複数回呼ばれるため、走査結果は app ごとに辞書として保持する。
     参照: https://github.com/fastapi/fastapi/releases/tag/0.137.0
     """
     if route is None:
         return None
 
     if app is not None:
-        from fastapi.routing import iter_route_contexts
-
-        for context in iter_route_contexts(app.routes):
-            if context.original_route is route:
-                return context.path
+        path = _get_route_path_map(app).get(id(route))
+        if path is not None:
+            return path
 
     return getattr(route, "path", None)
 
@@ -133,6 +189,12 @@ def _set_http_span_attributes_from_request(span, request: Request) -> None:
     span.set_attribute("tasche.http.operation", operation)
     span.set_attribute("tasche.http.url", url_without_query)
 
+    # ServerTimingMiddleware が集計したリクエスト内の DB ステートメント数・所要時間
+    stats = get_query_stats()
+    if stats is not None:
+        span.set_attribute("tasche.db.statement_count", stats.statements)
+        span.set_attribute("tasche.db.duration_ms", round(stats.duration_ms, 3))
+
 
 def _set_http_span_attributes_from_scope(span, scope) -> None:
     """FastAPI instrumentation hook からHTTP span属性を補完する."""
@@ -167,13 +229,23 @@ def _otel_client_response_hook(span, scope, message) -> None:
         _set_http_span_attributes_from_scope(span, scope)
 
 
-if settings.enable_telemetry:
+class EnrichHttpTraceAttributesMiddleware:
+    """アプリ処理後に現在の HTTP span へ属性を補完する（pure ASGI）.
+
+    ルーティングで scope に設定された route を参照するため、内側の処理が終わってから付与する。
+    """
 
-    @app.middleware("http")
-    async def enrich_http_trace_attributes(request: Request, call_next):
-        response = await call_next(request)
-        _set_http_span_attributes(request)
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
+        if scope["type"] == "http":
+            _set_http_span_attributes(Request(scope))
+
+
+if settings.enable_telemetry:
+    app.add_middleware(EnrichHttpTraceAttributesMiddleware)
 
     from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
@@ -196,6 +268,9 @@ app.add_middleware(
 # CSRF 対策ミドルウェア（CORS より内側に登録）
 app.add_middleware(CSRFMiddleware)
 
+# リクエスト単位の DB 集計・Server-Timing（最も外側に登録し、内側の span 属性付与から参照させる）
+app.add_middleware(ServerTimingMiddleware)
+
 
 # 例外ハンドラー（レスポンス形式: {"error": {"code": ..., "message": ...}}）
 @app.exception_handler(UserNotFoundException)
@@ -264,6 +339,10 @@ async def authentication_error_handler(request: Request, exc: AuthenticationErro
 # API v1 ルーター登録
 app.include_router(api_router, prefix="/api")
 
+# メンテナンス用イベント（LWA pass-through）はメンテナンス用 Lambda でのみ登録
+if settings.enable_maintenance_events:
+    app.include_router(events.router, include_in_schema=False)
+
 
 @app.get("/")
 async def root():
@@ -275,3 +354,8 @@ async def root():
 async def health():
     """ヘルスチェックエンドポイント."""
     return {"status": "healthy"}
+
+
+if settings.enable_telemetry:
+    # ルート登録完了後に span 名解決用の辞書を作っておく
+    _build_route_path_map(app)
@@ -2,9 +2,10 @@
 
 from tasche.models.goal import Goal
 from tasche.models.record import Record
+from tasche.models.rollup import WeekTaskRollup
 from tasche.models.session import Session
 from tasche.models.task import Task
 from tasche.models.user import User
 from tasche.models.week import Week
 
-__all__ = ["User", "Task", "Week", "Record", "Goal", "Session"]
+__all__ = ["User", "Task", "Week", "Record", "Goal", "Session", "WeekTaskRollup"]
@@ -0,0 +1,31 @@
+"""週次ロールアップ（目標・実績の集計済みテーブル）モデル.
+
+goals / records から導出する値で、services.rollup が目標・実績の書き込みと同じ
+トランザクションで更新する。ずれた場合は scripts/rebuild_rollups.py で再構築する。
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from tasche.db.base import Base
+
+
+class WeekTaskRollup(Base):
+    """(週, タスク) ごとの目標・実績の合計."""
+
+    __tablename__ = "week_task_rollups"
+
+    week_id: Mapped[str] = mapped_column(String(30), ForeignKey("weeks.id"), primary_key=True)
+    task_id: Mapped[str] = mapped_column(
+        String(30), ForeignKey("tasks.id"), primary_key=True, index=True
+    )
+    target_units: Mapped[float] = mapped_column(Numeric(9, 1, asdecimal=False), nullable=False)
+    actual_units: Mapped[float] = mapped_column(Numeric(9, 1, asdecimal=False), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
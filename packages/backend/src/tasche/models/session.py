@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from tasche.db.base import Base
@@ -11,11 +11,20 @@ from tasche.db.base import Base
 class Session(Base):
     """セッションテーブル.
 
-    不透明なセッショントークンをDB管理する。
-    生のトークンはCookieに保存し、DBにはSHA-256ハッシュのみを保存する。
+    署名付きセッショントークンをDB管理する。
+    生のトークンはCookieに保存し、DBには secret 部分のSHA-256ハッシュのみを保存する。
+    期限切れ・revoke 済みの行は purge_sessions で定期的に削除する。
     """
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # purge 対象（revoke 済み）の抽出用。有効なセッションは含めず小さく保つ
+        Index(
+            "ix_sessions_revoked_at",
+            "revoked_at",
+            postgresql_where=text("revoked_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(30), primary_key=True)  # ULID: ses_...
     user_id: Mapped[str] = mapped_column(
@@ -30,7 +39,11 @@ class Session(Base):
         nullable=False,
         index=True,
     )  # sha256 hex
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
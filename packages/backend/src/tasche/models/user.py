@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import BigInteger, DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from tasche.db.base import Base
@@ -34,6 +34,13 @@ class User(Base):
         DateTime(timezone=True),
         nullable=True,
     )
+    # タスク・週・目標・実績を書き込むたびに増える版（services/data_version.py）
+    data_version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
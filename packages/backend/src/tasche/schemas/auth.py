@@ -25,6 +25,13 @@ class LogoutResponse(BaseModel):
     message: str
 
 
+class LogoutAllResponse(BaseModel):
+    """全端末ログアウトレスポンス."""
+
+    message: str
+    revoked_sessions: int
+
+
 class StubLoginRequest(BaseModel):
     """スタブログインリクエスト."""
 
@@ -62,3 +62,39 @@ class RecordUpdate(BaseModel):
     """実績更新リクエスト."""
 
     actual_units: float = Field(..., ge=0, description="実績ユニット数（0.1単位）", multiple_of=0.1)
+
+
+# 1 リクエストで更新できるセルの上限（7 曜日 × 100 タスク）
+MAX_BATCH_RECORDS = 700
+
+
+class RecordBatchItem(BaseModel):
+    """一括更新の 1 セル（タスク × 曜日）."""
+
+    task_id: str = Field(..., description="タスクID")
+    day_of_week: DayOfWeek = Field(..., description="曜日")
+    actual_units: float = Field(..., ge=0, description="実績ユニット数（0.1単位）", multiple_of=0.1)
+
+
+class RecordBatchUpsert(BaseModel):
+    """実績一括更新リクエスト."""
+
+    records: list[RecordBatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_RECORDS,
+        description="更新するセル一覧（同じタスク × 曜日の重複は不可）",
+    )
+
+
+class RecordBatchResult(BaseModel):
+    """一括更新のセルごとの結果."""
+
+    created: bool = Field(..., description="新規作成なら true、既存の実績の更新なら false")
+    record: RecordResponse = Field(..., description="更新後の実績")
+
+
+class RecordBatchUpsertResponse(BaseModel):
+    """実績一括更新レスポンス."""
+
+    results: list[RecordBatchResult] = Field(..., description="リクエストと同じ順のセルごとの結果")
@@ -0,0 +1,54 @@
+"""統計関連のスキーマ定義."""
+
+from datetime import date
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class StatsGranularity(str, Enum):
+    """統計の集計単位."""
+
+    WEEK = "week"
+    MONTH = "month"
+
+
+class StatsSummary(BaseModel):
+    """目標・実績の合計と達成率."""
+
+    target_units: float = Field(..., ge=0, description="目標ユニット数")
+    actual_units: float = Field(..., ge=0, description="実績ユニット数")
+    completion_rate: float | None = Field(None, description="達成率（%）。目標が0の場合はnull")
+
+
+class StatsPoint(StatsSummary):
+    """系列の 1 期間分."""
+
+    period_start: date = Field(..., description="期間の開始日（週: 週開始日、月: 月初日）")
+
+
+class StatsPeriod(StatsPoint):
+    """全タスク合計の 1 期間分."""
+
+    week_count: int = Field(..., ge=0, description="期間に含まれる週の数")
+
+
+class TaskStats(BaseModel):
+    """タスクごとの統計."""
+
+    task_id: str = Field(..., description="タスクID")
+    task_name: str = Field(..., description="タスク名")
+    is_archived: bool = Field(..., description="アーカイブ済みか")
+    summary: StatsSummary = Field(..., description="範囲全体の合計")
+    series: list[StatsPoint] = Field(..., description="期間ごとの値（periods と同じ順・同じ件数）")
+
+
+class StatsResponse(BaseModel):
+    """統計レスポンス."""
+
+    start_date: date = Field(..., description="集計範囲の開始日")
+    end_date: date = Field(..., description="集計範囲の終了日")
+    granularity: StatsGranularity = Field(..., description="集計単位")
+    summary: StatsSummary = Field(..., description="範囲全体・全タスクの合計")
+    periods: list[StatsPeriod] = Field(..., description="期間ごとの全タスク合計")
+    tasks: list[TaskStats] = Field(..., description="タスクごとの統計")
@@ -1,5 +1,6 @@
 """認証サービス（Google OAuth トークン交換・セッション発行）."""
 
+import asyncio
 import logging
 
 import httpx
@@ -9,15 +10,19 @@ from tasche.core.exceptions import InvalidAuthorizationCodeError
 from tasche.core.oauth import (
     build_google_authorize_url,
     exchange_code_for_token,
+    prefetch_google_signing_keys,
     verify_google_id_token,
 )
 from tasche.models.user import User
 from tasche.services.session import create_session
-from tasche.services.user import get_or_create_user_by_email, get_or_create_user_by_google_sub
+from tasche.services.user import get_or_create_user_by_email, upsert_google_user_with_session
 from tasche.services.week import ensure_current_week
 
 logger = logging.getLogger(__name__)
 
+# 交換失敗時に待たずに残した JWKS 取得タスク（完了前に GC されないよう参照を保持する）
+_background_tasks: set[asyncio.Task] = set()
+
 
 async def build_authorize_url(
     *,
@@ -41,6 +46,29 @@ async def build_authorize_url(
     return authorization_url, state
 
 
+async def _exchange_code_for_token(*, code: str, code_verifier: str, redirect_uri: str) -> dict:
+    """Google にトークン交換リクエストし、失敗は InvalidAuthorizationCodeError に変換する."""
+    try:
+        return await exchange_code_for_token(
+            code=code,
+            code_verifier=code_verifier,
+            redirect_uri=redirect_uri,
+        )
+    except httpx.HTTPStatusError as e:
+        logger.warning(
+            "Google token exchange HTTP error: status=%d body=%r",
+            e.response.status_code,
+            e.response.text[:200],
+        )
+        raise InvalidAuthorizationCodeError("Failed to exchange authorization code") from e
+    except httpx.RequestError as e:
+        logger.error("Google token exchange network error: %s", type(e).__name__)
+        raise InvalidAuthorizationCodeError("Failed to exchange authorization code") from e
+    except Exception as e:
+        logger.error("Google token exchange unexpected error: %s", type(e).__name__)
+        raise InvalidAuthorizationCodeError("Failed to exchange authorization code") from e
+
+
 async def handle_google_callback(
     db: AsyncSession,
     *,
@@ -57,26 +85,22 @@ async def handle_google_callback(
         InvalidAuthorizationCodeError: Google /token が 4xx / ID Token 検証失敗 / email_verified=false
     """
     logger.debug("handle_google_callback: start redirect_uri=%r", redirect_uri)
-    # Google にトークン交換リクエスト
+    # Google にトークン交換リクエスト。JWKS 未取得（コールドスタート）の場合は
+    # ID Token 検証用の公開鍵取得を並行して進め、直列 2 往復分の待ち時間を 1 往復分にする
+    prefetch = asyncio.create_task(prefetch_google_signing_keys())
     try:
-        token_response = await exchange_code_for_token(
+        token_response = await _exchange_code_for_token(
             code=code,
             code_verifier=code_verifier,
             redirect_uri=redirect_uri,
         )
-    except httpx.HTTPStatusError as e:
-        logger.warning(
-            "Google token exchange HTTP error: status=%d body=%r",
-            e.response.status_code,
-            e.response.text[:200],
-        )
-        raise InvalidAuthorizationCodeError("Failed to exchange authorization code") from e
-    except httpx.RequestError as e:
-        logger.error("Google token exchange network error: %s", type(e).__name__)
-        raise InvalidAuthorizationCodeError("Failed to exchange authorization code") from e
-    except Exception as e:
-        logger.error("Google token exchange unexpected error: %s", type(e).__name__)
-        raise InvalidAuthorizationCodeError("Failed to exchange authorization code") from e
+    except BaseException:
+        # 失敗時は JWKS 取得を待たずにエラーを返す。取得はバックグラウンドで完了させ、
+        # 次回の検証でキャッシュとして使う（prefetch は例外を送出しない）
+        _background_tasks.add(prefetch)
+        prefetch.add_done_callback(_background_tasks.discard)
+        raise
+    await prefetch
 
     logger.debug("handle_google_callback: token exchange succeeded")
     # ID Token を検証
@@ -87,25 +111,19 @@ async def handle_google_callback(
     claims = await verify_google_id_token(id_token)
     logger.debug("handle_google_callback: ID token verified sub=%r", claims.get("sub"))
 
-    # ユーザーを upsert
     google_sub = claims["sub"]
     email = claims.get("email", "")
     name = claims.get("name")
     picture = claims.get("picture")
 
-    user = await get_or_create_user_by_google_sub(
+    # ユーザー upsert・current week 保証・セッション発行（紐付け判定の SELECT + CTE 1 本）
+    user, raw_session_token = await upsert_google_user_with_session(
         db,
         google_sub=google_sub,
         email=email,
         name=name,
         picture=picture,
     )
-
-    # current week を保証する（新規登録ユーザーの場合は週レコードを作成）
-    await ensure_current_week(db, user)
-
-    # セッション発行
-    _session, raw_session_token = await create_session(db, user_id=user.id)
     logger.info("Google OAuth login succeeded: user_id=%s", user.id)
 
     return user, raw_session_token
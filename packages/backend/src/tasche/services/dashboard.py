@@ -1,17 +1,20 @@
 """ダッシュボード集計サービス."""
 
-from dataclasses import dataclass
-from datetime import datetime
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import date, datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from tasche.core.exceptions import WeekNotFoundException
 from tasche.models.enums import DayOfWeek
 from tasche.models.goal import Goal
 from tasche.models.record import Record
 from tasche.models.task import Task
 from tasche.models.user import User
+from tasche.models.week import Week
 from tasche.schemas.dashboard import (
     DailyData,
     DashboardResponse,
@@ -21,16 +24,15 @@ from tasche.schemas.dashboard import (
 )
 from tasche.services import record as record_service
 from tasche.services import week as week_service
+from tasche.services.dashboard_cache import (
+    DashboardCacheScope,
+    dashboard_cache_enabled,
+    get_dashboard_cache,
+)
 
 
-@dataclass
-class _WeeklyMatrixPayload:
-    task_name: str
-    created_at: datetime
-    daily_data: dict[DayOfWeek, DailyData]
-
-
-def _calculate_completion_rate(target_units: float, actual_units: float) -> float | None:
+def calculate_completion_rate(target_units: float, actual_units: float) -> float | None:
+    """達成率（%）を返す（目標が 0 の場合は None。services.stats と共通）."""
     if target_units == 0:
         return None
     return actual_units / target_units * 100
@@ -54,95 +56,97 @@ def _empty_daily_data() -> dict[DayOfWeek, DailyData]:
     }
 
 
-def _get_or_create_weekly_payload(
-    grouped: dict[str, _WeeklyMatrixPayload],
-    task: Task,
-) -> _WeeklyMatrixPayload:
-    if task.id not in grouped:
-        grouped[task.id] = _WeeklyMatrixPayload(
-            task_name=task.name,
-            created_at=task.created_at,
-            daily_data=_empty_daily_data(),
+def _build_dashboard_statement(*, user_id: str, start_date: date) -> Select:
+    """current week と、その週の (タスク, 曜日) ごとの目標・実績を 1 ステートメントで取得する.
+
+    goals と records を (task_id, day_of_week) で FULL OUTER JOIN し、マトリックスに
+    必要なスカラー列だけを返す。週はあるが目標・実績が無い場合も週の行を 1 行返すよう、
+    セル側は週に LEFT JOIN する。週が無い場合は 0 行。
+    """
+    week = (
+        select(
+            Week.id,
+            Week.user_id,
+            Week.start_date,
+            Week.end_date,
+            Week.unit_duration_minutes,
         )
-    return grouped[task.id]
-
-
-async def _fetch_goal_rows(
-    db: AsyncSession,
-    *,
-    week_id: str,
-    user_id: str,
-) -> list[tuple[Goal, Task]]:
-    result = await db.execute(
-        select(Goal, Task)
-        .join(Task, Task.id == Goal.task_id)
-        .where(
-            Goal.week_id == week_id,
-            Task.user_id == user_id,
-        )
-        .order_by(Task.created_at, Goal.day_of_week)
+        .where(Week.user_id == user_id, Week.start_date == start_date)
+        .cte("dashboard_week")
     )
-    return list(result.all())
-
-
-async def _fetch_record_rows(
-    db: AsyncSession,
-    *,
-    week_id: str,
-    user_id: str,
-) -> list[tuple[Record, Task]]:
-    result = await db.execute(
-        select(Record, Task)
-        .join(Task, Task.id == Record.task_id)
-        .where(
-            Record.week_id == week_id,
-            Task.user_id == user_id,
+    week_id = select(week.c.id).scalar_subquery()
+    goals = (
+        select(Goal.task_id, Goal.day_of_week, Goal.target_units)
+        .where(Goal.week_id == week_id)
+        .cte("dashboard_goals")
+    )
+    records = (
+        select(Record.task_id, Record.day_of_week, Record.actual_units)
+        .where(Record.week_id == week_id)
+        .cte("dashboard_records")
+    )
+    cells = (
+        select(
+            func.coalesce(goals.c.task_id, records.c.task_id).label("task_id"),
+            func.coalesce(goals.c.day_of_week, records.c.day_of_week).label("day_of_week"),
+            goals.c.target_units,
+            records.c.actual_units,
+        )
+        .select_from(
+            goals.join(
+                records,
+                and_(
+                    records.c.task_id == goals.c.task_id,
+                    records.c.day_of_week == goals.c.day_of_week,
+                ),
+                full=True,
+            )
         )
-        .order_by(Task.created_at, Record.day_of_week)
+        .cte("dashboard_cells")
     )
-    return list(result.all())
-
-
-def _build_weekly_matrix(
-    goal_rows: list[tuple[Goal, Task]],
-    record_rows: list[tuple[Record, Task]],
-) -> list[WeeklyMatrixItem]:
-    grouped: dict[str, _WeeklyMatrixPayload] = {}
-
-    for goal, task in goal_rows:
-        item = _get_or_create_weekly_payload(grouped, task)
-        day = DayOfWeek(goal.day_of_week)
-        daily_data = item.daily_data
-        current = daily_data[day]
-        daily_data[day] = DailyData(
-            target_units=float(goal.target_units),
-            actual_units=current.actual_units,
-            completion_rate=_calculate_completion_rate(
-                float(goal.target_units), current.actual_units
-            ),
+    return (
+        select(
+            week.c.id.label("week_id"),
+            week.c.start_date,
+            week.c.end_date,
+            week.c.unit_duration_minutes,
+            Task.id.label("task_id"),
+            Task.name.label("task_name"),
+            cells.c.day_of_week,
+            cells.c.target_units,
+            cells.c.actual_units,
         )
-
-    for record, task in record_rows:
-        item = _get_or_create_weekly_payload(grouped, task)
-        day = DayOfWeek(record.day_of_week)
-        daily_data = item.daily_data
-        current = daily_data[day]
-        daily_data[day] = DailyData(
-            target_units=current.target_units,
-            actual_units=float(record.actual_units),
-            completion_rate=_calculate_completion_rate(
-                current.target_units, float(record.actual_units)
-            ),
+        .select_from(
+            week.outerjoin(
+                cells.join(Task, Task.id == cells.c.task_id),
+                Task.user_id == week.c.user_id,
+            )
         )
+        .order_by(Task.created_at, Task.id, cells.c.day_of_week)
+    )
 
-    return [
-        WeeklyMatrixItem(
-            task_id=task_id,
-            task_name=payload.task_name,
-            daily_data=payload.daily_data,
+
+def _build_weekly_matrix(rows: Sequence[Row]) -> list[WeeklyMatrixItem]:
+    """タスクの作成順に並んだ (タスク, 曜日) 行をマトリックスにまとめる."""
+    matrix: dict[str, WeeklyMatrixItem] = {}
+    for row in rows:
+        if row.task_id is None:
+            continue
+        item = matrix.get(row.task_id)
+        if item is None:
+            item = matrix[row.task_id] = WeeklyMatrixItem(
+                task_id=row.task_id,
+                task_name=row.task_name,
+                daily_data=_empty_daily_data(),
+            )
+        target_units = float(row.target_units or 0.0)
+        actual_units = float(row.actual_units or 0.0)
+        item.daily_data[DayOfWeek(row.day_of_week)] = DailyData(
+            target_units=target_units,
+            actual_units=actual_units,
+            completion_rate=calculate_completion_rate(target_units, actual_units),
         )
-        for task_id, payload in sorted(grouped.items(), key=lambda item: item[1].created_at)
-    ]
+    return list(matrix.values())
 
 
 def _build_today_goals(
@@ -166,39 +170,73 @@ def _build_today_goals(
     return today_goals
 
 
+def _resolve_now(user: User, timezone_name: str | None) -> tuple[datetime, DashboardCacheScope]:
+    """現在のローカル時刻と、その時刻での集計範囲を返す."""
+    now = week_service.get_current_time_utc()
+    timezone = _get_zoneinfo(timezone_name or user.timezone)
+    local_now = now.astimezone(timezone)
+    start_date = week_service.calculate_current_week_start_date(
+        timezone_name=timezone.key,
+        now=now,
+    )
+    scope = DashboardCacheScope(
+        start_date=start_date, local_date=local_now.date(), timezone=timezone.key
+    )
+    return local_now, scope
+
+
+def get_dashboard_scope(user: User, *, timezone_name: str | None = None) -> DashboardCacheScope:
+    """現在時刻でのダッシュボードの集計範囲（週の開始日・ローカル日付・タイムゾーン）."""
+    return _resolve_now(user, timezone_name)[1]
+
+
 async def get_dashboard(
     db: AsyncSession,
     user: User,
     *,
     timezone_name: str | None = None,
+    data_version: str = "",
 ) -> DashboardResponse:
-    """現在週の目標・実績からダッシュボード表示用データを集計する."""
-    now = week_service.get_current_time_utc()
-    timezone = _get_zoneinfo(timezone_name or user.timezone)
-    local_now = now.astimezone(timezone)
+    """現在週の目標・実績からダッシュボード表示用データを集計する（DB 往復は 1 回）.
+
+    結果は (ユーザー, 週, ローカル日付, タイムゾーン, データの版) 単位でキャッシュする
+    （services.dashboard_cache 参照）。
+
+    Args:
+        data_version: services.data_version の版。ETag と同じ版を渡すと、他コンテナで
+            更新された後に古いキャッシュを返さない
+    """
+    local_now, scope = _resolve_now(user, timezone_name)
+    scope = replace(scope, data_version=data_version)
     current_day = _current_day_of_week(local_now)
+    use_cache = dashboard_cache_enabled()
+    if use_cache:
+        cached = await get_dashboard_cache().get(user.id, scope)
+        if cached is not None:
+            return cached
+
+    rows = (
+        await db.execute(_build_dashboard_statement(user_id=user.id, start_date=scope.start_date))
+    ).all()
     # ダッシュボードは current week 未作成時の 404 を維持する。
-    week = await week_service.get_current_week(
-        db,
-        user,
-        now=now,
-        timezone_name=timezone.key,
-    )
-
-    goal_rows = await _fetch_goal_rows(db, week_id=week.id, user_id=user.id)
-    record_rows = await _fetch_record_rows(db, week_id=week.id, user_id=user.id)
-    weekly_matrix = _build_weekly_matrix(goal_rows, record_rows)
+    if not rows:
+        raise WeekNotFoundException(user.id)
+    week = rows[0]
+    weekly_matrix = _build_weekly_matrix(rows)
 
-    return DashboardResponse(
+    dashboard = DashboardResponse(
         current_date=local_now.date(),
         current_day_of_week=current_day,
         week=WeekInfo(
-            id=week.id,
+            id=week.week_id,
             start_date=week.start_date,
             end_date=week.end_date,
             unit_duration_minutes=week.unit_duration_minutes,
         ),
         today_goals=_build_today_goals(weekly_matrix, current_day),
         weekly_matrix=weekly_matrix,
-        has_goals_configured=bool(goal_rows),
+        has_goals_configured=any(row.target_units is not None for row in rows),
     )
+    if use_cache:
+        await get_dashboard_cache().set(user.id, scope, dashboard)
+    return dashboard
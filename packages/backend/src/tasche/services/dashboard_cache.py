@@ -0,0 +1,251 @@
+"""ダッシュボード集計結果のキャッシュ.
+
+GET /api/dashboard は最も頻繁に呼ばれる画面だが、集計元（実績・目標・タスク名・
+タイムゾーン）が変わるのは更新系 API の実行時に限られる。そこで DashboardResponse を
+(ユーザー, 週の開始日, ローカル日付, タイムゾーン) 単位でキャッシュし、更新系サービスが
+invalidate_dashboard_cache でユーザー単位に無効化する（write-through invalidation）。
+
+バックエンドは DASHBOARD_CACHE_BACKEND で切り替える。
+
+- memory（既定）: プロセス内 LRU（core.cache.TTLCache）。ユーザーごとに 1 エントリ。
+  無効化は処理したコンテナにしか届かないため、他コンテナでの staleness の上限は
+  DASHBOARD_CACHE_TTL_SECONDS になる
+- redis: 複数コンテナで共有する（`redis` パッケージが必要）。ユーザーごとのバージョン
+  トークンをキーに含め、無効化はトークンの差し替え 1 回で済ませる。
+  接続先は DASHBOARD_CACHE_REDIS_URL
+
+GET /api/dashboard はスコープに条件付き GET と同じデータの版（services.data_version）を
+含める。他コンテナでの書き込みで版が変わった時点でエントリは一致しなくなるため、
+新しい ETag で古い本体を返すことはない。
+
+DASHBOARD_CACHE_TTL_SECONDS=0 でキャッシュを無効にする。
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Protocol
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from tasche.core.cache import CacheStats, TTLCache
+from tasche.core.config import settings
+from tasche.schemas.dashboard import DashboardResponse
+
+logger = logging.getLogger(__name__)
+
+# commit 後に無効化するユーザー ID を AsyncSession.info に積むキー
+_PENDING_INVALIDATIONS_KEY = "dashboard_cache_pending_user_ids"
+REDIS_KEY_PREFIX = "tasche:dashboard"
+
+
+@dataclass(frozen=True)
+class DashboardCacheScope:
+    """キャッシュしたレスポンスが有効な範囲（ユーザー以外の要素）.
+
+    data_version は集計時点のデータの版（ETag の元）。空の場合は版を問わず、
+    同じコンテナでの無効化と TTL だけで鮮度を保つ。
+    """
+
+    start_date: date
+    local_date: date
+    timezone: str
+    data_version: str = ""
+
+    def key(self) -> str:
+        return (
+            f"{self.start_date.isoformat()}:{self.local_date.isoformat()}:{self.timezone}"
+            f":{self.data_version}"
+        )
+
+
+class DashboardCacheBackend(Protocol):
+    """ダッシュボードキャッシュのバックエンド."""
+
+    async def get(self, user_id: str, scope: DashboardCacheScope) -> DashboardResponse | None: ...
+
+    async def set(
+        self, user_id: str, scope: DashboardCacheScope, dashboard: DashboardResponse
+    ) -> None: ...
+
+    async def invalidate(self, user_id: str) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+class InProcessDashboardCache:
+    """プロセス内 LRU バックエンド（ユーザーごとに最新の 1 件だけを保持する）."""
+
+    def __init__(self) -> None:
+        self._cache: TTLCache[str, tuple[DashboardCacheScope, DashboardResponse]] = TTLCache(
+            max_entries=lambda: settings.dashboard_cache_max_entries,
+            ttl_seconds=lambda: settings.dashboard_cache_ttl_seconds,
+        )
+
+    async def get(self, user_id: str, scope: DashboardCacheScope) -> DashboardResponse | None:
+        entry = self._cache.get(user_id)
+        if entry is None or entry[0] != scope:
+            return None
+        return entry[1]
+
+    async def set(
+        self, user_id: str, scope: DashboardCacheScope, dashboard: DashboardResponse
+    ) -> None:
+        self._cache.set(user_id, (scope, dashboard))
+
+    async def invalidate(self, user_id: str) -> None:
+        self._cache.invalidate(user_id)
+
+    async def aclose(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+class RedisDashboardCache:
+    """Redis 共有バックエンド.
+
+    エントリのキーにユーザーのバージョントークンを含める。無効化は新しいトークンを
+    書くだけで、旧トークンのエントリは参照されなくなり TTL で消える。トークンにも
+    TTL を付けるが、期限切れ後に使われる既定値 "0" のエントリは無効化時点で書かれた
+    ものなので、トークンの期限（無効化から TTL 後）までに消えている。
+    Redis の障害時はミスとして扱い、ダッシュボードの応答は止めない。
+    """
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisDashboardCache":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError(
+                "DASHBOARD_CACHE_BACKEND=redis requires the 'redis' package "
+                "(install with the 'redis' extra)"
+            ) from e
+        return cls(Redis.from_url(url))
+
+    @staticmethod
+    def _version_key(user_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}:version"
+
+    async def _entry_key(self, user_id: str, scope: DashboardCacheScope) -> str:
+        version = await self._client.get(self._version_key(user_id))
+        token = version.decode() if isinstance(version, bytes) else (version or "0")
+        return f"{REDIS_KEY_PREFIX}:{user_id}:{token}:{scope.key()}"
+
+    async def get(self, user_id: str, scope: DashboardCacheScope) -> DashboardResponse | None:
+        try:
+            payload = await self._client.get(await self._entry_key(user_id, scope))
+        except Exception:
+            logger.warning("Dashboard cache read failed", exc_info=True)
+            return None
+        if payload is None:
+            return None
+        return DashboardResponse.model_validate_json(payload)
+
+    async def set(
+        self, user_id: str, scope: DashboardCacheScope, dashboard: DashboardResponse
+    ) -> None:
+        try:
+            await self._client.set(
+                await self._entry_key(user_id, scope),
+                dashboard.model_dump_json(),
+                ex=settings.dashboard_cache_ttl_seconds,
+            )
+        except Exception:
+            logger.warning("Dashboard cache write failed", exc_info=True)
+
+    async def invalidate(self, user_id: str) -> None:
+        try:
+            await self._client.set(
+                self._version_key(user_id),
+                uuid4().hex,
+                ex=settings.dashboard_cache_ttl_seconds,
+            )
+        except Exception:
+            logger.warning(
+                "Dashboard cache invalidation failed: user_id=%s", user_id, exc_info=True
+            )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_backend: DashboardCacheBackend | None = None
+# commit 後の無効化タスク（完了前に GC されないよう参照を保持する）
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_dashboard_cache() -> DashboardCacheBackend:
+    """設定に応じたバックエンドを lazy 生成する."""
+    global _backend
+    if _backend is None:
+        if settings.dashboard_cache_backend == "redis":
+            _backend = RedisDashboardCache.from_url(settings.dashboard_cache_redis_url)
+        else:
+            _backend = InProcessDashboardCache()
+    return _backend
+
+
+def dashboard_cache_enabled() -> bool:
+    return settings.dashboard_cache_ttl_seconds > 0
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    user_ids = session.info.pop(_PENDING_INVALIDATIONS_KEY, set())
+    backend = get_dashboard_cache()
+    for user_id in user_ids:
+        task = asyncio.get_running_loop().create_task(backend.invalidate(user_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+
+
+async def invalidate_dashboard_cache(db: AsyncSession, user_id: str) -> None:
+    """ユーザーのダッシュボードキャッシュを無効化する（更新系サービスから呼ぶ）.
+
+    即時に無効化したうえで、commit 後にもう一度無効化する。commit 前に並行リクエストが
+    旧状態を集計して書き戻したエントリも、これで確実に捨てられる。
+    """
+    if not dashboard_cache_enabled():
+        return
+    await get_dashboard_cache().invalidate(user_id)
+
+    session = db.sync_session
+    session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(user_id)
+    if not event.contains(session, "after_commit", _invalidate_after_commit):
+        event.listen(session, "after_commit", _invalidate_after_commit)
+        event.listen(session, "after_rollback", _discard_pending)
+
+
+def get_dashboard_cache_stats() -> CacheStats | None:
+    """プロセス内バックエンドのヒット/ミス統計（redis バックエンドでは None）."""
+    backend = get_dashboard_cache()
+    if isinstance(backend, InProcessDashboardCache):
+        return backend.stats()
+    return None
+
+
+async def aclose_dashboard_cache() -> None:
+    """バックエンドを閉じる（lifespan の終了時に呼ぶ）."""
+    global _backend
+    if _backend is not None:
+        await _backend.aclose()
+    _backend = None
+
+
+def clear_dashboard_cache() -> None:
+    """プロセス内バックエンドを破棄する（テスト用）."""
+    global _backend
+    if isinstance(_backend, InProcessDashboardCache):
+        _backend = None
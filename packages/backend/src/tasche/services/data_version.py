@@ -0,0 +1,54 @@
+"""ユーザーデータの版（条件付き GET の ETag・ダッシュボードキャッシュのキーの元）.
+
+版は users.data_version のカウンタ。タスク・週・目標・実績を書き込むサービスが、
+同じトランザクション内で bump_user_data_version を呼んで 1 増やす。書き込みと版の
+更新は同時に commit されるため、commit 前の読み取りは古い版と古いデータを、
+commit 後の読み取りは新しい版と新しいデータを見る（時刻の比較と違い、トランザクションの
+開始順と commit 順が食い違っても版が据え置かれない）。読み取りは PK の 1 行で済む。
+"""
+
+from collections.abc import Collection
+
+from sqlalchemy import Select, Update, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.models.user import User
+
+UserIds = Collection[str] | Select
+
+
+def _build_bump_statement(user_ids: UserIds) -> Update:
+    # 版の更新はプロフィールの更新ではないため updated_at は据え置く
+    return (
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+    )
+
+
+async def bump_user_data_version(db: AsyncSession, user_id: str) -> None:
+    """ユーザーデータの版を 1 増やす（タスク・週・目標・実績を書き込んだサービスから呼ぶ）.
+
+    users の行をロックするため、ロールアップの更新（週の行のロック）より後に呼ぶこと
+    （ロックの順序を揃えてデッドロックを避ける）。commit は呼び出し側で行う。
+    """
+    await db.execute(_build_bump_statement([user_id]))
+
+
+async def bump_data_versions(db: AsyncSession, user_ids: UserIds) -> None:
+    """複数ユーザーの版をまとめて 1 増やす（ロールアップの再構築などの保守処理用）."""
+    await db.execute(_build_bump_statement(user_ids).execution_options(synchronize_session=False))
+
+
+async def get_user_data_version(db: AsyncSession, user: User) -> str:
+    """ユーザーデータの版を表す文字列を返す.
+
+    認証で読み込んだ User 行が db と同じセッション（プライマリ）のものであれば、その値を
+    使う（DB 往復なし）。リードレプリカで読む場合は、本体と同じレプリカから PK で読み直す
+    （レプリカの遅延中に、プライマリの新しい版で古い本体を返さないため）。
+    """
+    state = inspect(user)
+    if state.session is db.sync_session and "data_version" not in state.unloaded:
+        return str(user.data_version)
+    version = await db.scalar(select(User.data_version).where(User.id == user.id))
+    return str(version)
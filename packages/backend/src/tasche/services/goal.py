@@ -23,7 +23,10 @@ from tasche.schemas.goal import (
     GoalsUpdateResponse,
     PreviousGoalsResponse,
 )
+from tasche.services.dashboard_cache import invalidate_dashboard_cache
+from tasche.services.data_version import bump_user_data_version
 from tasche.services.record import DAY_OF_WEEK_FIELD_NAMES, DAY_OF_WEEK_ORDER
+from tasche.services.rollup import refresh_week_rollups
 from tasche.services.week import ensure_current_week
 
 logger = logging.getLogger(__name__)
@@ -287,6 +290,10 @@ async def replace_current_goals(
         )
 
     await db.flush()
+    # 置き換えで消えたタスクの行も削除されるよう、週全体を集計し直す
+    await refresh_week_rollups(db, week.id)
+    await bump_user_data_version(db, user.id)
+    await invalidate_dashboard_cache(db, user.id)
 
     return GoalsUpdateResponse(
         week_id=week.id,
@@ -1,19 +1,26 @@
 """実績サービス."""
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, literal_column, select, true
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from ulid import ULID
 
-from tasche.core.exceptions import TaskNotFoundException
+from tasche.core.exceptions import TaskNotFoundException, ValidationError, WeekNotFoundException
 from tasche.models.enums import DayOfWeek
 from tasche.models.record import Record
 from tasche.models.task import Task
 from tasche.models.user import User
-from tasche.schemas.record import DailyActuals, RecordItem, RecordsResponse
+from tasche.models.week import Week
+from tasche.schemas.record import DailyActuals, RecordBatchItem, RecordItem, RecordsResponse
 from tasche.services import week as week_service
+from tasche.services.dashboard_cache import invalidate_dashboard_cache
+from tasche.services.data_version import bump_user_data_version
+from tasche.services.rollup import refresh_week_rollups
 from tasche.services.week import (
     DEFAULT_TIMEZONE,
     DEFAULT_WEEK_START_DAY,
@@ -120,6 +127,14 @@ async def list_current_records(
     )
 
 
+def _on_conflict_update_actual_units(stmt: Insert) -> Insert:
+    """uq_records_week_task_day の衝突時は実績値を更新し、行と新規作成フラグを返す."""
+    return stmt.on_conflict_do_update(
+        constraint="uq_records_week_task_day",
+        set_={"actual_units": stmt.excluded.actual_units, "updated_at": func.now()},
+    ).returning(Record, literal_column("xmax = 0").label("created"))
+
+
 async def upsert_current_record(
     db: AsyncSession,
     user: User,
@@ -128,48 +143,142 @@ async def upsert_current_record(
     day_of_week: DayOfWeek,
     actual_units: float,
     now: datetime | None = None,
-    flush_record: bool = True,
-    refresh_record: bool = True,
 ) -> tuple[Record, str, bool]:
-    """現在の週の実績を作成または更新する."""
-    task_result = await db.execute(
-        select(Task).where(
+    """現在の週の実績を作成または更新する（DB 往復は upsert・ロールアップ更新・版の更新の 4 回）.
+
+    active タスクと current week の確認を CTE にまとめ、
+    `INSERT ... SELECT ... ON CONFLICT DO UPDATE ... RETURNING` の 1 ステートメントで
+    書き込む。並行した同一セルへの書き込みも一意制約の上で upsert されるため競合しない。
+    新規作成かどうかは RETURNING の `xmax = 0`（挿入された行）で判定する。
+
+    Raises:
+        TaskNotFoundException: 未知・他ユーザー・アーカイブ済みのタスク
+        WeekNotFoundException: current week 未作成（実績 API は 404 を維持する）
+    """
+    start_date = week_service.get_current_week_start_date(user, now=now)
+    task = (
+        select(Task.id, Task.name)
+        .where(
             Task.id == task_id,
             Task.user_id == user.id,
             Task.is_archived.is_(False),
         )
+        .cte("upsert_task")
+    )
+    week = (
+        select(Week.id)
+        .where(Week.user_id == user.id, Week.start_date == start_date)
+        .cte("upsert_week")
     )
-    task = task_result.scalar_one_or_none()
-    if task is None:
+    upserted = _on_conflict_update_actual_units(
+        pg_insert(Record).from_select(
+            ["id", "week_id", "task_id", "day_of_week", "actual_units"],
+            select(
+                literal(_generate_record_id()),
+                week.c.id,
+                task.c.id,
+                literal(day_of_week, Record.day_of_week.type),
+                literal(actual_units, Record.actual_units.type),
+            ).select_from(task.join(week, true())),
+        )
+    ).cte("upserted_record")
+    upserted_record = aliased(Record, upserted)
+
+    # タスクが無ければ 0 行、週が無ければ（INSERT されないため）実績が NULL の 1 行
+    row = (
+        await db.execute(
+            select(task.c.name, upserted_record, upserted.c.created)
+            .select_from(task.outerjoin(upserted, true()))
+            .execution_options(populate_existing=True)
+        )
+    ).one_or_none()
+    if row is None:
         raise TaskNotFoundException(task_id)
+    task_name, record, created = row
+    if record is None:
+        raise WeekNotFoundException(user.id)
 
-    # 実績 API は current week 未作成時の 404 を維持する。
-    week = await week_service.get_current_week(db, user, now=now)
-    record_result = await db.execute(
-        select(Record).where(
-            Record.week_id == week.id,
-            Record.task_id == task.id,
-            Record.day_of_week == day_of_week,
+    await refresh_week_rollups(db, record.week_id, task_ids=[record.task_id])
+    await bump_user_data_version(db, user.id)
+    await invalidate_dashboard_cache(db, user.id)
+    return record, task_name, created
+
+
+def _validate_batch_cells(cells: Sequence[RecordBatchItem]) -> None:
+    seen: set[tuple[str, DayOfWeek]] = set()
+    for cell in cells:
+        key = (cell.task_id, cell.day_of_week)
+        if key in seen:
+            raise ValidationError("duplicate task_id and day_of_week is not allowed")
+        seen.add(key)
+
+
+async def _get_active_task_names(
+    db: AsyncSession, user: User, task_ids: set[str]
+) -> dict[str, str]:
+    """自分の active タスクの名前を 1 回の IN クエリで取得する（欠けていれば 404）."""
+    result = await db.execute(
+        select(Task.id, Task.name).where(
+            Task.id.in_(task_ids),
+            Task.user_id == user.id,
+            Task.is_archived.is_(False),
         )
     )
-    record = record_result.scalar_one_or_none()
-    created = record is None
+    task_names = {row.id: row.name for row in result}
+    for task_id in task_ids:
+        if task_id not in task_names:
+            raise TaskNotFoundException(task_id)
+    return task_names
 
-    if record is None:
-        record = Record(
-            id=_generate_record_id(),
-            week_id=week.id,
-            task_id=task.id,
-            day_of_week=day_of_week,
-            actual_units=actual_units,
-        )
-        db.add(record)
-    else:
-        record.actual_units = actual_units
 
-    if flush_record or refresh_record:
-        await db.flush()
-    if refresh_record:
-        await db.refresh(record)
+async def upsert_current_records(
+    db: AsyncSession,
+    user: User,
+    cells: Sequence[RecordBatchItem],
+    *,
+    now: datetime | None = None,
+) -> list[tuple[Record, str, bool]]:
+    """現在の週の実績を複数セルまとめて作成または更新する.
+
+    タスクの所有確認を IN クエリ 1 回、書き込みを
+    `INSERT ... ON CONFLICT (week_id, task_id, day_of_week) DO UPDATE ... RETURNING`
+    1 回で行い、続けて書き込んだタスクのロールアップ（週のロックと集計し直しの 2 回）と
+    ユーザーデータの版を更新する。新規作成かどうかは RETURNING の `xmax = 0`（挿入された行）で判定する。
+    未知・他ユーザー・アーカイブ済みのタスクが 1 つでもあれば何も書き込まずに 404、
+    current week 未作成時も 404。
+
+    Returns:
+        cells と同じ順の (実績, タスク名, 新規作成か) の一覧
+    """
+    _validate_batch_cells(cells)
+    week = await week_service.get_current_week(db, user, now=now)
+    task_names = await _get_active_task_names(db, user, {cell.task_id for cell in cells})
+
+    stmt = _on_conflict_update_actual_units(
+        pg_insert(Record).values(
+            [
+                {
+                    "id": _generate_record_id(),
+                    "week_id": week.id,
+                    "task_id": cell.task_id,
+                    "day_of_week": cell.day_of_week,
+                    "actual_units": cell.actual_units,
+                }
+                for cell in cells
+            ]
+        )
+    )
+    result = await db.execute(stmt.execution_options(populate_existing=True))
+    upserted = {
+        (record.task_id, DayOfWeek(record.day_of_week)): (record, created)
+        for record, created in result
+    }
+    await refresh_week_rollups(db, week.id, task_ids=task_names.keys())
+    await bump_user_data_version(db, user.id)
+    await invalidate_dashboard_cache(db, user.id)
 
-    return record, task.name, created
+    results: list[tuple[Record, str, bool]] = []
+    for cell in cells:
+        record, created = upserted[(cell.task_id, cell.day_of_week)]
+        results.append((record, task_names[cell.task_id], created))
+    return results
@@ -0,0 +1,211 @@
+"""週次ロールアップ（week_task_rollups）の更新・再構築サービス.
+
+ロールアップは goals / records の合計を (週, タスク) 単位で保持する導出データ。
+週の合計は services.stats が GROUPING SETS で同じ走査から求めるため、別テーブルには持たない。
+目標・実績を書き込むサービスが、同じトランザクション内で refresh_week_rollups を呼ぶ。
+更新は差分の加算ではなく、対象範囲を goals / records から集計し直して upsert する
+（書き込みのたびに対象行が自己修復される）。集計し直す前に対象の週の行を
+`SELECT ... FOR UPDATE` でロックし、同じ週への並行書き込みを直列化する。ロックを
+待った側の集計は先に commit した書き込みを含むため、古い合計で上書きすることはない。並行書き込みなどでずれが残った場合は
+rebuild_rollups（scripts/rebuild_rollups.py）で全体を照合・修正する。
+"""
+
+import logging
+import time
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from sqlalchemy import Select, and_, delete, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.models.goal import Goal
+from tasche.models.record import Record
+from tasche.models.rollup import WeekTaskRollup
+from tasche.models.week import Week
+from tasche.services.data_version import bump_data_versions
+
+logger = logging.getLogger(__name__)
+
+WeekIds = Collection[str] | Select
+
+
+@dataclass(frozen=True)
+class RollupRefreshResult:
+    """ロールアップ更新の結果（値が変わった行数）."""
+
+    task_rows_upserted: int
+    task_rows_deleted: int
+
+    @property
+    def changed(self) -> int:
+        return self.task_rows_upserted + self.task_rows_deleted
+
+
+@dataclass(frozen=True)
+class RollupRebuildResult:
+    """rebuild_rollups の実行結果."""
+
+    refresh: RollupRefreshResult
+    elapsed_seconds: float
+
+
+def _build_refresh_statement(week_ids: WeekIds, task_ids: Collection[str] | None) -> Select:
+    """対象範囲のロールアップを goals / records から集計し直す 1 ステートメントを組み立てる.
+
+    - 目標・実績のどちらかがあれば upsert、どちらも無くなった行は削除
+    - 値が変わらない行は更新しない（RETURNING の件数 = ずれていた・変わった行数）
+
+    Args:
+        week_ids: 対象の週 ID（一覧または週 ID を返す SELECT）
+        task_ids: 対象タスク。None なら対象週の全タスク
+    """
+    goal_filter = [Goal.week_id.in_(week_ids)]
+    record_filter = [Record.week_id.in_(week_ids)]
+    stale_filter = [WeekTaskRollup.week_id.in_(week_ids)]
+    if task_ids is not None:
+        goal_filter.append(Goal.task_id.in_(task_ids))
+        record_filter.append(Record.task_id.in_(task_ids))
+        stale_filter.append(WeekTaskRollup.task_id.in_(task_ids))
+
+    goal_sums = (
+        select(Goal.week_id, Goal.task_id, func.sum(Goal.target_units).label("target_units"))
+        .where(*goal_filter)
+        .group_by(Goal.week_id, Goal.task_id)
+        .cte("rollup_goal_sums")
+    )
+    record_sums = (
+        select(Record.week_id, Record.task_id, func.sum(Record.actual_units).label("actual_units"))
+        .where(*record_filter)
+        .group_by(Record.week_id, Record.task_id)
+        .cte("rollup_record_sums")
+    )
+    task_sums = (
+        select(
+            func.coalesce(goal_sums.c.week_id, record_sums.c.week_id).label("week_id"),
+            func.coalesce(goal_sums.c.task_id, record_sums.c.task_id).label("task_id"),
+            func.coalesce(goal_sums.c.target_units, 0).label("target_units"),
+            func.coalesce(record_sums.c.actual_units, 0).label("actual_units"),
+        )
+        .select_from(
+            goal_sums.join(
+                record_sums,
+                and_(
+                    record_sums.c.week_id == goal_sums.c.week_id,
+                    record_sums.c.task_id == goal_sums.c.task_id,
+                ),
+                full=True,
+            )
+        )
+        .cte("rollup_task_sums")
+    )
+
+    task_insert = pg_insert(WeekTaskRollup).from_select(
+        ["week_id", "task_id", "target_units", "actual_units"],
+        select(
+            task_sums.c.week_id,
+            task_sums.c.task_id,
+            task_sums.c.target_units,
+            task_sums.c.actual_units,
+        ),
+    )
+    upserted_tasks = (
+        task_insert.on_conflict_do_update(
+            index_elements=[WeekTaskRollup.week_id, WeekTaskRollup.task_id],
+            set_={
+                "target_units": task_insert.excluded.target_units,
+                "actual_units": task_insert.excluded.actual_units,
+                "updated_at": func.now(),
+            },
+            where=or_(
+                WeekTaskRollup.target_units.is_distinct_from(task_insert.excluded.target_units),
+                WeekTaskRollup.actual_units.is_distinct_from(task_insert.excluded.actual_units),
+            ),
+        )
+        .returning(WeekTaskRollup.week_id)
+        .cte("rollup_upserted_tasks")
+    )
+    deleted_tasks = (
+        delete(WeekTaskRollup)
+        .where(
+            *stale_filter,
+            tuple_(WeekTaskRollup.week_id, WeekTaskRollup.task_id).not_in(
+                select(task_sums.c.week_id, task_sums.c.task_id)
+            ),
+        )
+        .returning(WeekTaskRollup.week_id)
+        .cte("rollup_deleted_tasks")
+    )
+
+    return select(
+        select(func.count()).select_from(upserted_tasks).scalar_subquery(),
+        select(func.count()).select_from(deleted_tasks).scalar_subquery(),
+    )
+
+
+def _build_lock_statement(week_ids: WeekIds) -> Select:
+    """対象の週の行をロックする（デッドロックを避けるため ID 順）.
+
+    READ COMMITTED ではステートメントごとにスナップショットを取り直すため、ロックの後に
+    発行する集計は、ロックを待っている間に commit された書き込みを含む。
+    """
+    return select(Week.id).where(Week.id.in_(week_ids)).order_by(Week.id).with_for_update()
+
+
+async def _refresh(
+    db: AsyncSession, week_ids: WeekIds, task_ids: Collection[str] | None
+) -> RollupRefreshResult:
+    await db.execute(_build_lock_statement(week_ids))
+    row = (await db.execute(_build_refresh_statement(week_ids, task_ids))).one()
+    return RollupRefreshResult(task_rows_upserted=row[0], task_rows_deleted=row[1])
+
+
+async def refresh_week_rollups(
+    db: AsyncSession,
+    week_id: str,
+    *,
+    task_ids: Collection[str] | None = None,
+) -> RollupRefreshResult:
+    """1 週分のロールアップを更新する（目標・実績を書き込んだサービスから呼ぶ）.
+
+    書き込みの後（flush 済みの状態）で呼ぶこと。週の行のロックと集計し直しの
+    2 ステートメントを発行し、ロックは commit まで保持する。commit は呼び出し側で行う。
+
+    Args:
+        db: DBセッション
+        week_id: 対象の週
+        task_ids: 書き込んだタスク。None なら週の全タスク（目標の置き換えなど）
+    """
+    return await _refresh(db, [week_id], task_ids)
+
+
+async def rebuild_rollups(db: AsyncSession, *, user_id: str | None = None) -> RollupRebuildResult:
+    """ロールアップ全体を goals / records と照合して修正する（バックフィル兼用）.
+
+    対象の週をすべてロックしてから、集合演算の 1 ステートメントで全週を処理する
+    （実行中は対象の週への書き込みが待たされる）。ずれを修正した場合は、統計の ETag が
+    変わるよう対象ユーザーのデータの版を上げる。commit は呼び出し側で行う。
+
+    Args:
+        db: DBセッション
+        user_id: 指定時はそのユーザーの週のみ
+
+    Returns:
+        修正した行数と所要時間
+    """
+    started = time.perf_counter()
+    week_ids = select(Week.id)
+    if user_id is not None:
+        week_ids = week_ids.where(Week.user_id == user_id)
+
+    refresh = await _refresh(db, week_ids, None)
+    if refresh.changed:
+        await bump_data_versions(db, [user_id] if user_id is not None else select(Week.user_id))
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Rollups rebuilt: task_upserted=%d task_deleted=%d elapsed=%.3fs",
+        refresh.task_rows_upserted,
+        refresh.task_rows_deleted,
+        elapsed,
+    )
+    return RollupRebuildResult(refresh=refresh, elapsed_seconds=elapsed)
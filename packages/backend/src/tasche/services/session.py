@@ -1,33 +1,183 @@
-"""セッション管理サービス（発行/検証/revoke/スライディング延長）."""
+"""セッション管理サービス（発行/検証/revoke/スライディング延長）.
 
+セッショントークンは `<session_id>.<exp>.<secret>.<signature>` 形式の自己検証トークン。
+signature は SESSION_TOKEN_SECRET による HMAC-SHA256 で、形式不正・改ざん・期限切れの
+トークンは DB に問い合わせる前に CPU のみで拒否する。鍵のローテーション中は
+SESSION_TOKEN_PREVIOUS_SECRETS の旧鍵による署名も受け付ける。DB（sessions.token_hash）には
+secret 部分の SHA-256 のみを保存するため、exp を更新して Cookie を再発行しても
+token_hash は変わらない。revoke とスライディング延長の判定は従来通り DB の値で行う。
+"""
+
+import base64
 import hashlib
+import hmac
 import logging
+import re
 import secrets
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, literal_column, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
+from tasche.core.cache import CacheStats, TTLCache
 from tasche.core.config import settings
 from tasche.models.session import Session
+from tasche.models.user import User
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """検証に必要なセッション行のスナップショット（キャッシュ格納用）."""
+
+    id: str
+    user_id: str
+    expires_at: datetime
+    revoked: bool
+
+
+# token_hash → SessionSnapshot。ウォームなリクエストで sessions への問い合わせを省く。
+# revoke は同一プロセス内では即時に無効化し、他プロセスでは TTL 経過までに反映される。
+_session_cache: TTLCache[str, SessionSnapshot] = TTLCache(
+    max_entries=lambda: settings.session_cache_max_entries,
+    ttl_seconds=lambda: settings.session_cache_ttl_seconds,
+)
+
+
+def get_session_cache_stats() -> CacheStats:
+    """セッション検証キャッシュのヒット/ミス統計を返す."""
+    return _session_cache.stats()
+
+
+def clear_session_cache() -> None:
+    """セッション検証キャッシュを空にする（テスト・運用時の強制無効化用）."""
+    _session_cache.clear()
+
+
 def _generate_session_id() -> str:
     """ULID形式のセッションIDを生成する（ses_ プレフィックス付き）."""
     return f"ses_{ULID()}"
 
 
+# 署名導入前に発行した不透明トークン（secrets.token_urlsafe(48)）。
+# 有効期限（SESSION_EXPIRES_SECONDS）が経過して既存セッションが失効したら削除できる。
+_LEGACY_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{64}")
+
+
+@dataclass(frozen=True)
+class _TokenParts:
+    """署名検証済みトークンの構成要素（レガシートークンは session_id が None）."""
+
+    session_id: str | None
+    secret: str
+
+
+def _token_secret(raw_token: str) -> str:
+    """DB 照合に使う secret 部分を取り出す（レガシートークンは全体）."""
+    parts = raw_token.split(".")
+    if len(parts) == 4:
+        return parts[2]
+    return raw_token
+
+
 def _hash_token(raw_token: str) -> str:
-    """トークンをSHA-256でハッシュ化する."""
-    return hashlib.sha256(raw_token.encode()).hexdigest()
+    """トークンの secret 部分をSHA-256でハッシュ化する."""
+    return hashlib.sha256(_token_secret(raw_token).encode()).hexdigest()
+
+
+def _sign(payload: str, key: str | None = None) -> str:
+    """payload に署名する（key 省略時は現在の鍵）."""
+    digest = hmac.new(
+        (key or settings.session_token_secret).encode(), payload.encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _sign_token(session_id: str, expires_at: datetime, secret: str) -> str:
+    """session_id / 有効期限 / secret に署名してトークン文字列を組み立てる."""
+    payload = f"{session_id}.{int(expires_at.timestamp())}.{secret}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def _issue_raw_token(session_id: str, expires_at: datetime) -> str:
+    """新しい secret を生成し、署名付きセッショントークンを発行する."""
+    return _sign_token(session_id, expires_at, secrets.token_urlsafe(32))
+
+
+def _verify_token(raw_token: str, now: datetime) -> _TokenParts | None:
+    """トークンの形式・署名・有効期限を DB を使わずに検証する.
+
+    Returns:
+        検証済みの構成要素。形式不正・署名不一致・期限切れの場合は None
+    """
+    parts = raw_token.split(".")
+    if len(parts) == 1:
+        if _LEGACY_TOKEN_PATTERN.fullmatch(raw_token):
+            return _TokenParts(session_id=None, secret=raw_token)
+        return None
+    if len(parts) != 4:
+        return None
+
+    session_id, exp, secret, signature = parts
+    payload = f"{session_id}.{exp}.{secret}"
+    # 現在の鍵、旧鍵の順に試す（ローテーション前に発行されたトークンも受け付ける）
+    if not any(
+        hmac.compare_digest(signature, _sign(payload, key))
+        for key in settings.session_token_verification_secrets
+    ):
+        return None
+    if not exp.isdigit() or int(exp) <= now.timestamp():
+        return None
+    return _TokenParts(session_id=session_id, secret=secret)
+
+
+def reissue_session_token(raw_token: str, expires_at: datetime) -> str:
+    """スライディング延長後の有効期限でトークンを再署名する.
+
+    secret は変えないため token_hash の更新は不要。署名は常に現在の鍵で行うため、
+    旧鍵で署名されたトークンは延長時に新しい鍵へ移行する。レガシートークンはそのまま返す。
+    """
+    parts = raw_token.split(".")
+    if len(parts) != 4:
+        return raw_token
+    return _sign_token(parts[0], expires_at, parts[2])
+
+
+def _as_utc(value: datetime) -> datetime:
+    """timezone-naive な値を UTC として扱う（PostgreSQL では aware だが念のため補正）."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
 
+@dataclass(frozen=True)
+class NewSession:
+    """DB に書き込む前のセッション値と、Cookie に設定する生トークン."""
 
-def _generate_raw_token() -> str:
-    """不透明なセッショントークンを生成する."""
-    return secrets.token_urlsafe(48)
+    id: str
+    token_hash: str
+    expires_at: datetime
+    raw_token: str
+
+
+def new_session() -> NewSession:
+    """セッション ID・有効期限・署名付きトークンを生成する（DB には書き込まない）.
+
+    INSERT を他のステートメント（ログイン時の CTE 等）に組み込む呼び出し側向け。
+    """
+    session_id = _generate_session_id()
+    expires_at = datetime.now(tz=timezone.utc) + timedelta(seconds=settings.session_expires_seconds)
+    raw_token = _issue_raw_token(session_id, expires_at)
+    return NewSession(
+        id=session_id,
+        token_hash=_hash_token(raw_token),
+        expires_at=expires_at,
+        raw_token=raw_token,
+    )
 
 
 async def create_session(
@@ -40,75 +190,153 @@ async def create_session(
     Returns:
         (Session, raw_token) - raw_token は Cookie に設定する生トークン
     """
-    raw_token = _generate_raw_token()
-    token_hash = _hash_token(raw_token)
-    session_id = _generate_session_id()
-    expires_at = datetime.now(tz=timezone.utc) + timedelta(seconds=settings.session_expires_seconds)
-
+    values = new_session()
     session = Session(
-        id=session_id,
+        id=values.id,
         user_id=user_id,
-        token_hash=token_hash,
-        expires_at=expires_at,
+        token_hash=values.token_hash,
+        expires_at=values.expires_at,
         revoked_at=None,
     )
     db.add(session)
     await db.flush()  # ID を確定させるためにフラッシュ（commit は呼び出し側で行う）
 
-    return session, raw_token
+    return session, values.raw_token
 
 
-async def validate_session(
-    db: AsyncSession,
-    raw_token: str,
-) -> tuple[Session | None, bool]:
-    """セッショントークンを検証し、スライディング延長を行う.
+def _snapshot_from_row(row) -> SessionSnapshot:
+    return SessionSnapshot(
+        id=row.id,
+        user_id=row.user_id,
+        expires_at=_as_utc(row.expires_at),
+        revoked=row.revoked_at is not None,
+    )
 
-    Args:
-        db: DBセッション
-        raw_token: Cookie から取得した生トークン
 
-    Returns:
-        (Session | None, bool) - Session が None の場合は無効。bool は延長が発生したか。
+async def _load_snapshot(
+    db: AsyncSession,
+    token_hash: str,
+    *,
+    with_user: bool,
+) -> tuple[SessionSnapshot | None, User | None]:
+    """sessions から token_hash に一致する行を読み、スナップショットにする.
+
+    with_user=True の場合は users を JOIN して同一ステートメントで User も取得する。
     """
-    token_hash = _hash_token(raw_token)
+    stmt = select(Session.id, Session.user_id, Session.expires_at, Session.revoked_at)
+    if with_user:
+        stmt = stmt.add_columns(User).join(User, User.id == Session.user_id)
+    result = await db.execute(stmt.where(Session.token_hash == token_hash))
+    row = result.one_or_none()
+    if row is None:
+        return None, None
+
+    return _snapshot_from_row(row), row.User if with_user else None
+
+
+async def _validate(
+    db: AsyncSession,
+    raw_token: str,
+    *,
+    with_user: bool,
+) -> tuple[SessionSnapshot | None, User | None, bool]:
+    """validate_session / validate_session_with_user の共通実装."""
     now = datetime.now(tz=timezone.utc)
+    token = _verify_token(raw_token, now)
+    if token is None:
+        return None, None, False
 
-    result = await db.execute(select(Session).where(Session.token_hash == token_hash))
-    session = result.scalar_one_or_none()
+    token_hash = _hash_token(token.secret)
+    half_lifetime = timedelta(seconds=settings.session_expires_seconds // 2)
 
-    if session is None:
-        return None, False
+    snapshot = _session_cache.get(token_hash)
+    if snapshot is not None:
+        # 署名内の session_id と行の id が食い違うトークンは拒否する（レガシーは検査不可）
+        if token.session_id not in (None, snapshot.id):
+            return None, None, False
+        if snapshot.revoked or snapshot.expires_at <= now:
+            return None, None, False
+        if snapshot.expires_at - now >= half_lifetime:
+            user = await db.get(User, snapshot.user_id) if with_user else None
+            return snapshot, user, False
+        # 延長が必要な場合は DB の最新状態を見てから判断する
+        _session_cache.invalidate(token_hash)
+
+    snapshot, user = await _load_snapshot(db, token_hash, with_user=with_user)
+    if snapshot is None or token.session_id not in (None, snapshot.id):
+        return None, None, False
+
+    _session_cache.set(token_hash, snapshot)
 
     # revoked チェック
-    if session.revoked_at is not None:
+    if snapshot.revoked:
         logger.warning(
             "Revoked session access attempt: session_id=%s user_id=%s",
-            session.id,
-            session.user_id,
+            snapshot.id,
+            snapshot.user_id,
         )
-        return None, False
+        return None, None, False
 
-    # 期限切れチェック（PostgreSQL では timezone-aware だが念のため補正）
-    expires_at = session.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-    if expires_at <= now:
-        return None, False
+    # 期限切れチェック
+    if snapshot.expires_at <= now:
+        return None, None, False
 
     # スライディング延長判定: 残存時間 < 有効期限の半分 なら延長
-    remaining = expires_at - now
-    half_lifetime = timedelta(seconds=settings.session_expires_seconds // 2)
-    extended = False
+    if snapshot.expires_at - now >= half_lifetime:
+        return snapshot, user, False
+
+    # 延長は 1 ステートメントで書き込む（commit は呼び出し側。core/security.py 参照）。
+    # revoke 済みは延長せず、並行リクエストが先に延長していても期限を短縮しない。
+    # キャッシュには載せない: commit に失敗した場合も、次回は DB の値を読んで再度延長する
+    new_expires_at = now + timedelta(seconds=settings.session_expires_seconds)
+    await db.execute(
+        update(Session)
+        .where(Session.id == snapshot.id, Session.revoked_at.is_(None))
+        .values(expires_at=func.greatest(Session.expires_at, new_expires_at))
+        .execution_options(synchronize_session=False)
+    )
+    _session_cache.invalidate(token_hash)
+    snapshot = replace(snapshot, expires_at=new_expires_at)
+    logger.debug("Session extended: session_id=%s", snapshot.id)
 
-    if remaining < half_lifetime:
-        new_expires_at = now + timedelta(seconds=settings.session_expires_seconds)
-        session.expires_at = new_expires_at
-        await db.flush()
-        extended = True
-        logger.debug("Session extended: session_id=%s", session.id)
+    return snapshot, user, True
+
+
+async def validate_session(
+    db: AsyncSession,
+    raw_token: str,
+) -> tuple[SessionSnapshot | None, bool]:
+    """セッショントークンを検証し、スライディング延長を行う.
+
+    形式不正・署名不一致・期限切れのトークンは DB に問い合わせずに拒否する。
+    プロセス内キャッシュにスナップショットがあり延長も不要な場合も DB に問い合わせない。
+    延長が必要な場合は expires_at を UPDATE する（commit は呼び出し側で行う）。
+
+    Args:
+        db: DBセッション
+        raw_token: Cookie から取得した生トークン
+
+    Returns:
+        (SessionSnapshot | None, bool) - None の場合は無効。bool は延長が発生したか。
+    """
+    snapshot, _user, extended = await _validate(db, raw_token, with_user=False)
+    return snapshot, extended
+
+
+async def validate_session_with_user(
+    db: AsyncSession,
+    raw_token: str,
+) -> tuple[SessionSnapshot | None, User | None, bool]:
+    """セッショントークンを検証し、所有ユーザーも合わせて返す.
 
-    return session, extended
+    キャッシュミス時は sessions と users を 1 ステートメントで JOIN して取得するため、
+    認証済みユーザー解決は 1 往復で済む（キャッシュヒット時は users の主キー参照のみ）。
+
+    Returns:
+        (SessionSnapshot | None, User | None, bool) - Session が None の場合は無効。
+        User はキャッシュヒット後にユーザーが削除されていた場合のみ None になりうる。
+    """
+    return await _validate(db, raw_token, with_user=True)
 
 
 async def revoke_session(
@@ -118,11 +346,13 @@ async def revoke_session(
     """セッションを revoke する.
 
     None が渡された場合は何もしない（Cookie が無い場合の logout に対応）。
+    プロセス内キャッシュのエントリも即時に無効化する。
     """
     if raw_token is None:
         return
 
     token_hash = _hash_token(raw_token)
+    _session_cache.invalidate(token_hash)
     now = datetime.now(tz=timezone.utc)
 
     result = await db.execute(select(Session).where(Session.token_hash == token_hash))
@@ -131,4 +361,124 @@ async def revoke_session(
     if session and session.revoked_at is None:
         session.revoked_at = now
         await db.flush()
+        # commit 前に並行リクエストが旧状態を再キャッシュしないよう revoked を明示的に載せる
+        _session_cache.set(
+            token_hash,
+            SessionSnapshot(
+                id=session.id,
+                user_id=session.user_id,
+                expires_at=_as_utc(session.expires_at),
+                revoked=True,
+            ),
+        )
         logger.info("Session revoked: session_id=%s, user_id=%s", session.id, session.user_id)
+
+
+async def revoke_all_sessions(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    except_session_id: str | None = None,
+) -> int:
+    """ユーザーの有効なセッションをすべて revoke する（全端末からのログアウト）.
+
+    `UPDATE ... RETURNING` の 1 ステートメントで revoke し、返った token_hash で
+    プロセス内キャッシュを revoked に置き換える。commit は呼び出し側で行う。
+
+    Args:
+        db: DBセッション
+        user_id: 対象ユーザーID
+        except_session_id: revoke から除外するセッションID（現在の端末を残す場合）
+
+    Returns:
+        revoke したセッション数
+    """
+    now = datetime.now(tz=timezone.utc)
+    stmt = (
+        update(Session)
+        .where(
+            Session.user_id == user_id,
+            Session.revoked_at.is_(None),
+            Session.expires_at > now,
+        )
+        .values(revoked_at=now)
+        .returning(Session.id, Session.token_hash, Session.expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    if except_session_id is not None:
+        stmt = stmt.where(Session.id != except_session_id)
+
+    rows = (await db.execute(stmt)).all()
+    # commit 前に並行リクエストが旧状態を再キャッシュしないよう revoked を明示的に載せる
+    for row in rows:
+        _session_cache.set(
+            row.token_hash,
+            SessionSnapshot(
+                id=row.id,
+                user_id=user_id,
+                expires_at=_as_utc(row.expires_at),
+                revoked=True,
+            ),
+        )
+
+    logger.info("All sessions revoked: user_id=%s count=%d", user_id, len(rows))
+    return len(rows)
+
+
+@dataclass(frozen=True)
+class SessionPurgeResult:
+    """purge_sessions の実行結果."""
+
+    deleted: int
+    batches: int
+    elapsed_seconds: float
+
+
+async def purge_sessions(
+    db: AsyncSession,
+    *,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+) -> SessionPurgeResult:
+    """期限切れ・revoke 済みのセッションを上限付きバッチで削除する.
+
+    `DELETE ... WHERE ctid IN (SELECT ctid ... LIMIT n FOR UPDATE SKIP LOCKED)` を
+    削除件数が batch_size 未満になるまで繰り返す。ロック保持時間を短く保つため
+    バッチごとに commit する（他の service と異なり commit まで行う）。
+    FOR UPDATE SKIP LOCKED により、延長・revoke 中の行とは競合せず次回に回す。
+
+    Args:
+        db: DBセッション
+        batch_size: 1 バッチあたりの最大削除件数（未指定時は SESSION_PURGE_BATCH_SIZE）
+        max_batches: 実行するバッチ数の上限（未指定時は対象がなくなるまで）
+
+    Returns:
+        削除件数・バッチ数・所要時間
+    """
+    batch_size = batch_size or settings.session_purge_batch_size
+    started = time.perf_counter()
+    now = datetime.now(tz=timezone.utc)
+    ctid = literal_column("ctid")
+
+    targets = (
+        select(ctid)
+        .select_from(Session)
+        .where(or_(Session.expires_at < now, Session.revoked_at.is_not(None)))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = delete(Session).where(ctid.in_(targets)).execution_options(synchronize_session=False)
+
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = await db.execute(stmt)
+        await db.commit()
+        batches += 1
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+
+    elapsed = time.perf_counter() - started
+    logger.info("Sessions purged: deleted=%d batches=%d elapsed=%.3fs", deleted, batches, elapsed)
+    return SessionPurgeResult(deleted=deleted, batches=batches, elapsed_seconds=elapsed)
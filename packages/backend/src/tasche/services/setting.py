@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from tasche.core.exceptions import ValidationError
 from tasche.models.user import User
+from tasche.services.dashboard_cache import invalidate_dashboard_cache
 
 
 def _validate_timezone(tz: str) -> None:
@@ -39,4 +40,6 @@ async def update_user_settings(
         user.theme = theme
 
     await db.flush()
+    if timezone is not None:
+        await invalidate_dashboard_cache(db, user.id)
     return user
@@ -0,0 +1,198 @@
+"""長期統計（週・月単位の目標・実績の推移）サービス."""
+
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import Date, DateTime, Row, Select, cast, distinct, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.core.exceptions import ValidationError
+from tasche.models.rollup import WeekTaskRollup
+from tasche.models.task import Task
+from tasche.models.week import Week
+from tasche.schemas.stats import (
+    StatsGranularity,
+    StatsPeriod,
+    StatsPoint,
+    StatsResponse,
+    StatsSummary,
+    TaskStats,
+)
+from tasche.services.dashboard import calculate_completion_rate
+
+# 1 年分の週（53 週）まで
+MAX_STATS_RANGE_DAYS = 371
+
+
+def _summary(target_units: float, actual_units: float) -> StatsSummary:
+    return StatsSummary(
+        target_units=target_units,
+        actual_units=actual_units,
+        completion_rate=calculate_completion_rate(target_units, actual_units),
+    )
+
+
+def _validate_range(start_date: date, end_date: date) -> None:
+    if end_date < start_date:
+        raise ValidationError("to must not be before from")
+    if (end_date - start_date).days > MAX_STATS_RANGE_DAYS:
+        raise ValidationError(f"date range must not exceed {MAX_STATS_RANGE_DAYS} days")
+
+
+def _build_stats_statement(
+    *, user_id: str, start_date: date, end_date: date, granularity: StatsGranularity
+) -> Select:
+    """範囲内の週を期間ごとに、(期間, タスク) と期間合計の 2 階層で集計する 1 ステートメント.
+
+    raw の goals / records ではなく週次ロールアップ（week_task_rollups）を読むため、
+    読み取り行数は範囲の週数 × タスク数に比例する。期間合計は GROUPING SETS で同じ
+    走査から求め、目標・実績が無い週も週数に数えられるよう週にロールアップを
+    LEFT JOIN する。週は開始日が範囲内のものを対象にし、月単位では開始日の月に数える。
+    """
+    if granularity is StatsGranularity.MONTH:
+        period_start = cast(func.date_trunc("month", cast(Week.start_date, DateTime)), Date)
+    else:
+        period_start = Week.start_date
+    weeks = (
+        select(
+            period_start.label("period_start"),
+            Week.id.label("week_id"),
+            WeekTaskRollup.task_id,
+            WeekTaskRollup.target_units,
+            WeekTaskRollup.actual_units,
+        )
+        .outerjoin(WeekTaskRollup, WeekTaskRollup.week_id == Week.id)
+        .where(Week.user_id == user_id, Week.start_date.between(start_date, end_date))
+        .subquery("stats_weeks")
+    )
+    periods = (
+        select(
+            weeks.c.period_start,
+            weeks.c.task_id,
+            func.grouping(weeks.c.task_id).label("is_total"),
+            func.count(distinct(weeks.c.week_id)).label("week_count"),
+            func.coalesce(func.sum(weeks.c.target_units), 0).label("target_units"),
+            func.coalesce(func.sum(weeks.c.actual_units), 0).label("actual_units"),
+        )
+        .group_by(
+            func.grouping_sets(
+                tuple_(weeks.c.period_start), tuple_(weeks.c.period_start, weeks.c.task_id)
+            )
+        )
+        .cte("stats_periods")
+    )
+    return (
+        select(
+            periods.c.period_start,
+            periods.c.task_id,
+            periods.c.is_total,
+            periods.c.week_count,
+            periods.c.target_units,
+            periods.c.actual_units,
+            Task.name.label("task_name"),
+            Task.is_archived,
+            Task.created_at,
+        )
+        .outerjoin(Task, Task.id == periods.c.task_id)
+        .order_by(periods.c.period_start)
+    )
+
+
+def _build_stats_response(
+    rows: Sequence[Row],
+    *,
+    start_date: date,
+    end_date: date,
+    granularity: StatsGranularity,
+) -> StatsResponse:
+    """集計行を、期間の揃った全体系列とタスクごとの系列にまとめる."""
+    periods: list[StatsPeriod] = []
+    task_rows: dict[str, Row] = {}
+    task_cells: dict[tuple[str, date], tuple[float, float]] = {}
+    for row in rows:
+        target_units = float(row.target_units)
+        actual_units = float(row.actual_units)
+        if row.is_total:
+            periods.append(
+                StatsPeriod(
+                    period_start=row.period_start,
+                    week_count=row.week_count,
+                    target_units=target_units,
+                    actual_units=actual_units,
+                    completion_rate=calculate_completion_rate(target_units, actual_units),
+                )
+            )
+        elif row.task_id is not None:
+            task_rows.setdefault(row.task_id, row)
+            task_cells[(row.task_id, row.period_start)] = (target_units, actual_units)
+
+    tasks: list[TaskStats] = []
+    # タスクはダッシュボードと同じく作成順に並べる
+    for task_id, row in sorted(task_rows.items(), key=lambda item: (item[1].created_at, item[0])):
+        series: list[StatsPoint] = []
+        for period in periods:
+            target_units, actual_units = task_cells.get((task_id, period.period_start), (0.0, 0.0))
+            series.append(
+                StatsPoint(
+                    period_start=period.period_start,
+                    target_units=target_units,
+                    actual_units=actual_units,
+                    completion_rate=calculate_completion_rate(target_units, actual_units),
+                )
+            )
+        tasks.append(
+            TaskStats(
+                task_id=task_id,
+                task_name=row.task_name,
+                is_archived=row.is_archived,
+                summary=_summary(
+                    sum(point.target_units for point in series),
+                    sum(point.actual_units for point in series),
+                ),
+                series=series,
+            )
+        )
+
+    return StatsResponse(
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+        summary=_summary(
+            sum(period.target_units for period in periods),
+            sum(period.actual_units for period in periods),
+        ),
+        periods=periods,
+        tasks=tasks,
+    )
+
+
+async def get_stats(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    start_date: date,
+    end_date: date,
+    granularity: StatsGranularity = StatsGranularity.WEEK,
+) -> StatsResponse:
+    """期間ごとの目標・実績の推移をタスク別・全体で返す（DB 往復は範囲によらず 1 回）.
+
+    開始日が start_date〜end_date の週を対象にする。存在しない週（アプリを開かなかった週）は
+    期間に含めない。タスクの系列は periods と同じ期間に揃え、値の無い期間は 0 で埋める。
+
+    Raises:
+        ValidationError: end_date が start_date より前、または範囲が MAX_STATS_RANGE_DAYS 超
+    """
+    _validate_range(start_date, end_date)
+    rows = (
+        await db.execute(
+            _build_stats_statement(
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                granularity=granularity,
+            )
+        )
+    ).all()
+    return _build_stats_response(
+        rows, start_date=start_date, end_date=end_date, granularity=granularity
+    )
@@ -12,6 +12,8 @@ from tasche.models.record import Record
 from tasche.models.task import Task
 from tasche.models.user import User
 from tasche.models.week import Week
+from tasche.services.dashboard_cache import invalidate_dashboard_cache
+from tasche.services.data_version import bump_user_data_version
 from tasche.services.record import (
     DEFAULT_WEEK_START_DAY,
     DEFAULT_WEEK_START_HOUR,
@@ -146,6 +148,7 @@ async def create_task(db: AsyncSession, user: User, name: str) -> Task:
     )
     db.add(task)
     await db.flush()
+    await bump_user_data_version(db, user.id)
     await db.refresh(task)
     return task
 
@@ -155,6 +158,8 @@ async def update_task(db: AsyncSession, user: User, task_id: str, name: str) ->
     task = await _get_active_task_for_user(db, user, task_id)
     task.name = _normalize_task_name(name)
     await db.flush()
+    await bump_user_data_version(db, user.id)
+    await invalidate_dashboard_cache(db, user.id)
     await db.refresh(task)
     return task
 
@@ -164,6 +169,8 @@ async def archive_task(db: AsyncSession, user: User, task_id: str) -> Task:
     task = await _get_active_task_for_user(db, user, task_id)
     task.is_archived = True
     await db.flush()
+    await bump_user_data_version(db, user.id)
+    await invalidate_dashboard_cache(db, user.id)
     await db.refresh(task)
     return task
 
@@ -204,6 +211,9 @@ async def archive_tasks(
     for task in target_tasks:
         task.is_archived = True
     await db.flush()
+    if target_tasks:
+        await bump_user_data_version(db, user.id)
+        await invalidate_dashboard_cache(db, user.id)
 
     archived_ids = [tid for tid in unique_ids if tid in archivable_ids]
     not_found_ids = [tid for tid in unique_ids if tid not in archivable_ids]
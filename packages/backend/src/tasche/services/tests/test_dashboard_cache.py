@@ -0,0 +1,142 @@
+"""services/dashboard_cache.py のテスト."""
+
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.core.config import Settings, settings
+from tasche.models.enums import DayOfWeek
+from tasche.schemas.dashboard import DashboardResponse, WeekInfo
+from tasche.services import dashboard_cache
+from tasche.services.dashboard_cache import (
+    DashboardCacheScope,
+    InProcessDashboardCache,
+    RedisDashboardCache,
+    get_dashboard_cache,
+    invalidate_dashboard_cache,
+)
+
+USER_ID = "usr_01TEST1234567890ABCDEF"
+SCOPE = DashboardCacheScope(
+    start_date=date(2026, 4, 20), local_date=date(2026, 4, 22), timezone="Asia/Tokyo"
+)
+
+
+def _dashboard() -> DashboardResponse:
+    return DashboardResponse(
+        current_date=SCOPE.local_date,
+        current_day_of_week=DayOfWeek.WEDNESDAY,
+        week=WeekInfo(
+            id="wk_01TEST1234567890ABCDEF",
+            start_date=SCOPE.start_date,
+            end_date=date(2026, 4, 26),
+            unit_duration_minutes=30,
+        ),
+        today_goals=[],
+        weekly_matrix=[],
+        has_goals_configured=False,
+    )
+
+
+class _FakeRedis:
+    """redis.asyncio.Redis の get / set のみを持つテストダブル."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str | bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.values.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.values[key] = value
+
+    async def aclose(self) -> None:
+        return None
+
+
+class TestInProcessDashboardCache:
+    """プロセス内バックエンドのテスト."""
+
+    async def test_scope_mismatch_is_a_miss(self):
+        """週・ローカル日付・タイムゾーンのいずれかが異なればミスになることを確認."""
+        cache = InProcessDashboardCache()
+        dashboard = _dashboard()
+        await cache.set(USER_ID, SCOPE, dashboard)
+
+        next_day = DashboardCacheScope(
+            start_date=SCOPE.start_date, local_date=date(2026, 4, 23), timezone="Asia/Tokyo"
+        )
+        assert await cache.get(USER_ID, SCOPE) is dashboard
+        assert await cache.get(USER_ID, next_day) is None
+
+    async def test_disabled_when_ttl_is_zero(self):
+        """TTL が 0 の場合は保存しないことを確認."""
+        cache = InProcessDashboardCache()
+        with patch.object(settings, "dashboard_cache_ttl_seconds", 0):
+            await cache.set(USER_ID, SCOPE, _dashboard())
+
+        assert await cache.get(USER_ID, SCOPE) is None
+
+
+class TestRedisDashboardCache:
+    """共有バックエンドのテスト."""
+
+    async def test_invalidate_switches_version(self):
+        """無効化でバージョントークンが変わり、既存のエントリを参照しなくなることを確認."""
+        client = _FakeRedis()
+        cache = RedisDashboardCache(client)
+        await cache.set(USER_ID, SCOPE, _dashboard())
+        assert await cache.get(USER_ID, SCOPE) == _dashboard()
+
+        await cache.invalidate(USER_ID)
+
+        assert await cache.get(USER_ID, SCOPE) is None
+        await cache.set(USER_ID, SCOPE, _dashboard())
+        assert await cache.get(USER_ID, SCOPE) == _dashboard()
+
+    async def test_backend_errors_are_misses(self):
+        """Redis の障害時は例外を送出せずミスとして扱うことを確認."""
+
+        class _BrokenRedis(_FakeRedis):
+            async def get(self, key: str) -> bytes | None:
+                raise ConnectionError("redis is down")
+
+        cache = RedisDashboardCache(_BrokenRedis())
+
+        assert await cache.get(USER_ID, SCOPE) is None
+        await cache.set(USER_ID, SCOPE, _dashboard())
+
+    def test_redis_url_is_required(self):
+        """redis バックエンドでは DASHBOARD_CACHE_REDIS_URL が必須であることを確認."""
+        with pytest.raises(ValueError):
+            Settings(database_url=settings.database_url, dashboard_cache_backend="redis")
+
+
+class TestInvalidateDashboardCache:
+    """invalidate_dashboard_cache のテスト."""
+
+    async def test_invalidates_again_after_commit(self, db_session: AsyncSession):
+        """commit 前に並行リクエストが書き戻したエントリも commit 後に捨てることを確認."""
+        cache = get_dashboard_cache()
+        await cache.set(USER_ID, SCOPE, _dashboard())
+
+        await invalidate_dashboard_cache(db_session, USER_ID)
+        assert await cache.get(USER_ID, SCOPE) is None
+
+        # commit 前に旧状態を集計した並行リクエストの書き戻し
+        await cache.set(USER_ID, SCOPE, _dashboard())
+        await db_session.commit()
+        await asyncio.gather(*dashboard_cache._background_tasks)
+
+        assert await cache.get(USER_ID, SCOPE) is None
+
+    async def test_noop_when_disabled(self, db_session: AsyncSession):
+        """キャッシュ無効時は commit 後の無効化も登録しないことを確認."""
+        with patch.object(settings, "dashboard_cache_ttl_seconds", 0):
+            await invalidate_dashboard_cache(db_session, USER_ID)
+
+        assert dashboard_cache._PENDING_INVALIDATIONS_KEY not in db_session.sync_session.info
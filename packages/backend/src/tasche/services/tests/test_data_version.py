@@ -0,0 +1,43 @@
+"""services/data_version.py のテスト."""
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tasche.db.query_stats import reset_query_stats, start_query_stats
+from tasche.models.user import User
+from tasche.services import task as task_service
+from tasche.services.data_version import bump_user_data_version, get_user_data_version
+
+
+async def _version_with_statements(db: AsyncSession, user: User) -> tuple[str, int]:
+    stats, token = start_query_stats()
+    try:
+        version = await get_user_data_version(db, user)
+    finally:
+        reset_query_stats(token)
+    return version, stats.statements
+
+
+class TestGetUserDataVersion:
+    """get_user_data_version のテスト."""
+
+    async def test_uses_loaded_user_row_without_round_trip(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """認証で読み込んだ User と同じセッションなら DB に問い合わせない."""
+        assert await _version_with_statements(db_session, test_user) == ("0", 0)
+
+        await task_service.create_task(db_session, test_user, "英語学習")
+        await db_session.commit()
+
+        assert await _version_with_statements(db_session, test_user) == ("1", 0)
+
+    async def test_rereads_from_other_session(self, db_session: AsyncSession, test_user: User):
+        """別のセッション（リードレプリカ）では、そのセッションから読み直す."""
+        maker = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+        await bump_user_data_version(db_session, test_user.id)
+
+        async with maker() as replica:
+            # commit 前の版の更新は見えない
+            assert await _version_with_statements(replica, test_user) == ("0", 1)
+            await db_session.commit()
+            assert await _version_with_statements(replica, test_user) == ("1", 1)
@@ -0,0 +1,260 @@
+"""ロールアップサービスの統合テスト."""
+
+import asyncio
+from datetime import UTC, date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tasche.models.enums import DayOfWeek
+from tasche.models.goal import Goal
+from tasche.models.record import Record
+from tasche.models.rollup import WeekTaskRollup
+from tasche.models.task import Task
+from tasche.models.user import User
+from tasche.models.week import Week
+from tasche.schemas.goal import DailyAvailableUnits, DailyTargets, GoalsUpdate, GoalUpdateItem
+from tasche.schemas.record import RecordBatchItem
+from tasche.services import goal as goal_service
+from tasche.services import record as record_service
+from tasche.services import week as week_service
+from tasche.services.rollup import rebuild_rollups
+
+
+@pytest.fixture
+def fixed_now(monkeypatch: pytest.MonkeyPatch):
+    """current week 判定を固定する（2026-04-22 12:00 JST → 2026-04-20 週）."""
+    now = datetime(2026, 4, 22, 3, 0, tzinfo=UTC)
+    monkeypatch.setattr(week_service, "get_current_time_utc", lambda: now)
+    return now
+
+
+@pytest_asyncio.fixture
+async def current_week(db_session: AsyncSession, test_user: User) -> Week:
+    week = Week(
+        id="wk_01ROLLUP34567890ABCDEF",
+        user_id=test_user.id,
+        start_date=date(2026, 4, 20),
+        end_date=date(2026, 4, 26),
+        unit_duration_minutes=30,
+        week_start_day="monday",
+        week_start_hour=4,
+    )
+    db_session.add(week)
+    await db_session.commit()
+    return week
+
+
+@pytest_asyncio.fixture
+async def test_tasks(db_session: AsyncSession, test_user: User) -> tuple[Task, Task]:
+    english = Task(id="tsk_01ROLLUP34567890ABCDEF", user_id=test_user.id, name="英語学習")
+    dev = Task(id="tsk_02ROLLUP34567890ABCDEF", user_id=test_user.id, name="個人開発")
+    db_session.add_all([english, dev])
+    await db_session.commit()
+    return english, dev
+
+
+def _targets(units: float) -> DailyTargets:
+    return DailyTargets(**{day.value: units for day in DayOfWeek})
+
+
+def _goals_update(*items: tuple[str, float]) -> GoalsUpdate:
+    return GoalsUpdate(
+        unit_duration_minutes=30,
+        daily_available_units=DailyAvailableUnits(**{day.value: 10.0 for day in DayOfWeek}),
+        goals=[GoalUpdateItem(task_id=task_id, daily_targets=_targets(u)) for task_id, u in items],
+    )
+
+
+async def _task_rollups(db: AsyncSession, week_id: str) -> dict[str, tuple[float, float]]:
+    result = await db.execute(select(WeekTaskRollup).where(WeekTaskRollup.week_id == week_id))
+    return {row.task_id: (row.target_units, row.actual_units) for row in result.scalars()}
+
+
+class TestIncrementalRollups:
+    """書き込みサービスと同じトランザクションでのロールアップ更新のテスト."""
+
+    async def test_record_and_goal_writes_update_rollups(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """実績の単一/一括 upsert と目標の置き換えがロールアップに反映される."""
+        english, dev = test_tasks
+
+        await goal_service.replace_current_goals(
+            db_session, test_user, _goals_update((english.id, 1.0), (dev.id, 2.0))
+        )
+        await record_service.upsert_current_record(
+            db_session,
+            test_user,
+            task_id=english.id,
+            day_of_week=DayOfWeek.MONDAY,
+            actual_units=3.5,
+        )
+        await record_service.upsert_current_records(
+            db_session,
+            test_user,
+            [
+                RecordBatchItem(task_id=english.id, day_of_week=DayOfWeek.MONDAY, actual_units=2.0),
+                RecordBatchItem(task_id=dev.id, day_of_week=DayOfWeek.FRIDAY, actual_units=7.0),
+            ],
+        )
+        await db_session.commit()
+
+        assert await _task_rollups(db_session, current_week.id) == {
+            english.id: (7.0, 2.0),
+            dev.id: (14.0, 7.0),
+        }
+
+    async def test_goal_replacement_drops_rows_without_goals_or_records(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """目標から外れ実績も無いタスクの行は削除され、実績のあるタスクは目標 0 で残る."""
+        english, dev = test_tasks
+        await goal_service.replace_current_goals(
+            db_session, test_user, _goals_update((english.id, 1.0), (dev.id, 2.0))
+        )
+        await record_service.upsert_current_record(
+            db_session,
+            test_user,
+            task_id=english.id,
+            day_of_week=DayOfWeek.MONDAY,
+            actual_units=1.0,
+        )
+
+        await goal_service.replace_current_goals(db_session, test_user, _goals_update())
+        await db_session.commit()
+
+        assert await _task_rollups(db_session, current_week.id) == {english.id: (0.0, 1.0)}
+
+    async def test_rollups_roll_back_with_the_write(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """書き込みがロールバックされればロールアップも残らない."""
+        english, _ = test_tasks
+        week_id = current_week.id
+        await record_service.upsert_current_record(
+            db_session,
+            test_user,
+            task_id=english.id,
+            day_of_week=DayOfWeek.MONDAY,
+            actual_units=1.0,
+        )
+        await db_session.rollback()
+
+        assert await _task_rollups(db_session, week_id) == {}
+
+    async def test_concurrent_writes_to_same_week_do_not_drift(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+        fixed_now: datetime,
+    ):
+        """同じ (週, タスク) の別の曜日への並行書き込みで、後の側が古い合計で上書きしない.
+
+        2 本目の書き込みは 1 本目の commit まで週のロックで待ち、1 本目の行を含めて集計する。
+        """
+        english, _ = test_tasks
+        week_id = current_week.id
+        maker = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+
+        async with maker() as first, maker() as second:
+            await record_service.upsert_current_record(
+                first, test_user, task_id=english.id, day_of_week=DayOfWeek.MONDAY, actual_units=1.0
+            )
+            concurrent = asyncio.create_task(
+                record_service.upsert_current_record(
+                    second,
+                    test_user,
+                    task_id=english.id,
+                    day_of_week=DayOfWeek.TUESDAY,
+                    actual_units=2.0,
+                )
+            )
+            await asyncio.sleep(0.2)
+            assert not concurrent.done()
+
+            await first.commit()
+            await concurrent
+            await second.commit()
+
+        assert await _task_rollups(db_session, week_id) == {english.id: (0.0, 3.0)}
+        assert (await rebuild_rollups(db_session)).refresh.changed == 0
+
+
+class TestRebuildRollups:
+    """rebuild_rollups のテスト."""
+
+    async def test_repairs_drift_and_reports_changed_rows(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        current_week: Week,
+        test_tasks: tuple[Task, Task],
+    ):
+        """サービスを経由しない書き込みによるずれを照合して修正する."""
+        english, dev = test_tasks
+        db_session.add_all(
+            [
+                Goal(
+                    id="goal_01ROLLUP34567890ABCDE",
+                    week_id=current_week.id,
+                    task_id=english.id,
+                    day_of_week=DayOfWeek.MONDAY,
+                    target_units=4.0,
+                ),
+                Record(
+                    id="rec_01ROLLUP34567890ABCDEF",
+                    week_id=current_week.id,
+                    task_id=dev.id,
+                    day_of_week=DayOfWeek.MONDAY,
+                    actual_units=1.5,
+                ),
+            ]
+        )
+        await db_session.flush()
+
+        first = await rebuild_rollups(db_session)
+        assert (first.refresh.task_rows_upserted, first.refresh.task_rows_deleted) == (2, 0)
+        assert await _task_rollups(db_session, current_week.id) == {
+            english.id: (4.0, 0.0),
+            dev.id: (0.0, 1.5),
+        }
+
+        await db_session.execute(
+            update(WeekTaskRollup)
+            .where(WeekTaskRollup.task_id == english.id)
+            .values(actual_units=9.0)
+        )
+        second = await rebuild_rollups(db_session, user_id=test_user.id)
+        assert second.refresh.changed == 1
+        # 修正した場合は統計の ETag が変わるよう版を上げる（初回の修正と合わせて 2）
+        await db_session.refresh(test_user)
+        assert test_user.data_version == 2
+        assert await _task_rollups(db_session, current_week.id) == {
+            english.id: (4.0, 0.0),
+            dev.id: (0.0, 1.5),
+        }
+
+        third = await rebuild_rollups(db_session)
+        assert third.refresh.changed == 0
+        await db_session.refresh(test_user)
+        assert test_user.data_version == 2
@@ -1,18 +1,27 @@
 """services/session.py のユニットテスト."""
 
+import secrets
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
 
+from sqlalchemy import delete, event, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
 from tasche.core.config import settings
+from tasche.db.query_stats import reset_query_stats, start_query_stats
 from tasche.models.session import Session
 from tasche.models.user import User
 from tasche.services.session import (
-    _generate_raw_token,
     _generate_session_id,
     _hash_token,
+    _issue_raw_token,
+    _sign_token,
     create_session,
+    get_session_cache_stats,
+    purge_sessions,
+    reissue_session_token,
+    revoke_all_sessions,
     revoke_session,
     validate_session,
 )
@@ -93,11 +102,12 @@ class TestValidateSession:
         user = await _create_test_user(db_session, email="expired@example.com")
 
         # 期限切れセッションを直接作成
-        raw_token = _generate_raw_token()
-        token_hash = _hash_token(raw_token)
         expired_at = datetime.now(tz=timezone.utc) - timedelta(hours=1)
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expired_at)
+        token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expired_at,
@@ -115,13 +125,14 @@ class TestValidateSession:
         user = await _create_test_user(db_session, email="revoked@example.com")
 
         # revoke 済みセッションを作成
-        raw_token = _generate_raw_token()
-        token_hash = _hash_token(raw_token)
         expires_at = datetime.now(tz=timezone.utc) + timedelta(
             seconds=settings.session_expires_seconds
         )
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -141,10 +152,11 @@ class TestValidateSession:
 
         # 残存 1 日（< 半分 3.5 日）のセッションを作成
         expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
-        raw_token = _generate_raw_token()
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
         token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -165,10 +177,11 @@ class TestValidateSession:
 
         # 残存 5 日（> 半分 3.5 日）のセッションを作成
         expires_at = datetime.now(tz=timezone.utc) + timedelta(days=5)
-        raw_token = _generate_raw_token()
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
         token_hash = _hash_token(raw_token)
         session = Session(
-            id=_generate_session_id(),
+            id=session_id,
             user_id=user.id,
             token_hash=token_hash,
             expires_at=expires_at,
@@ -184,6 +197,132 @@ class TestValidateSession:
         assert result_session.expires_at == original_expires_at
 
 
+class TestSignedToken:
+    """署名付きセッショントークンの事前検証のテスト."""
+
+    async def test_malformed_token_rejected_without_db(self):
+        """形式不正のトークンは DB に問い合わせずに拒否されることを確認."""
+        db = AsyncMock()
+
+        for raw_token in ("", "invalid_token", "a.b.c", "a.b.c.d.e"):
+            result_session, extended = await validate_session(db, raw_token)
+            assert result_session is None
+            assert extended is False
+
+        db.execute.assert_not_awaited()
+        db.get.assert_not_awaited()
+
+    async def test_forged_signature_rejected_without_db(self):
+        """署名を改ざんしたトークンは DB に問い合わせずに拒否されることを確認."""
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        session_id, exp, secret, _signature = _issue_raw_token(
+            _generate_session_id(), expires_at
+        ).split(".")
+        # 期限だけを書き換えた（延命を狙った）トークン
+        forged = f"{session_id}.{int(exp) + 86400}.{secret}.{_signature}"
+        db = AsyncMock()
+
+        result_session, _ = await validate_session(db, forged)
+
+        assert result_session is None
+        db.execute.assert_not_awaited()
+
+    async def test_expired_token_rejected_without_db(self):
+        """署名内の有効期限を過ぎたトークンは DB に問い合わせずに拒否されることを確認."""
+        raw_token = _issue_raw_token(
+            _generate_session_id(), datetime.now(tz=timezone.utc) - timedelta(seconds=1)
+        )
+        db = AsyncMock()
+
+        result_session, _ = await validate_session(db, raw_token)
+
+        assert result_session is None
+        db.execute.assert_not_awaited()
+
+    async def test_token_for_other_session_id_rejected(self, db_session: AsyncSession):
+        """署名内の session_id が DB の行と一致しない場合は拒否されることを確認."""
+        user = await _create_test_user(db_session, email="mismatch@example.com")
+        _, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+        secret = raw_token.split(".")[2]
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        other = _sign_token(_generate_session_id(), expires_at, secret)
+
+        result_session, _ = await validate_session(db_session, other)
+
+        assert result_session is None
+
+    async def test_legacy_opaque_token_still_valid(self, db_session: AsyncSession):
+        """署名導入前の不透明トークンも DB 照合で検証できることを確認."""
+        user = await _create_test_user(db_session, email="legacy@example.com")
+        raw_token = secrets.token_urlsafe(48)
+        session = Session(
+            id=_generate_session_id(),
+            user_id=user.id,
+            token_hash=_hash_token(raw_token),
+            expires_at=datetime.now(tz=timezone.utc) + timedelta(days=5),
+        )
+        db_session.add(session)
+        await db_session.commit()
+
+        result_session, _ = await validate_session(db_session, raw_token)
+
+        assert result_session is not None
+        assert result_session.id == session.id
+        assert reissue_session_token(raw_token, result_session.expires_at) == raw_token
+
+    async def test_reissued_token_keeps_token_hash(self, db_session: AsyncSession):
+        """再署名したトークンは token_hash を変えずに新しい期限で検証できることを確認."""
+        user = await _create_test_user(db_session, email="reissue@example.com")
+        session, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+        new_expires_at = datetime.now(tz=timezone.utc) + timedelta(days=10)
+
+        reissued = reissue_session_token(raw_token, new_expires_at)
+
+        assert reissued != raw_token
+        assert _hash_token(reissued) == session.token_hash
+        assert reissued.split(".")[1] == str(int(new_expires_at.timestamp()))
+        result_session, _ = await validate_session(db_session, reissued)
+        assert result_session is not None
+        assert result_session.id == session.id
+
+    async def test_token_signed_with_previous_secret_still_valid(self, db_session: AsyncSession):
+        """鍵のローテーション後も旧鍵で署名されたトークンを受け付け、再署名で新しい鍵へ移ることを確認."""
+        user = await _create_test_user(db_session, email="rotate@example.com")
+        with patch.object(settings, "session_token_secret", "old-secret"):
+            session, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+
+        with (
+            patch.object(settings, "session_token_secret", "new-secret"),
+            patch.object(settings, "session_token_previous_secrets", "old-secret"),
+        ):
+            result_session, _ = await validate_session(db_session, raw_token)
+            reissued = reissue_session_token(raw_token, session.expires_at)
+
+        assert result_session is not None
+        assert result_session.id == session.id
+        with patch.object(settings, "session_token_secret", "new-secret"):
+            assert (await validate_session(db_session, reissued))[0] is not None
+
+    async def test_token_signed_with_unknown_secret_rejected(self):
+        """現在の鍵にも旧鍵にも一致しない署名は DB に問い合わせずに拒否されることを確認."""
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        with patch.object(settings, "session_token_secret", "retired-secret"):
+            raw_token = _issue_raw_token(_generate_session_id(), expires_at)
+        db = AsyncMock()
+
+        with (
+            patch.object(settings, "session_token_secret", "new-secret"),
+            patch.object(settings, "session_token_previous_secrets", "old-secret"),
+        ):
+            result_session, _ = await validate_session(db, raw_token)
+
+        assert result_session is None
+        db.execute.assert_not_awaited()
+
+
 class TestRevokeSession:
     """revoke_session のテスト."""
 
@@ -218,3 +357,268 @@ class TestRevokeSession:
         await revoke_session(db_session, raw_token)
         # 2回目の revoke（例外が発生しないこと）
         await revoke_session(db_session, raw_token)
+
+
+class TestRevokeAllSessions:
+    """revoke_all_sessions のテスト."""
+
+    async def test_revokes_all_live_sessions_of_user(self, db_session: AsyncSession):
+        """対象ユーザーの有効なセッションのみ revoke されることを確認."""
+        user = await _create_test_user(db_session, email="revoke_all@example.com")
+        other = await _create_test_user(db_session, email="revoke_all_other@example.com")
+        _, token_a = await create_session(db_session, user_id=user.id)
+        _, token_b = await create_session(db_session, user_id=user.id)
+        _, other_token = await create_session(db_session, user_id=other.id)
+        await db_session.commit()
+
+        revoked = await revoke_all_sessions(db_session, user.id)
+        await db_session.commit()
+
+        assert revoked == 2
+        assert (await validate_session(db_session, token_a))[0] is None
+        assert (await validate_session(db_session, token_b))[0] is None
+        assert (await validate_session(db_session, other_token))[0] is not None
+
+    async def test_except_session_id_is_kept(self, db_session: AsyncSession):
+        """except_session_id で指定したセッションは revoke されないことを確認."""
+        user = await _create_test_user(db_session, email="revoke_except@example.com")
+        current, current_token = await create_session(db_session, user_id=user.id)
+        _, other_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+
+        revoked = await revoke_all_sessions(db_session, user.id, except_session_id=current.id)
+        await db_session.commit()
+
+        assert revoked == 1
+        assert (await validate_session(db_session, current_token))[0] is not None
+        assert (await validate_session(db_session, other_token))[0] is None
+
+    async def test_cached_sessions_are_invalidated(self, db_session: AsyncSession):
+        """キャッシュ済みのセッションも 1 ステートメントの revoke で即時に無効になることを確認."""
+        user = await _create_test_user(db_session, email="revoke_cached@example.com")
+        _, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+        assert (await validate_session(db_session, raw_token))[0] is not None
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            await revoke_all_sessions(db_session, user.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE sessions")
+        # commit 前でもキャッシュは revoked を返す
+        assert (await validate_session(db_session, raw_token))[0] is None
+
+
+class TestSessionCache:
+    """validate_session のプロセス内キャッシュのテスト."""
+
+    async def test_second_validation_is_served_from_cache(self, db_session: AsyncSession):
+        """2 回目の検証はキャッシュヒットとなり DB を参照しないことを確認."""
+        user = await _create_test_user(db_session, email="cache_hit@example.com")
+        session, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+
+        await validate_session(db_session, raw_token)
+        before = get_session_cache_stats()
+
+        # DB から行を消してもキャッシュから解決できる
+        await db_session.execute(delete(Session).where(Session.id == session.id))
+        await db_session.commit()
+        result_session, extended = await validate_session(db_session, raw_token)
+
+        assert result_session is not None
+        assert result_session.user_id == user.id
+        assert extended is False
+        assert get_session_cache_stats().hits == before.hits + 1
+
+    async def test_revoke_invalidates_cached_session(self, db_session: AsyncSession):
+        """revoke_session 後はキャッシュ済みでも無効になることを確認."""
+        user = await _create_test_user(db_session, email="cache_revoke@example.com")
+        _, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+
+        first, _ = await validate_session(db_session, raw_token)
+        assert first is not None
+
+        await revoke_session(db_session, raw_token)
+        await db_session.commit()
+
+        result_session, _ = await validate_session(db_session, raw_token)
+        assert result_session is None
+
+    async def test_cache_disabled_when_ttl_is_zero(self, db_session: AsyncSession):
+        """TTL 0 の場合は毎回 DB を参照し、外部での revoke が即時反映されることを確認."""
+        user = await _create_test_user(db_session, email="cache_off@example.com")
+        session, raw_token = await create_session(db_session, user_id=user.id)
+        await db_session.commit()
+
+        with patch.object(settings, "session_cache_ttl_seconds", 0):
+            first, _ = await validate_session(db_session, raw_token)
+            assert first is not None
+
+            await db_session.execute(
+                update(Session)
+                .where(Session.id == session.id)
+                .values(revoked_at=datetime.now(tz=timezone.utc))
+            )
+            await db_session.commit()
+
+            result_session, _ = await validate_session(db_session, raw_token)
+
+        assert result_session is None
+        assert get_session_cache_stats().size == 0
+
+    async def test_extension_bypasses_cache(self, db_session: AsyncSession):
+        """延長が必要なセッションはキャッシュ済みでも DB を更新することを確認."""
+        user = await _create_test_user(db_session, email="cache_extend@example.com")
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        session = Session(
+            id=session_id,
+            user_id=user.id,
+            token_hash=_hash_token(raw_token),
+            expires_at=expires_at,
+        )
+        db_session.add(session)
+        await db_session.commit()
+
+        _, first_extended = await validate_session(db_session, raw_token)
+        _, second_extended = await validate_session(db_session, raw_token)
+
+        assert first_extended is True
+        # 1 回目の延長は同じトランザクションの DB から読み直されるため 2 回目は延長不要
+        assert second_extended is False
+
+
+class TestExtensionWrite:
+    """スライディング延長の書き込みのテスト."""
+
+    async def _create_expiring_session(self, db_session: AsyncSession, email: str):
+        user = await _create_test_user(db_session, email=email)
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+        session_id = _generate_session_id()
+        raw_token = _issue_raw_token(session_id, expires_at)
+        session = Session(
+            id=session_id,
+            user_id=user.id,
+            token_hash=_hash_token(raw_token),
+            expires_at=expires_at,
+        )
+        db_session.add(session)
+        await db_session.commit()
+        return session, raw_token
+
+    async def _load_expires_at(self, db_session: AsyncSession, session_id: str) -> datetime:
+        db_session.expunge_all()
+        result = await db_session.get(Session, session_id)
+        return result.expires_at
+
+    async def test_validate_writes_extension_in_one_statement(self, db_session: AsyncSession):
+        """延長は照合に続く UPDATE 1 ステートメントで書き込まれ、commit で反映されることを確認."""
+        session, raw_token = await self._create_expiring_session(db_session, "ext_1@example.com")
+        original_expires_at = session.expires_at
+
+        stats, token = start_query_stats()
+        try:
+            _, extended = await validate_session(db_session, raw_token)
+        finally:
+            reset_query_stats(token)
+        await db_session.commit()
+
+        assert extended is True
+        assert stats.statements == 2
+        assert await self._load_expires_at(db_session, session.id) > original_expires_at
+
+    async def test_rolled_back_extension_is_retried_on_next_validation(
+        self, db_session: AsyncSession
+    ):
+        """commit されなかった延長はキャッシュに残らず、次回の検証で再度延長されることを確認."""
+        session, raw_token = await self._create_expiring_session(db_session, "ext_rb@example.com")
+        session_id, original_expires_at = session.id, session.expires_at
+
+        _, first_extended = await validate_session(db_session, raw_token)
+        await db_session.rollback()
+        _, second_extended = await validate_session(db_session, raw_token)
+        await db_session.commit()
+
+        assert (first_extended, second_extended) == (True, True)
+        assert await self._load_expires_at(db_session, session_id) > original_expires_at
+
+
+class TestPurgeSessions:
+    """purge_sessions のテスト."""
+
+    async def _add_session(
+        self,
+        db_session: AsyncSession,
+        user: User,
+        *,
+        expires_in: timedelta,
+        revoked: bool = False,
+    ) -> str:
+        session_id = _generate_session_id()
+        expires_at = datetime.now(tz=timezone.utc) + expires_in
+        db_session.add(
+            Session(
+                id=session_id,
+                user_id=user.id,
+                token_hash=_hash_token(_issue_raw_token(session_id, expires_at)),
+                expires_at=expires_at,
+                revoked_at=datetime.now(tz=timezone.utc) if revoked else None,
+            )
+        )
+        await db_session.commit()
+        return session_id
+
+    async def _remaining_ids(self, db_session: AsyncSession) -> set[str]:
+        result = await db_session.execute(select(Session.id))
+        return set(result.scalars())
+
+    async def test_deletes_expired_and_revoked_sessions(self, db_session: AsyncSession):
+        """期限切れ・revoke 済みのみ削除され、有効なセッションは残ることを確認."""
+        user = await _create_test_user(db_session, email="purge@example.com")
+        active = await self._add_session(db_session, user, expires_in=timedelta(days=1))
+        await self._add_session(db_session, user, expires_in=timedelta(hours=-1))
+        await self._add_session(db_session, user, expires_in=timedelta(days=1), revoked=True)
+
+        result = await purge_sessions(db_session)
+
+        assert result.deleted == 2
+        assert result.batches == 1
+        assert result.elapsed_seconds >= 0
+        assert await self._remaining_ids(db_session) == {active}
+
+    async def test_deletes_in_bounded_batches(self, db_session: AsyncSession):
+        """batch_size 件ずつ、対象がなくなるまで繰り返し削除することを確認."""
+        user = await _create_test_user(db_session, email="purge_batch@example.com")
+        for _ in range(5):
+            await self._add_session(db_session, user, expires_in=timedelta(hours=-1))
+
+        result = await purge_sessions(db_session, batch_size=2)
+
+        assert result.deleted == 5
+        # 2 + 2 + 1（最後のバッチが batch_size 未満で終了）
+        assert result.batches == 3
+        assert await self._remaining_ids(db_session) == set()
+
+    async def test_max_batches_stops_early(self, db_session: AsyncSession):
+        """max_batches に達したら残りを次回に回すことを確認."""
+        user = await _create_test_user(db_session, email="purge_max@example.com")
+        for _ in range(5):
+            await self._add_session(db_session, user, expires_in=timedelta(hours=-1))
+
+        result = await purge_sessions(db_session, batch_size=2, max_batches=1)
+
+        assert result.deleted == 2
+        assert result.batches == 1
+        assert len(await self._remaining_ids(db_session)) == 3
@@ -3,13 +3,18 @@
 from datetime import datetime, timezone
 
 import pytest
+from sqlalchemy import event, func, select
 from ulid import ULID
 
 from tasche.core.exceptions import InvalidAuthorizationCodeError
+from tasche.models.session import Session
+from tasche.models.week import Week
+from tasche.services.session import validate_session
 from tasche.services.user import (
     create_user,
     get_or_create_user_by_email,
     get_or_create_user_by_google_sub,
+    upsert_google_user_with_session,
 )
 
 
@@ -201,3 +206,131 @@ class TestGetOrCreateUserByGoogleSub:
         # google_sub が変更されていないことを確認
         await db_session.refresh(stub_user)
         assert stub_user.google_sub is None
+
+
+class TestUpsertGoogleUserWithSession:
+    """upsert_google_user_with_session のテスト."""
+
+    async def _count(self, db_session, model) -> int:
+        return (await db_session.execute(select(func.count()).select_from(model))).scalar_one()
+
+    async def test_new_user_gets_week_and_session_in_two_statements(self, db_session):
+        """新規ユーザー・current week・セッションが 2 ステートメントで作成されることを確認."""
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            user, raw_token = await upsert_google_user_with_session(
+                db_session,
+                google_sub="google_sub_upsert_new",
+                email="upsert_new@example.com",
+                name=None,
+                picture=None,
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        await db_session.commit()
+
+        assert len(statements) == 2
+        assert user.email == "upsert_new@example.com"
+        assert user.name == "upsert_new"
+        assert user.timezone == "Asia/Tokyo"
+        assert user.google_sub == "google_sub_upsert_new"
+        assert user.email_verified_at is not None
+        assert await self._count(db_session, Week) == 1
+        session, _ = await validate_session(db_session, raw_token)
+        assert session is not None
+        assert session.user_id == user.id
+
+    async def test_existing_google_user_is_updated_without_duplicate_week(self, db_session):
+        """再ログインでは name のみ更新し、email_verified_at・既存の週は保持されることを確認."""
+        old_verified_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        existing_user = await create_user(
+            db_session,
+            user_id=_make_user_id(),
+            email="upsert_existing@example.com",
+            name="Before",
+            picture="https://example.com/before.jpg",
+            google_sub="google_sub_upsert_existing",
+            email_verified_at=old_verified_at,
+        )
+        await db_session.commit()
+
+        for name in ("After", None):
+            user, _ = await upsert_google_user_with_session(
+                db_session,
+                google_sub="google_sub_upsert_existing",
+                email="upsert_existing@example.com",
+                name=name,
+                picture=None,
+            )
+        await db_session.commit()
+
+        assert user is existing_user
+        assert user.name == "After"
+        assert user.picture == "https://example.com/before.jpg"
+        assert user.email_verified_at == old_verified_at
+        assert await self._count(db_session, Week) == 1
+        assert await self._count(db_session, Session) == 2
+
+    async def test_verified_email_user_is_linked(self, db_session):
+        """メール検証済みの既存ユーザーには google_sub が紐付けられることを確認."""
+        existing_user = await create_user(
+            db_session,
+            user_id=_make_user_id(),
+            email="upsert_link@example.com",
+            name="Link User",
+            google_sub=None,
+            email_verified_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        await db_session.commit()
+
+        user, _ = await upsert_google_user_with_session(
+            db_session,
+            google_sub="google_sub_upsert_link",
+            email="upsert_link@example.com",
+            name="Link User",
+            picture=None,
+        )
+
+        assert user.id == existing_user.id
+        assert user.google_sub == "google_sub_upsert_link"
+
+    @pytest.mark.parametrize(
+        ("google_sub", "email_verified_at"),
+        [
+            ("google_sub_other", datetime(2026, 1, 1, tzinfo=timezone.utc)),
+            (None, None),
+        ],
+    )
+    async def test_unsafe_link_is_rejected_without_writes(
+        self, db_session, google_sub, email_verified_at
+    ):
+        """別の google_sub 設定済み・メール未検証のユーザーへの紐付けは書き込み前に拒否される."""
+        existing_user = await create_user(
+            db_session,
+            user_id=_make_user_id(),
+            email="upsert_reject@example.com",
+            name="Reject User",
+            google_sub=google_sub,
+            email_verified_at=email_verified_at,
+        )
+        await db_session.commit()
+
+        with pytest.raises(InvalidAuthorizationCodeError):
+            await upsert_google_user_with_session(
+                db_session,
+                google_sub="google_sub_upsert_attacker",
+                email="upsert_reject@example.com",
+                name="Attacker",
+                picture=None,
+            )
+
+        await db_session.refresh(existing_user)
+        assert existing_user.google_sub == google_sub
+        assert await self._count(db_session, Week) == 0
+        assert await self._count(db_session, Session) == 0
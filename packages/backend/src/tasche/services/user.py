@@ -3,12 +3,24 @@
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from ulid import ULID
 
 from tasche.core.exceptions import InvalidAuthorizationCodeError
+from tasche.models.enums import Theme
+from tasche.models.session import Session
 from tasche.models.user import User
+from tasche.models.week import Week
+from tasche.services.session import new_session
+from tasche.services.week import (
+    DEFAULT_TIMEZONE,
+    calculate_current_week_start_date,
+    default_week_values,
+    generate_week_id,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -133,39 +145,20 @@ async def get_or_create_user_by_google_sub(
         User: 取得または作成されたユーザー
     """
     now = datetime.now(tz=timezone.utc)
+    by_sub, by_email = await find_google_login_candidates(db, google_sub=google_sub, email=email)
 
     # 1) google_sub で lookup → email_verified_at は未設定の場合のみ初回セット
-    user = await get_user_by_google_sub(db, google_sub)
-    if user:
-        verified_at = now if user.email_verified_at is None else None
+    if by_sub:
+        verified_at = now if by_sub.email_verified_at is None else None
         return await update_user(
-            db, user, name=name, picture=picture, email_verified_at=verified_at
+            db, by_sub, name=name, picture=picture, email_verified_at=verified_at
         )
 
     # 2) email で lookup
-    user = await get_user_by_email(db, email)
-    if user:
-        if user.google_sub is not None:
-            logger.warning(
-                "Google アカウント紐付け拒否: 別の google_sub が既に設定されています "
-                "(email=%s, user_id=%s, incoming_google_sub=%s)",
-                email,
-                user.id,
-                google_sub,
-            )
-            raise InvalidAuthorizationCodeError("Google アカウントの連携に失敗しました。")
-        if user.email_verified_at is None:
-            # 未検証ユーザーへの自動紐付けを禁止（アカウント乗っ取り防止）
-            logger.warning(
-                "Google アカウント紐付け拒否: email_verified_at=None の既存ユーザーへの自動紐付けを拒否 "
-                "(email=%s, user_id=%s, incoming_google_sub=%s)",
-                email,
-                user.id,
-                google_sub,
-            )
-            raise InvalidAuthorizationCodeError("Google アカウントの連携に失敗しました。")
+    if by_email:
+        ensure_google_linkable(by_email, google_sub=google_sub)
         return await update_user(
-            db, user, name=name, picture=picture, google_sub=google_sub, email_verified_at=now
+            db, by_email, name=name, picture=picture, google_sub=google_sub, email_verified_at=now
         )
 
     # 3) 新規ユーザーを作成（Google 経由は最初から検証済みとして扱う）
@@ -181,6 +174,160 @@ async def get_or_create_user_by_google_sub(
     )
 
 
+async def find_google_login_candidates(
+    db: AsyncSession,
+    *,
+    google_sub: str,
+    email: str,
+) -> tuple[User | None, User | None]:
+    """google_sub 一致ユーザーと email 一致ユーザーを 1 ステートメントで取得する.
+
+    Returns:
+        (google_sub が一致したユーザー, email が一致したユーザー)。同一ユーザーの場合もある
+    """
+    result = await db.execute(
+        select(User).where(or_(User.google_sub == google_sub, User.email == email))
+    )
+    by_sub: User | None = None
+    by_email: User | None = None
+    for user in result.scalars():
+        if user.google_sub == google_sub:
+            by_sub = user
+        if user.email == email:
+            by_email = user
+    return by_sub, by_email
+
+
+def ensure_google_linkable(user: User, *, google_sub: str) -> None:
+    """email で見つかった既存ユーザーに google_sub を紐付けてよいか検証する.
+
+    Raises:
+        InvalidAuthorizationCodeError: 別の google_sub が設定済み / メール未検証のユーザー
+    """
+    if user.google_sub is not None:
+        logger.warning(
+            "Google アカウント紐付け拒否: 別の google_sub が既に設定されています "
+            "(email=%s, user_id=%s, incoming_google_sub=%s)",
+            user.email,
+            user.id,
+            google_sub,
+        )
+        raise InvalidAuthorizationCodeError("Google アカウントの連携に失敗しました。")
+    if user.email_verified_at is None:
+        # 未検証ユーザーへの自動紐付けを禁止（アカウント乗っ取り防止）
+        logger.warning(
+            "Google アカウント紐付け拒否: email_verified_at=None の既存ユーザーへの自動紐付けを拒否 "
+            "(email=%s, user_id=%s, incoming_google_sub=%s)",
+            user.email,
+            user.id,
+            google_sub,
+        )
+        raise InvalidAuthorizationCodeError("Google アカウントの連携に失敗しました。")
+
+
+async def upsert_google_user_with_session(
+    db: AsyncSession,
+    *,
+    google_sub: str,
+    email: str,
+    name: str | None,
+    picture: str | None,
+    now: datetime | None = None,
+) -> tuple[User, str]:
+    """Google ログイン時のユーザー upsert・current week 保証・セッション発行を 2 往復で行う.
+
+    1. find_google_login_candidates で紐付け先を決め、安全ルールを Python 側で検証する
+    2. users の INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING を起点に、
+       weeks の INSERT ... ON CONFLICT DO NOTHING と sessions の INSERT を
+       データ変更 CTE として 1 ステートメントで実行する
+
+    振る舞いは get_or_create_user_by_google_sub + ensure_current_week + create_session と同じ。
+
+    Returns:
+        (user, raw_session_token)
+
+    Raises:
+        InvalidAuthorizationCodeError: 紐付け先ユーザーが安全ルールを満たさない場合
+    """
+    now = now or datetime.now(tz=timezone.utc)
+    by_sub, by_email = await find_google_login_candidates(db, google_sub=google_sub, email=email)
+
+    if by_sub:
+        # 既存ユーザー: email_verified_at は未設定の場合のみ初回セット
+        user_id = by_sub.id
+        timezone_name: str = by_sub.timezone
+        verified_at = func.coalesce(User.email_verified_at, now)
+    elif by_email:
+        ensure_google_linkable(by_email, google_sub=google_sub)
+        user_id = by_email.id
+        timezone_name = by_email.timezone
+        verified_at = now
+    else:
+        user_id = _generate_user_id()
+        timezone_name = DEFAULT_TIMEZONE
+        verified_at = now
+
+    # update_user と同様、None の name / picture では既存値を上書きしない
+    # 下の CTE で current week を作成しうるため、既存ユーザーはデータの版も上げる
+    update_values = {
+        "google_sub": google_sub,
+        "email_verified_at": verified_at,
+        "data_version": User.data_version + 1,
+        "updated_at": func.now(),
+    }
+    if name is not None:
+        update_values["name"] = name
+    if picture is not None:
+        update_values["picture"] = picture
+
+    login_user = (
+        pg_insert(User)
+        .values(
+            id=user_id,
+            email=email,
+            name=name if name is not None else email.split("@")[0],
+            picture=picture,
+            # CTE 内の INSERT には Column の Python 側 default が適用されないため明示する
+            timezone=timezone_name,
+            theme=Theme.LIGHT.value,
+            google_sub=google_sub,
+            email_verified_at=now,
+            data_version=0,
+        )
+        .on_conflict_do_update(index_elements=[User.id], set_=update_values)
+        .returning(*User.__table__.c)
+        .cte("login_user")
+    )
+    login_user_id = select(login_user.c.id).scalar_subquery()
+
+    start_date = calculate_current_week_start_date(timezone_name=timezone_name, now=now)
+    login_week = (
+        pg_insert(Week)
+        .values(id=generate_week_id(), user_id=login_user_id, **default_week_values(start_date))
+        .on_conflict_do_nothing(index_elements=[Week.user_id, Week.start_date])
+        .cte("login_week")
+    )
+
+    session = new_session()
+    login_session = (
+        insert(Session)
+        .values(
+            id=session.id,
+            user_id=login_user_id,
+            token_hash=session.token_hash,
+            expires_at=session.expires_at,
+        )
+        .cte("login_session")
+    )
+
+    result = await db.execute(
+        select(aliased(User, login_user))
+        .add_cte(login_week, login_session)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one(), session.raw_token
+
+
 async def get_or_create_user_by_email(
     db: AsyncSession,
     *,
@@ -1,7 +1,8 @@
 """週サービス（current week の取得・保証）."""
 
 import logging
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy import select
@@ -13,6 +14,7 @@ from tasche.core.exceptions import WeekNotFoundException
 from tasche.models.enums import DayOfWeek
 from tasche.models.user import User
 from tasche.models.week import Week
+from tasche.services.data_version import bump_user_data_version
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +33,7 @@ WEEKDAY_INDEX = {
 }
 
 
-def _generate_week_id() -> str:
+def generate_week_id() -> str:
     """ULID形式の週IDを生成する（wk_ プレフィックス付き）."""
     return f"wk_{ULID()}"
 
@@ -76,6 +78,32 @@ def calculate_current_week_start_date(
     return candidate_start.date()
 
 
+def default_week_values(start_date: date) -> dict[str, Any]:
+    """start_date から始まる週を既定値で作成する際のカラム値（id / user_id 以外）."""
+    return {
+        "start_date": start_date,
+        "end_date": start_date + timedelta(days=6),
+        "unit_duration_minutes": DEFAULT_UNIT_DURATION_MINUTES,
+        "week_start_day": DEFAULT_WEEK_START_DAY,
+        "week_start_hour": DEFAULT_WEEK_START_HOUR,
+        "available_units_monday": 0.0,
+        "available_units_tuesday": 0.0,
+        "available_units_wednesday": 0.0,
+        "available_units_thursday": 0.0,
+        "available_units_friday": 0.0,
+        "available_units_saturday": 0.0,
+        "available_units_sunday": 0.0,
+    }
+
+
+def get_current_week_start_date(user: User, *, now: datetime | None = None) -> date:
+    """ユーザーのタイムゾーンでの current week の開始日を返す."""
+    return calculate_current_week_start_date(
+        timezone_name=user.timezone,
+        now=now or get_current_time_utc(),
+    )
+
+
 async def get_current_week(
     db: AsyncSession,
     user: User,
@@ -111,7 +139,7 @@ async def ensure_current_week(
 ) -> Week:
     """ユーザーの current week を取得し、無ければ既定値で作成する.
 
-    unique(user_id, start_date) 制約に依存して冪等。
+    unique(user_id, start_date) 制約に依存して冪等。作成した場合はユーザーデータの版を上げる。
     """
     current_time = now or get_current_time_utc()
     tz = timezone_name or user.timezone
@@ -119,7 +147,6 @@ async def ensure_current_week(
         timezone_name=tz,
         now=current_time,
     )
-    end_date = start_date + timedelta(days=6)
 
     # まず既存週を検索する
     result = await db.execute(
@@ -133,27 +160,13 @@ async def ensure_current_week(
         return week
 
     # 存在しない場合は新規作成する（競合時は再 SELECT で取得）
-    new_week = Week(
-        id=_generate_week_id(),
-        user_id=user.id,
-        start_date=start_date,
-        end_date=end_date,
-        unit_duration_minutes=DEFAULT_UNIT_DURATION_MINUTES,
-        week_start_day=DEFAULT_WEEK_START_DAY,
-        week_start_hour=DEFAULT_WEEK_START_HOUR,
-        available_units_monday=0.0,
-        available_units_tuesday=0.0,
-        available_units_wednesday=0.0,
-        available_units_thursday=0.0,
-        available_units_friday=0.0,
-        available_units_saturday=0.0,
-        available_units_sunday=0.0,
-    )
+    new_week = Week(id=generate_week_id(), user_id=user.id, **default_week_values(start_date))
 
     try:
         async with db.begin_nested():
             db.add(new_week)
             await db.flush()
+            await bump_user_data_version(db, user.id)
         logger.info("Created new week for user %s: %s", user.id, new_week.id)
     except IntegrityError:
         # 同時リクエストで競合した場合は既存週を再取得する
@@ -19,6 +19,7 @@ def make_google_id_token(
     aud: str | None = None,
     iss: str = "https://accounts.google.com",
     exp_offset: int = 3600,
+    kid: str = "test-key-id",
 ) -> str:
     """テスト用 Google ID Token（RSA 署名付き）を生成する."""
     now = int(time.time())
@@ -42,4 +43,4 @@ def make_google_id_token(
         else rsa_private_key_pem
     )
     key = RSAKey.import_key(pem_bytes)
-    return jwt.encode({"alg": "RS256", "kid": "test-key-id"}, payload, key)
+    return jwt.encode({"alg": "RS256", "kid": kid}, payload, key)
@@ -0,0 +1,205 @@
+"""db/session.py のテスト（プールモード・リードレプリカ振り分け）."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import Request, Response
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from tasche.core.config import Settings, settings
+from tasche.core.cookies import PRIMARY_PIN_COOKIE
+from tasche.db import session as db_session_module
+from tasche.db.session import build_engine_options, get_db, get_read_db
+
+
+class TestBuildEngineOptions:
+    """build_engine_options のテスト."""
+
+    def test_queue_mode_uses_pool_settings(self):
+        """queue モードでは Settings のプール設定がそのまま渡されることを確認."""
+        with (
+            patch.object(settings, "db_pool_size", 7),
+            patch.object(settings, "db_max_overflow", 3),
+            patch.object(settings, "db_pool_pre_ping", True),
+        ):
+            options = build_engine_options("queue")
+
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 3
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == settings.db_pool_recycle_seconds
+
+    def test_single_mode_reuses_one_connection_with_pre_ping(self):
+        """single モードでは 1 接続のみ保持し、pre_ping が常に有効であることを確認."""
+        with patch.object(settings, "db_pool_pre_ping", False):
+            options = build_engine_options("single")
+
+        assert options["pool_size"] == 1
+        assert options["max_overflow"] == 0
+        assert options["pool_pre_ping"] is True
+
+    def test_null_mode_disables_pooling(self):
+        """null モードでは NullPool を使い、prepared statement 名を一意化することを確認."""
+        options = build_engine_options("null")
+
+        assert options["poolclass"] is NullPool
+        assert "pool_size" not in options
+        name_func = options["connect_args"]["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+    def test_default_mode_comes_from_settings(self):
+        """引数省略時は settings.db_pool_mode を使うことを確認."""
+        with patch.object(settings, "db_pool_mode", "null"):
+            assert build_engine_options()["poolclass"] is NullPool
+
+    @pytest.mark.parametrize(
+        ("pool_mode", "pool_class"), [("queue", AsyncAdaptedQueuePool), ("null", NullPool)]
+    )
+    async def test_engine_connects_with_options(self, db_session, pool_mode, pool_class):
+        """組み立てた引数でエンジンを生成して接続できることを確認."""
+        engine = create_async_engine(db_session.bind.url, **build_engine_options(pool_mode))
+        try:
+            async with engine.connect() as conn:
+                assert (await conn.execute(text("SELECT 1"))).scalar_one() == 1
+            assert isinstance(engine.pool, pool_class)
+        finally:
+            await engine.dispose()
+
+
+def test_invalid_pool_mode_is_rejected():
+    """未知の DB_POOL_MODE は起動時の設定検証で拒否されることを確認."""
+    with pytest.raises(ValidationError):
+        Settings(database_url=settings.database_url, db_pool_mode="pgbouncer")
+
+
+class _FakeSessionMaker:
+    """async_sessionmaker のテストダブル（どのファクトリが使われたかを名前で返す）."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self) -> "_FakeSessionMaker":
+        return self
+
+    async def __aenter__(self) -> str:
+        return self.name
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+def _make_request(method: str = "GET", cookies: dict[str, str] | None = None) -> Request:
+    headers = []
+    if cookies:
+        cookie = "; ".join(f"{key}={value}" for key, value in cookies.items())
+        headers.append((b"cookie", cookie.encode()))
+    return Request({"type": "http", "method": method, "path": "/api/tasks", "headers": headers})
+
+
+@pytest.fixture
+def fake_session_makers():
+    with (
+        patch.object(
+            db_session_module, "get_session_maker", return_value=_FakeSessionMaker("primary")
+        ),
+        patch.object(
+            db_session_module, "get_read_session_maker", return_value=_FakeSessionMaker("replica")
+        ),
+        patch.object(settings, "database_read_url", "postgresql+asyncpg://replica/tasche"),
+    ):
+        yield
+
+
+class TestReadReplicaRouting:
+    """get_db / get_read_db のリードレプリカ振り分けのテスト."""
+
+    async def test_read_db_uses_replica(self, fake_session_makers):
+        """通常の読み取りはリードレプリカを使うことを確認."""
+        async for session in get_read_db(_make_request(), "request-primary"):
+            assert session == "replica"
+
+    async def test_read_db_is_pinned_to_primary_after_write(self, fake_session_makers):
+        """プライマリ固定 Cookie がある間は、リクエストの get_db のセッションを使うことを確認."""
+        request = _make_request(cookies={PRIMARY_PIN_COOKIE: "1"})
+        async for session in get_read_db(request, "request-primary"):
+            assert session == "request-primary"
+
+    async def test_read_db_reuses_primary_session_without_replica(self, fake_session_makers):
+        """DATABASE_READ_URL 未設定時は新しいセッションを開かずに get_db のセッションを使うことを確認."""
+        with patch.object(settings, "database_read_url", ""):
+            async for session in get_read_db(_make_request(), "request-primary"):
+                assert session == "request-primary"
+
+    async def test_single_pool_serves_authenticated_read_with_one_connection(
+        self, authenticated_client, db_session
+    ):
+        """DB_POOL_MODE=single で認証と読み取りが 1 本の接続で済むことを確認.
+
+        get_db だけを差し替え、get_read_db は本来の依存関係のまま解決させる。
+        2 本目のチェックアウトが起きるとプールの待ち時間切れで失敗する。
+        """
+        from tasche.main import app
+
+        with patch.object(settings, "db_pool_timeout_seconds", 1.0):
+            engine = create_async_engine(db_session.bind.url, **build_engine_options("single"))
+        maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def _single_pool_db():
+            async with maker() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = _single_pool_db
+        app.dependency_overrides.pop(get_read_db)
+        try:
+            with patch.object(db_session_module, "get_session_maker", return_value=maker):
+                response = await authenticated_client.get("/api/tasks")
+        finally:
+            await engine.dispose()
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(("method", "pinned"), [("POST", True), ("PUT", True), ("GET", False)])
+    async def test_write_request_sets_pin_cookie(self, fake_session_makers, method, pinned):
+        """更新系リクエストのみ、プライマリ固定 Cookie を DB_PRIMARY_PIN_SECONDS で付与することを確認."""
+        response = Response()
+        async for session in get_db(_make_request(method), response):
+            assert session == "primary"
+
+        set_cookie = response.headers.get("set-cookie", "")
+        assert (f"{PRIMARY_PIN_COOKIE}=1" in set_cookie) is pinned
+        if pinned:
+            assert f"Max-Age={settings.db_primary_pin_seconds}" in set_cookie
+
+    async def test_no_pin_cookie_without_replica(self, fake_session_makers):
+        """DATABASE_READ_URL 未設定時は Cookie を付与しないことを確認."""
+        response = Response()
+        with patch.object(settings, "database_read_url", ""):
+            async for _ in get_db(_make_request("POST"), response):
+                pass
+
+        assert "set-cookie" not in response.headers
+
+    @pytest.mark.parametrize("path", ["/api/dashboard", "/api/weeks/current/records", "/api/tasks"])
+    async def test_read_only_endpoints_use_read_db(
+        self, authenticated_client, db_session, test_user, path
+    ):
+        """集計系の GET エンドポイントが ReadDbSession を使うことを確認."""
+        from tasche.main import app
+        from tasche.services.week import ensure_current_week
+
+        await ensure_current_week(db_session, test_user)
+        await db_session.commit()
+        calls = []
+
+        async def _read_db():
+            calls.append(path)
+            yield db_session
+
+        app.dependency_overrides[get_read_db] = _read_db
+        response = await authenticated_client.get(path)
+
+        assert response.status_code == 200
+        assert calls == [path]
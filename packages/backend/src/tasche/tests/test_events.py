@@ -0,0 +1,72 @@
+"""メンテナンス用イベント受信エンドポイント（api/events.py）のテスト."""
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tasche.api import events
+from tasche.api.deps import get_db
+from tasche.main import app
+from tasche.models.session import Session
+from tasche.models.user import User
+from tasche.services.session import _generate_session_id
+
+# EventBridge Scheduler から LWA 経由で転送されるペイロードの例
+SCHEDULED_EVENT = {
+    "version": "0",
+    "id": "53dc4d37-cffa-4f76-80c9-8b7d4a4d2eaa",
+    "detail-type": "Scheduled Event",
+    "source": "aws.events",
+    "time": "2026-10-18T00:00:00Z",
+    "detail": {},
+}
+
+
+class TestMaintenanceEvents:
+    """POST /events のテスト."""
+
+    async def test_scheduled_event_purges_sessions(self, db_session: AsyncSession):
+        """スケジュールイベントで期限切れセッションが削除され、結果が返ることを確認."""
+        user = User(id="usr_01EVENTS00000000000000", email="events@example.com", name="Events")
+        db_session.add(user)
+        await db_session.commit()
+        db_session.add(
+            Session(
+                id=_generate_session_id(),
+                user_id=user.id,
+                token_hash="0" * 64,
+                expires_at=datetime.now(tz=timezone.utc) - timedelta(hours=1),
+            )
+        )
+        await db_session.commit()
+
+        maintenance_app = FastAPI()
+        maintenance_app.include_router(events.router)
+
+        async def override_get_db():
+            yield db_session
+
+        maintenance_app.dependency_overrides[get_db] = override_get_db
+        async with AsyncClient(
+            transport=ASGITransport(app=maintenance_app), base_url="http://test"
+        ) as ac:
+            response = await ac.post("/events", json=SCHEDULED_EVENT)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["deleted"] == 1
+        assert body["batches"] == 1
+        assert "elapsed_ms" in body
+        result = await db_session.execute(select(Session))
+        assert result.scalars().all() == []
+
+    async def test_events_route_not_registered_on_api_app(self, client: AsyncClient):
+        """既定（ENABLE_MAINTENANCE_EVENTS=false）では API 用アプリに登録されないことを確認."""
+        assert all(getattr(route, "path", None) != "/events" for route in app.routes)
+
+        response = await client.post("/events", json=SCHEDULED_EVENT)
+
+        assert response.status_code == 404
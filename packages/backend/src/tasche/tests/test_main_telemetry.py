@@ -1,8 +1,15 @@
 """テレメトリ補助処理のテスト."""
 
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import iter_route_contexts
+from httpx import ASGITransport, AsyncClient
 from starlette.requests import Request
 
-from tasche.main import _set_http_span_attributes_from_request
+from tasche import main
+from tasche.db.query_stats import reset_query_stats, start_query_stats
+from tasche.main import _resolve_full_route_path, _set_http_span_attributes_from_request
 
 
 class DummySpan:
@@ -10,7 +17,7 @@ class DummySpan:
 
     def __init__(self) -> None:
         self.name = ""
-        self.attributes: dict[str, str] = {}
+        self.attributes: dict[str, str | int | float] = {}
 
     def is_recording(self) -> bool:
         return True
@@ -18,13 +25,12 @@ class DummySpan:
     def update_name(self, name: str) -> None:
         self.name = name
 
-    def set_attribute(self, key: str, value: str) -> None:
+    def set_attribute(self, key: str, value: str | int | float) -> None:
         self.attributes[key] = value
 
 
-def test_set_http_span_attributes_uses_route_and_removes_query_string() -> None:
-    """API識別用のHTTP属性をquery stringなしでspanへ付与する."""
-    request = Request(
+def _make_request() -> Request:
+    return Request(
         {
             "type": "http",
             "method": "GET",
@@ -37,6 +43,11 @@ def test_set_http_span_attributes_uses_route_and_removes_query_string() -> None:
             "route": type("Route", (), {"path": "/api/tasks/{task_id}"})(),
         }
     )
+
+
+def test_set_http_span_attributes_uses_route_and_removes_query_string() -> None:
+    """API識別用のHTTP属性をquery stringなしでspanへ付与する."""
+    request = _make_request()
     span = DummySpan()
 
     _set_http_span_attributes_from_request(span, request)
@@ -51,3 +62,95 @@ def test_set_http_span_attributes_uses_route_and_removes_query_string() -> None:
     assert span.attributes["url.path"] == "/api/tasks/01HZ"
     assert span.attributes["tasche.http.operation"] == "GET /api/tasks/{task_id}"
     assert span.attributes["tasche.http.url"] == "https://example.com/api/tasks/01HZ"
+    assert "tasche.db.statement_count" not in span.attributes
+
+
+def test_set_http_span_attributes_includes_db_query_stats() -> None:
+    """リクエスト内で集計した DB ステートメント数・所要時間を span へ付与する."""
+    stats, token = start_query_stats()
+    stats.statements = 3
+    stats.duration_seconds = 0.0125
+    span = DummySpan()
+    try:
+        _set_http_span_attributes_from_request(span, _make_request())
+    finally:
+        reset_query_stats(token)
+
+    assert span.attributes["tasche.db.statement_count"] == 3
+    assert span.attributes["tasche.db.duration_ms"] == 12.5
+
+
+class TestResolveFullRoutePath:
+    """_resolve_full_route_path のテスト."""
+
+    @staticmethod
+    def _make_app() -> FastAPI:
+        items = APIRouter(prefix="/items")
+
+        @items.get("/{item_id}")
+        async def get_item(item_id: str):
+            return {}
+
+        api = APIRouter()
+        api.include_router(items)
+        app = FastAPI()
+        app.include_router(api, prefix="/api")
+        return app
+
+    @staticmethod
+    def _find_route(app: FastAPI, path: str):
+        return next(
+            context.original_route
+            for context in iter_route_contexts(app.routes)
+            if context.path == path
+        )
+
+    def test_resolves_nested_prefix(self) -> None:
+        """ネストした include_router の prefix を含むパスを返すことを確認."""
+        app = self._make_app()
+        route = self._find_route(app, "/api/items/{item_id}")
+
+        assert route.path == "/items/{item_id}"
+        assert _resolve_full_route_path(app, route) == "/api/items/{item_id}"
+
+    def test_route_map_is_built_once(self) -> None:
+        """ルート走査は初回のみで、以降は辞書を引くだけであることを確認."""
+        app = self._make_app()
+        route = self._find_route(app, "/api/items/{item_id}")
+
+        with patch.object(main, "_build_route_path_map", wraps=main._build_route_path_map) as build:
+            for _ in range(3):
+                _resolve_full_route_path(app, route)
+
+        assert build.call_count == 1
+
+    def test_route_map_is_rebuilt_when_routes_change(self) -> None:
+        """ルート追加後は辞書を作り直し、追加されたルートも解決できることを確認."""
+        app = self._make_app()
+        _resolve_full_route_path(app, self._find_route(app, "/api/items/{item_id}"))
+
+        extra = APIRouter()
+
+        @extra.get("/{user_id}")
+        async def get_user(user_id: str):
+            return {}
+
+        app.include_router(extra, prefix="/api/users")
+        route = self._find_route(app, "/api/users/{user_id}")
+
+        assert _resolve_full_route_path(app, route) == "/api/users/{user_id}"
+
+
+async def test_enrich_middleware_names_span_after_routing() -> None:
+    """pure ASGI ミドルウェアがルーティング後の route テンプレートで span 名を付けることを確認."""
+    app = TestResolveFullRoutePath._make_app()
+    app.add_middleware(main.EnrichHttpTraceAttributesMiddleware)
+    span = DummySpan()
+
+    with patch("opentelemetry.trace.get_current_span", return_value=span):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/api/items/01HZ")
+
+    assert response.status_code == 200
+    assert span.name == "GET /api/items/{item_id}"
+    assert span.attributes["http.target"] == "/api/items/01HZ"
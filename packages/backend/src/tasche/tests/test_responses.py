@@ -0,0 +1,83 @@
+"""api/responses.py（再検証を省く JSON レスポンス経路）のテスト."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.exceptions import ResponseValidationError
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel, Field
+
+from tasche.api.responses import ModelJSONResponse, ModelResponseRoute
+from tasche.core.config import settings
+from tasche.schemas.common import APIResponse
+
+
+class Item(BaseModel):
+    name: str
+    units: float = Field(..., ge=0)
+
+
+def _set_cookie(response: Response) -> None:
+    response.set_cookie("pinned", "1")
+
+
+def _make_app(*, validate: bool, units: float = 1.5) -> FastAPI:
+    with patch.object(settings, "validate_response_models", validate):
+        router = APIRouter(route_class=ModelResponseRoute)
+
+        @router.post(
+            "/items",
+            response_model=APIResponse[Item],
+            response_class=ModelJSONResponse,
+            status_code=201,
+            dependencies=[Depends(_set_cookie)],
+        )
+        async def create_item() -> APIResponse[Item]:
+            # data は未検証の dict（response_model による検証でのみ units < 0 を検出できる）
+            return APIResponse(data={"name": "タスク", "units": units})
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def _post(app: FastAPI):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post("/items")
+
+
+class TestModelResponseRoute:
+    """ModelResponseRoute / ModelJSONResponse のテスト."""
+
+    @pytest.mark.parametrize("validate", [True, False])
+    async def test_same_response_with_and_without_validation(self, validate):
+        """検証の有無で本文・ステータス・依存関係が設定した Cookie が変わらないことを確認."""
+        response = await _post(_make_app(validate=validate))
+
+        assert response.status_code == 201
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"data": {"name": "タスク", "units": 1.5}}
+        assert response.cookies["pinned"] == "1"
+
+    async def test_invalid_model_is_detected_when_validating(self):
+        """検証有効時（テスト・ローカル）は response_model との不整合を検出することを確認."""
+        with pytest.raises(ResponseValidationError):
+            await _post(_make_app(validate=True, units=-1))
+
+    async def test_validation_is_skipped_when_disabled(self):
+        """検証無効時は戻り値をそのまま 1 回で JSON 化することを確認."""
+        with patch.object(
+            ModelJSONResponse, "render", autospec=True, side_effect=ModelJSONResponse.render
+        ) as render:
+            response = await _post(_make_app(validate=False, units=-1))
+
+        assert response.json() == {"data": {"name": "タスク", "units": -1}}
+        assert isinstance(render.call_args.args[1], APIResponse)
+
+    def test_openapi_keeps_response_model(self):
+        """検証無効時も OpenAPI のレスポンススキーマは response_model のままであることを確認."""
+        openapi = _make_app(validate=False).openapi()
+
+        schema = openapi["paths"]["/items"]["post"]["responses"]["201"]["content"]
+        assert schema["application/json"]["schema"]["$ref"].endswith("APIResponse_Item_")